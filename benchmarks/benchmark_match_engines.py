@@ -0,0 +1,215 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Benchmark script for comparing DateParser match engines on real-world webpage text data.
+
+This script:
+1. Reads text snippets from webpage_test_data.csv
+2. Parses all texts with each DateParser engine (scan, anchored, ...)
+3. Measures performance (timing) separately for matched texts and misses
+4. Checks that every engine returns the same dates as the default scan engine
+5. Outputs results in JSON format
+"""
+
+import sys
+import csv
+import json
+import time
+import statistics
+import argparse
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, List, Any
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from qddate import DateParser
+from qddate.qdparser import ENGINES, ENGINE_SCAN
+
+
+def load_texts(csv_path: str, limit: int = 0) -> List[str]:
+    """Load non-empty text snippets from CSV file."""
+    texts = []
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            text = row.get('text', '').strip()
+            if text:
+                texts.append(text)
+                if limit and len(texts) >= limit:
+                    break
+    return texts
+
+
+def _percentile(data: List[float], p: float) -> float:
+    """Calculate percentile."""
+    if not data:
+        return 0.0
+    sorted_data = sorted(data)
+    k = (len(sorted_data) - 1) * p
+    f = int(k)
+    c = k - f
+    if f + 1 < len(sorted_data):
+        return sorted_data[f] + c * (sorted_data[f + 1] - sorted_data[f])
+    return sorted_data[f]
+
+
+def _timing_stats(timings: List[float]) -> Dict[str, float]:
+    return {
+        'count': len(timings),
+        'total': sum(timings),
+        'mean': statistics.mean(timings) if timings else 0,
+        'median': statistics.median(timings) if timings else 0,
+        'p95': _percentile(timings, 0.95),
+        'p99': _percentile(timings, 0.99),
+    }
+
+
+def benchmark_engine(engine: str, texts: List[str], **parser_kwargs) -> Dict[str, Any]:
+    """Parse all texts with given engine and collect timings."""
+    init_start = time.perf_counter()
+    parser = DateParser(engine=engine, **parser_kwargs)
+    init_time = time.perf_counter() - init_start
+
+    results = []
+    hit_timings = []
+    miss_timings = []
+    total_start = time.perf_counter()
+    for text in texts:
+        start = time.perf_counter()
+        result = parser.parse(text)
+        duration = time.perf_counter() - start
+        results.append(result)
+        if result is not None:
+            hit_timings.append(duration)
+        else:
+            miss_timings.append(duration)
+    total_time = time.perf_counter() - total_start
+
+    return {
+        'engine': engine,
+        'init_time': init_time,
+        'total_time': total_time,
+        'total_operations': len(texts),
+        'successful': len(hit_timings),
+        'throughput': len(texts) / total_time if total_time > 0 else 0,
+        'hits': _timing_stats(hit_timings),
+        'misses': _timing_stats(miss_timings),
+        'results': results,
+    }
+
+
+def run_benchmarks(texts: List[str], engines: List[str]) -> Dict[str, Any]:
+    """Run all engines and compare their results with the scan engine."""
+    results = {
+        'timestamp': datetime.now().isoformat(),
+        'python_version': sys.version,
+        'test_cases_count': len(texts),
+        'engines': {},
+    }
+    if ENGINE_SCAN not in engines:
+        engines = [ENGINE_SCAN] + list(engines)
+    for engine in engines:
+        print(f"Benchmarking engine '{engine}'...")
+        results['engines'][engine] = benchmark_engine(engine, texts)
+
+    reference = results['engines'][ENGINE_SCAN]['results']
+    for engine, engine_results in results['engines'].items():
+        mismatches = [
+            {'text': text, 'scan': str(expected), engine: str(actual)}
+            for text, expected, actual in zip(texts, reference, engine_results['results'])
+            if expected != actual
+        ]
+        engine_results['mismatches'] = len(mismatches)
+        engine_results['mismatch_examples'] = mismatches[:20]
+        engine_results['speedup'] = (results['engines'][ENGINE_SCAN]['total_time'] /
+                                     engine_results['total_time']) if engine_results['total_time'] else 0
+        del engine_results['results']
+    return results
+
+
+def print_results(results: Dict[str, Any]):
+    """Print results in human-readable format."""
+    print("=" * 100)
+    print("MATCH ENGINE BENCHMARK RESULTS")
+    print("=" * 100)
+    print(f"Test cases: {results['test_cases_count']}")
+    print(f"Python: {results['python_version'].split()[0]}")
+    print()
+    print(f"{'Engine':<12} {'Init (s)':<10} {'Total (s)':<11} {'Speedup':<9} {'Matched':<9} "
+          f"{'Hit mean (ms)':<15} {'Miss mean (ms)':<15} {'Miss p95 (ms)':<15} {'Mismatches':<10}")
+    print("-" * 100)
+    for engine, row in results['engines'].items():
+        print(f"{engine:<12} "
+              f"{row['init_time']:>8.3f}  "
+              f"{row['total_time']:>9.3f}  "
+              f"{row['speedup']:>7.2f}x "
+              f"{row['successful']:<9} "
+              f"{row['hits']['mean'] * 1000:>13.3f}  "
+              f"{row['misses']['mean'] * 1000:>13.3f}  "
+              f"{row['misses']['p95'] * 1000:>13.3f}  "
+              f"{row['mismatches']:<10}")
+    print()
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(
+        description='Compare DateParser match engines using webpage data'
+    )
+    parser.add_argument(
+        '--csv',
+        default='webpage_test_data.csv',
+        help='Path to CSV file with test data (default: benchmarks/webpage_test_data.csv)'
+    )
+    parser.add_argument(
+        '--engines',
+        nargs='+',
+        default=list(ENGINES),
+        choices=list(ENGINES),
+        help='Engines to benchmark (default: all)'
+    )
+    parser.add_argument(
+        '--limit',
+        type=int,
+        default=0,
+        help='Use only first N texts (default: all)'
+    )
+    parser.add_argument(
+        '--output',
+        '-o',
+        help='Output JSON file path (default: benchmarks/results/engine_benchmark_<timestamp>.json)'
+    )
+
+    args = parser.parse_args()
+
+    csv_path = Path(args.csv)
+    if not csv_path.is_absolute():
+        csv_path = Path(__file__).parent / csv_path
+
+    if not csv_path.exists():
+        print(f"Error: CSV file not found: {csv_path}")
+        sys.exit(1)
+
+    texts = load_texts(str(csv_path), args.limit)
+    print(f"Loaded {len(texts)} text snippets from {csv_path}")
+
+    results = run_benchmarks(texts, args.engines)
+    print_results(results)
+
+    if args.output:
+        output_path = Path(args.output)
+    else:
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        output_dir = Path(__file__).parent / 'results'
+        output_dir.mkdir(exist_ok=True)
+        output_path = output_dir / f'engine_benchmark_{timestamp}.json'
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False, default=str)
+    print(f"Results saved to {output_path}")
+
+
+if __name__ == '__main__':
+    main()
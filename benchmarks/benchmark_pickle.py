@@ -0,0 +1,213 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Benchmark script for pickling DateParser.
+
+This script:
+1. Pickles parsers of several configurations (only constructor arguments are pickled)
+2. Measures pickle size, dumps time and loads time with patterns already built in the
+   process (warm) and after clearing shared pattern state (cold)
+3. Pickles the whole parser state (patterns, indexes, grammars) for comparison
+4. Sends a parser to concurrent.futures process pool workers and measures round trip time
+5. Outputs results in JSON format
+"""
+
+import sys
+import json
+import time
+import pickle
+import argparse
+import tempfile
+import concurrent.futures
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, Any
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from qddate import DateParser, qdparser
+
+CONFIGS = {
+    'default': {},
+    'en': {'languages': 'en'},
+    'ru_de': {'languages': ['ru', 'de']},
+    'split_prefix': {'split_time': True, 'prefix_match': True},
+}
+
+# Full parser state is deeply nested pyparsing grammars
+_RECURSION_LIMIT = 50000
+
+
+def _best_time(func, repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        duration = time.perf_counter() - start
+        best = duration if best is None else min(best, duration)
+    return best
+
+
+def _parse_in_worker(parser, text):
+    """Process pool task, parser argument is pickled with every call"""
+    return parser.parse(text)
+
+
+def benchmark_full_state(parser) -> Dict[str, Any]:
+    """Pickle all parser attributes as pickling did before DateParser.__reduce__"""
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(limit, _RECURSION_LIMIT))
+    try:
+        start = time.perf_counter()
+        data = pickle.dumps(vars(parser), pickle.HIGHEST_PROTOCOL)
+        dumps_time = time.perf_counter() - start
+        start = time.perf_counter()
+        pickle.loads(data)
+        loads_time = time.perf_counter() - start
+        return {'size': len(data), 'dumps_time': dumps_time, 'loads_time': loads_time, 'error': None}
+    except Exception as e:
+        return {'size': None, 'dumps_time': None, 'loads_time': None, 'error': f"{type(e).__name__}: {e}"}
+    finally:
+        sys.setrecursionlimit(limit)
+
+
+def benchmark_config(name: str, kwargs: Dict[str, Any], repeat: int, snapshot_dir: str) -> Dict[str, Any]:
+    """Measure pickling of one parser configuration."""
+    parser = DateParser(**kwargs)
+    parser.startSession([p.key for p in parser.patterns[:5]])
+    data = pickle.dumps(parser, pickle.HIGHEST_PROTOCOL)
+    dumps_time = _best_time(lambda: pickle.dumps(parser, pickle.HIGHEST_PROTOCOL), repeat)
+    warm_loads_time = _best_time(lambda: pickle.loads(data), repeat)
+
+    def cold_loads():
+        qdparser._SHARED_STATES.clear()
+        pickle.loads(data)
+    cold_loads_time = _best_time(cold_loads, max(1, repeat // 10))
+
+    snapshot_parser = DateParser(snapshot_dir=snapshot_dir, **kwargs)
+    snapshot_data = pickle.dumps(snapshot_parser, pickle.HIGHEST_PROTOCOL)
+
+    def cold_snapshot_loads():
+        qdparser._SHARED_STATES.clear()
+        pickle.loads(snapshot_data)
+    cold_snapshot_loads_time = _best_time(cold_snapshot_loads, max(1, repeat // 10))
+
+    restored = pickle.loads(data)
+    return {
+        'config': name,
+        'kwargs': kwargs,
+        'patterns': len(parser.patterns),
+        'size': len(data),
+        'dumps_time': dumps_time,
+        'warm_loads_time': warm_loads_time,
+        'cold_loads_time': cold_loads_time,
+        'cold_snapshot_loads_time': cold_snapshot_loads_time,
+        'session_restored': [p.key for p in restored.cachedpats] == [p.key for p in parser.cachedpats],
+        'full_state': benchmark_full_state(parser),
+    }
+
+
+def benchmark_process_pool(kwargs: Dict[str, Any], tasks: int, workers: int) -> Dict[str, Any]:
+    """Send parser with every task to process pool workers."""
+    parser = DateParser(**kwargs)
+    texts = ['01.12.2009', '6 Jan 2009', '2013-01-12', 'not a date'] * (tasks // 4)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        start = time.perf_counter()
+        first = list(pool.map(_parse_in_worker, [parser] * workers, texts[:workers]))
+        first_time = time.perf_counter() - start
+        start = time.perf_counter()
+        results = list(pool.map(_parse_in_worker, [parser] * len(texts), texts))
+        warm_time = time.perf_counter() - start
+    return {
+        'workers': workers,
+        'tasks': len(texts),
+        'first_round_time': first_time,
+        'warm_total_time': warm_time,
+        'warm_time_per_task': warm_time / len(texts) if texts else 0,
+        'matched': sum(1 for r in results + first if r is not None),
+    }
+
+
+def print_results(results: Dict[str, Any]):
+    """Print results in human-readable format."""
+    print("=" * 110)
+    print("DATEPARSER PICKLE BENCHMARK RESULTS")
+    print("=" * 110)
+    print(f"{'Config':<14} {'Patterns':<9} {'Size (B)':<9} {'Dumps (ms)':<11} {'Warm loads (ms)':<16} "
+          f"{'Cold loads (ms)':<16} {'Snapshot (ms)':<14} {'Full state size':<16}")
+    print("-" * 110)
+    for row in results['configs']:
+        full = row['full_state']
+        full_size = f"{full['size']:,}" if full['size'] is not None else 'fails'
+        print(f"{row['config']:<14} {row['patterns']:<9} {row['size']:<9} "
+              f"{row['dumps_time'] * 1000:>9.3f}  "
+              f"{row['warm_loads_time'] * 1000:>14.3f}  "
+              f"{row['cold_loads_time'] * 1000:>14.1f}  "
+              f"{row['cold_snapshot_loads_time'] * 1000:>12.1f}  "
+              f"{full_size:<16}")
+    pool = results.get('process_pool')
+    if pool:
+        print()
+        print(f"Process pool: {pool['workers']} workers, first round {pool['first_round_time'] * 1000:.1f} ms, "
+              f"{pool['tasks']} warm tasks {pool['warm_time_per_task'] * 1000:.3f} ms per task")
+    print()
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description='Benchmark pickling of DateParser')
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=50,
+        help='Repeat each timing N times and keep the best (default: 50)'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=2,
+        help='Process pool workers, 0 to skip process pool benchmark (default: 2)'
+    )
+    parser.add_argument(
+        '--tasks',
+        type=int,
+        default=400,
+        help='Process pool tasks (default: 400)'
+    )
+    parser.add_argument(
+        '--output',
+        '-o',
+        help='Output JSON file path (default: benchmarks/results/pickle_benchmark_<timestamp>.json)'
+    )
+    args = parser.parse_args()
+
+    results = {
+        'timestamp': datetime.now().isoformat(),
+        'python_version': sys.version,
+        'configs': [],
+    }
+    with tempfile.TemporaryDirectory() as snapshot_dir:
+        for name, kwargs in CONFIGS.items():
+            print(f"Benchmarking '{name}'...")
+            results['configs'].append(benchmark_config(name, kwargs, args.repeat, snapshot_dir))
+    if args.workers > 0:
+        print("Benchmarking process pool...")
+        results['process_pool'] = benchmark_process_pool({}, args.tasks, args.workers)
+    print_results(results)
+
+    if args.output:
+        output_path = Path(args.output)
+    else:
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        output_dir = Path(__file__).parent / 'results'
+        output_dir.mkdir(exist_ok=True)
+        output_path = output_dir / f'pickle_benchmark_{timestamp}.json'
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False, default=str)
+    print(f"Results saved to {output_path}")
+
+
+if __name__ == '__main__':
+    main()
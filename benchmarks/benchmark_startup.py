@@ -0,0 +1,257 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Benchmark script for qddate startup cost across language subsets.
+
+This script:
+1. Runs every measurement in a fresh Python subprocess, so nothing is imported or built yet
+2. Measures cold `import qddate` time, `DateParser(...)` construction time and peak RSS
+3. Covers each single language, common language pairs and all languages, with
+   base_only=False and base_only=True
+4. Outputs results in JSON format comparable with baseline_test.json: the "initialization"
+   section has the same fields and is the all languages, base_only=False case
+"""
+
+import sys
+import json
+import subprocess
+import statistics
+import argparse
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+ROOT = Path(__file__).parent.parent
+
+# Add parent directory to path
+sys.path.insert(0, str(ROOT))
+
+from qddate.patterns import SUPPORTED_LANGUAGES
+
+COMMON_PAIRS = [['en', 'ru'], ['en', 'de'], ['en', 'fr'], ['en', 'es'], ['ru', 'bg']]
+
+# Measured in the subprocess, prints JSON with timings and peak RSS in bytes
+CHILD_SCRIPT = '''
+import json
+import sys
+import time
+sys.path.insert(0, sys.argv[2])
+
+def peak_rss():
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return rss if sys.platform == "darwin" else rss * 1024
+
+rss_start = peak_rss()
+start = time.perf_counter()
+import qddate
+import_time = time.perf_counter() - start
+rss_import = peak_rss()
+start = time.perf_counter()
+parser = qddate.DateParser(**json.loads(sys.argv[1]))
+init_time = time.perf_counter() - start
+print(json.dumps({
+    "import_time": import_time,
+    "init_time": init_time,
+    "patterns": len(parser.patterns),
+    "peak_rss_start": rss_start,
+    "peak_rss_import": rss_import,
+    "peak_rss": peak_rss(),
+}))
+'''
+
+
+def _percentile(data: List[float], p: float) -> float:
+    """Calculate percentile."""
+    if not data:
+        return 0.0
+    sorted_data = sorted(data)
+    k = (len(sorted_data) - 1) * p
+    f = int(k)
+    c = k - f
+    if f + 1 < len(sorted_data):
+        return sorted_data[f] + c * (sorted_data[f + 1] - sorted_data[f])
+    return sorted_data[f]
+
+
+def _timing_stats(operation: str, timings: List[float]) -> Dict[str, Any]:
+    """Timing statistics with the same fields as baseline_test.json sections."""
+    return {
+        'operation': operation,
+        'iterations': len(timings),
+        'total_time': sum(timings),
+        'mean': statistics.mean(timings),
+        'median': statistics.median(timings),
+        'min': min(timings),
+        'max': max(timings),
+        'stdev': statistics.stdev(timings) if len(timings) > 1 else 0,
+        'p50': _percentile(timings, 0.50),
+        'p90': _percentile(timings, 0.90),
+        'p95': _percentile(timings, 0.95),
+        'p99': _percentile(timings, 0.99),
+    }
+
+
+def build_configs(languages: List[str]) -> List[Dict[str, Any]]:
+    """Single languages, common pairs and all languages, each with base_only False and True."""
+    language_sets = [[lang] for lang in languages]
+    language_sets += [pair for pair in COMMON_PAIRS if all(lang in languages for lang in pair)]
+    language_sets.append(None)
+    configs = []
+    for base_only in (False, True):
+        for language_set in language_sets:
+            name = '+'.join(language_set) if language_set else 'all'
+            if base_only:
+                name += ':base_only'
+            kwargs = {'base_only': base_only}
+            if language_set:
+                kwargs['languages'] = language_set
+            configs.append({'name': name, 'kwargs': kwargs})
+    return configs
+
+
+def run_child(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """Measure one cold start in a fresh subprocess."""
+    output = subprocess.run([sys.executable, '-c', CHILD_SCRIPT, json.dumps(kwargs), str(ROOT)],
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def benchmark_config(config: Dict[str, Any], iterations: int) -> Dict[str, Any]:
+    """Measure import, init time and peak RSS of a configuration."""
+    samples = [run_child(config['kwargs']) for _ in range(iterations)]
+    rss = [s['peak_rss'] for s in samples if s['peak_rss'] is not None]
+    rss_import = [s['peak_rss_import'] for s in samples if s['peak_rss_import'] is not None]
+    rss_start = [s['peak_rss_start'] for s in samples if s['peak_rss_start'] is not None]
+    return {
+        'name': config['name'],
+        'kwargs': config['kwargs'],
+        'patterns': samples[0]['patterns'],
+        'import': _timing_stats('import', [s['import_time'] for s in samples]),
+        'initialization': _timing_stats('initialization', [s['init_time'] for s in samples]),
+        'startup_mean': statistics.mean(s['import_time'] + s['init_time'] for s in samples),
+        'peak_rss': max(rss) if rss else None,
+        'peak_rss_import': max(rss_import) if rss_import else None,
+        'peak_rss_interpreter': max(rss_start) if rss_start else None,
+    }
+
+
+def compare_with_baseline(results: Dict[str, Any], baseline: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Compare mean times with baseline: initialization of any baseline, matrix rows of previous runs."""
+    rows = []
+    current_init = results['initialization']['mean']
+    baseline_init = (baseline.get('initialization') or {}).get('mean')
+    if baseline_init:
+        rows.append({'metric': 'initialization.mean', 'baseline': baseline_init, 'current': current_init,
+                     'change_pct': (current_init - baseline_init) / baseline_init * 100})
+    baseline_matrix = {row['name']: row for row in baseline.get('matrix', [])}
+    for row in results['matrix']:
+        previous = baseline_matrix.get(row['name'])
+        if previous is None:
+            continue
+        for metric in ('import', 'initialization'):
+            before = previous[metric]['mean']
+            after = row[metric]['mean']
+            if before:
+                rows.append({'metric': f"{row['name']}.{metric}.mean", 'baseline': before, 'current': after,
+                             'change_pct': (after - before) / before * 100})
+    return rows
+
+
+def _mb(value: Optional[int]) -> str:
+    return f"{value / 1024 / 1024:.1f}" if value is not None else 'n/a'
+
+
+def print_results(results: Dict[str, Any]):
+    """Print results in human-readable format."""
+    print("=" * 100)
+    print("STARTUP BENCHMARK RESULTS")
+    print("=" * 100)
+    print(f"Python: {results['python_version'].split()[0]}, {results['iterations']} cold starts per config")
+    print()
+    print(f"{'Config':<22} {'Patterns':<9} {'Import (ms)':<12} {'Init (ms)':<11} {'Init p90 (ms)':<14} "
+          f"{'RSS import (MB)':<16} {'Peak RSS (MB)':<14}")
+    print("-" * 100)
+    for row in results['matrix']:
+        print(f"{row['name']:<22} {row['patterns']:<9} "
+              f"{row['import']['mean'] * 1000:>10.1f}  "
+              f"{row['initialization']['mean'] * 1000:>9.1f}  "
+              f"{row['initialization']['p90'] * 1000:>12.1f}  "
+              f"{_mb(row['peak_rss_import']):>14}  "
+              f"{_mb(row['peak_rss']):>12}")
+    if results.get('comparison'):
+        print()
+        print("Comparison with baseline:")
+        for row in results['comparison']:
+            print(f"  {row['metric']:<40} {row['baseline'] * 1000:>9.1f} ms -> {row['current'] * 1000:>9.1f} ms "
+                  f"({row['change_pct']:+.1f}%)")
+    print()
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(
+        description='Measure cold import and DateParser init time and peak RSS per language subset'
+    )
+    parser.add_argument(
+        '--iterations',
+        type=int,
+        default=5,
+        help='Cold starts per configuration (default: 5)'
+    )
+    parser.add_argument(
+        '--languages',
+        nargs='+',
+        default=list(SUPPORTED_LANGUAGES),
+        choices=list(SUPPORTED_LANGUAGES),
+        help='Single languages to measure (default: all supported)'
+    )
+    parser.add_argument(
+        '--baseline',
+        help='Baseline JSON (baseline_test.json or an earlier output of this script) to compare with'
+    )
+    parser.add_argument(
+        '--output',
+        '-o',
+        help='Output JSON file path (default: benchmarks/results/startup_benchmark_<timestamp>.json)'
+    )
+    args = parser.parse_args()
+
+    configs = build_configs(args.languages)
+    results = {
+        'timestamp': datetime.now().isoformat(),
+        'python_version': sys.version,
+        'iterations': args.iterations,
+        'matrix': [],
+    }
+    for config in configs:
+        print(f"Benchmarking '{config['name']}'...")
+        results['matrix'].append(benchmark_config(config, args.iterations))
+    all_languages = next(row for row in results['matrix'] if row['name'] == 'all')
+    results['import'] = all_languages['import']
+    results['initialization'] = all_languages['initialization']
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            results['comparison'] = compare_with_baseline(results, json.load(f))
+    print_results(results)
+
+    if args.output:
+        output_path = Path(args.output)
+    else:
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        output_dir = Path(__file__).parent / 'results'
+        output_dir.mkdir(exist_ok=True)
+        output_path = output_dir / f'startup_benchmark_{timestamp}.json'
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False, default=str)
+    print(f"Results saved to {output_path}")
+
+
+if __name__ == '__main__':
+    main()
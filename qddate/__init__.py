@@ -3,4 +3,6 @@ __version__ = '1.0.10'
 __author__ = "Ivan Begtin (ivan@begtin.tech)"
 __license__ = "BSD"
 
-from .qdparser import DateParser
+from .qdparser import DateParser, TextProfile
+from .spec import PatternSpec
+from .prewarm import prewarm
@@ -0,0 +1,283 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Small in-process caches used by DateParser
+__author__ = "Ivan Begtin (ivan@begtin.tech)"
+__license__ = "BSD"
+
+import hashlib
+import math
+import threading
+from collections import OrderedDict
+
+# Returned by ResultCache.get() for keys not in cache, None is a valid cached result
+MISSING = object()
+
+
+class ShapeCache:
+    """Bounded thread-safe map of text shape key -> candidates tried for the last text of it.
+
+    Value is the ordered tuple of candidate patterns up to and including the one that matched.
+    DateParser replays them against new text with the same key, continues with the rest of
+    candidates if none of them matches and reports the outcome with :meth:`record`. When the
+    cache is full the oldest entry is dropped.
+    """
+
+    def __init__(self, maxsize=1024):
+        """
+        :param maxsize: maximum number of shapes to remember
+        :type maxsize: int
+        """
+        self.maxsize = maxsize
+        self._data = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key):
+        """Return remembered patterns for shape key or None"""
+        with self._lock:
+            return self._data.get(key)
+
+    def record(self, hit):
+        """Count a lookup as hit if one of remembered patterns matched, as miss otherwise"""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def items(self):
+        """Return list of (shape key, patterns) from the oldest to the newest"""
+        with self._lock:
+            return list(self._data.items())
+
+    def put(self, key, patterns):
+        """Remember patterns for shape key, dropping the oldest entry if full"""
+        with self._lock:
+            data = self._data
+            if key not in data and len(data) >= self.maxsize:
+                del data[next(iter(data))]
+            data[key] = patterns
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """Return cache counters as dict"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+
+class FilterCache(ShapeCache):
+    """Bounded thread-safe map of text feature signature -> candidate mask left by pattern filters.
+
+    Filters depend only on a few discrete text features, so texts with the same signature get
+    the same mask. Every lookup counts as a hit or a miss. When the cache is full the oldest
+    entry is dropped.
+    """
+
+    def get(self, key):
+        """Return filter entry for signature key or None"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return entry
+
+
+class ResultCache:
+    """Bounded thread-safe LRU map of (text, options) -> match or parse result.
+
+    Results which depend on the current year (parsed with noyear patterns) are stored with
+    the year they were computed for and expire when the year changes. When the cache is full
+    the least recently used entry is evicted.
+    """
+
+    def __init__(self, maxsize=1024):
+        """
+        :param maxsize: maximum number of results to remember
+        :type maxsize: int
+        """
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, year=None):
+        """Return cached result for key or MISSING.
+
+        :param year: current year, results stored for another year are dropped
+        :type year: int|None
+        """
+        with self._lock:
+            try:
+                result, result_year = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return MISSING
+            if result_year is not None and result_year != year:
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return MISSING
+            self._data.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def items(self):
+        """Return list of (key, result, year) from the least to the most recently used"""
+        with self._lock:
+            return [(key, result, year) for key, (result, year) in self._data.items()]
+
+    def put(self, key, result, year=None):
+        """Remember result for key, evicting the least recently used entry if full
+
+        :param year: year the result depends on, None if it doesn't depend on the current year
+        :type year: int|None
+        """
+        with self._lock:
+            data = self._data
+            if key in data:
+                data.move_to_end(key)
+            elif len(data) >= self.maxsize:
+                data.popitem(last=False)
+                self.evictions += 1
+            data[key] = (result, year)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.expirations = 0
+
+    def stats(self):
+        """Return cache counters as dict"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+
+class BloomFilter:
+    """Fixed-memory set of strings which may report false positives but never false negatives.
+
+    Bits and number of hash functions are chosen for capacity strings at error_rate false
+    positive rate. Bit positions come from a blake2b digest of the string (double hashing),
+    so they are the same in every process. When capacity strings have been added the filter
+    is cleared, so the false positive rate never grows above error_rate. Thread-safe.
+    """
+
+    def __init__(self, capacity=100000, error_rate=0.001):
+        """
+        :param capacity: number of strings added before the filter is cleared
+        :type capacity: int
+        :param error_rate: false positive rate with capacity strings added, between 0 and 1
+        :type error_rate: float
+        """
+        if capacity <= 0:
+            raise ValueError(f"Bloom filter capacity should be positive, got {capacity!r}")
+        if not 0 < error_rate < 1:
+            raise ValueError(
+                f"Bloom filter error rate should be between 0 and 1, got {error_rate!r}")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.hits = 0
+        self.misses = 0
+        self.resets = 0
+
+    def __len__(self):
+        return self.count
+
+    def _positions(self, text):
+        digest = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        num_bits = self.num_bits
+        return [(h1 + i * h2) % num_bits for i in range(self.num_hashes)]
+
+    def __contains__(self, text):
+        positions = self._positions(text)
+        with self._lock:
+            bits = self._bits
+            for pos in positions:
+                if not bits[pos >> 3] & (1 << (pos & 7)):
+                    self.misses += 1
+                    return False
+            self.hits += 1
+            return True
+
+    def add(self, text):
+        """Add string, clearing the filter first if it already holds capacity strings"""
+        positions = self._positions(text)
+        with self._lock:
+            bits = self._bits
+            if self.count >= self.capacity:
+                bits[:] = bytes(len(bits))
+                self.count = 0
+                self.resets += 1
+            for pos in positions:
+                bits[pos >> 3] |= 1 << (pos & 7)
+            self.count += 1
+
+    def clear(self):
+        with self._lock:
+            self._bits[:] = bytes(len(self._bits))
+            self.count = 0
+            self.hits = 0
+            self.misses = 0
+            self.resets = 0
+
+    def stats(self):
+        """Return filter counters as dict, "fill_error_rate" is expected false positive rate
+        at current fill"""
+        with self._lock:
+            total = self.hits + self.misses
+            fill = 1 - math.exp(-self.num_hashes * self.count / self.num_bits)
+            return {
+                "size": self.count,
+                "capacity": self.capacity,
+                "error_rate": self.error_rate,
+                "fill_error_rate": fill ** self.num_hashes,
+                "bits": self.num_bits,
+                "hashes": self.num_hashes,
+                "bytes": len(self._bits),
+                "hits": self.hits,
+                "misses": self.misses,
+                "resets": self.resets,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
@@ -0,0 +1,210 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Merging of date patterns which differ only by case of month and weekday names
+__author__ = "Ivan Begtin (ivan@begtin.tech)"
+__license__ = "BSD"
+
+import copy
+import re
+
+from pyparsing import (ParseExpression, ParseElementEnhance, Regex, Word, Literal, White, oneOf,
+                       ParseBaseException)
+
+from .langdetect import collect_pattern_names
+
+# Pattern fields which may differ between case variants of the same pattern
+_VARIANT_FIELDS = ("key", "name", "pattern", "required_chars")
+
+# Merged lists by (languages, ids of input pattern dicts),
+# input dicts are kept referenced so ids stay valid
+_MERGED = {}
+
+_ALTERNATIVE_SPLIT = re.compile(r'(?<!\\)\|')
+_UNESCAPE = re.compile(r'\\(.)')
+
+
+def _name_symbols(expr):
+    """Returns symbols of month or weekday names list built by oneOf or None for other elements"""
+    if type(expr) is not Regex or expr.flags:
+        return None
+    symbols = [_UNESCAPE.sub(r'\1', part) for part in _ALTERNATIVE_SPLIT.split(expr.pattern)]
+    if '|'.join(re.escape(s) for s in symbols) != expr.pattern:
+        return None
+    if not all(any(c.isalpha() for c in s) for s in symbols):
+        return None
+    return symbols
+
+
+def _symbol_values(expr, symbols):
+    """Returns dict of lowercase symbol -> value expression returns for it,
+    None if values differ by case"""
+    values = {}
+    for symbol in symbols:
+        try:
+            tokens = expr.parseString(symbol, parseAll=True)
+        except ParseBaseException:
+            return None
+        if len(tokens) != 1:
+            return None
+        value = tokens[0]
+        if values.setdefault(symbol.lower(), value) != value:
+            return None
+    return values
+
+
+def _caseless_names(a, b, names):
+    """Returns single caseless element for two names lists with the same names in other case.
+
+    Element accepts names of both lists in any case and returns the same values as the lists.
+    """
+    symbols_a = _name_symbols(a)
+    symbols_b = _name_symbols(b)
+    if symbols_a is None or symbols_b is None:
+        return None
+    lower_a = {s.lower() for s in symbols_a}
+    lower_b = {s.lower() for s in symbols_b}
+    # Lists of the same names may have a few typos of their own,
+    # but must be names of the same language
+    if len(lower_a & lower_b) * 2 < min(len(lower_a), len(lower_b)):
+        return None
+    if not any(lower_a <= lang_names and lower_b <= lang_names for lang_names in names.values()):
+        return None
+    values = _symbol_values(a, symbols_a)
+    values_b = _symbol_values(b, symbols_b)
+    if values is None or values_b is None:
+        return None
+    for symbol, value in values_b.items():
+        value_a = values.setdefault(symbol, value)
+        if isinstance(value, str) and isinstance(value_a, str):
+            # names without parse action return themselves, any case is fine
+            continue
+        if value_a != value:
+            return None
+    if all(isinstance(value, str) for value in values.values()):
+        merged = oneOf(list(values), caseless=True)
+    else:
+        merged = oneOf(list(values), caseless=True).addParseAction(lambda t: values[t[0]])
+    if a.resultsName:
+        merged = merged.setResultsName(a.resultsName, listAllMatches=not a.modalResults)
+    return merged
+
+
+def _leaf_signature(expr):
+    if isinstance(expr, Word):
+        return (expr.initChars, expr.bodyChars, expr.minLen, expr.maxLen, expr.asKeyword)
+    if isinstance(expr, Literal):
+        return (expr.match,)
+    if isinstance(expr, Regex):
+        return (expr.pattern, expr.flags)
+    if isinstance(expr, White):
+        return (expr.matchWhite, expr.minLen, expr.maxLen)
+    return (str(expr),)
+
+
+def _same_settings(a, b):
+    return (type(a) is type(b) and a.resultsName == b.resultsName and
+            a.modalResults == b.modalResults and a.parseAction == b.parseAction and
+            a.skipWhitespace == b.skipWhitespace and a.whiteChars == b.whiteChars and
+            a.keepTabs == b.keepTabs and
+            getattr(a, 'defaultValue', None) == getattr(b, 'defaultValue', None))
+
+
+def merge_case_variants_expr(a, b, names):
+    """Merges two pyparsing expressions which differ only by case of month and weekday name lists.
+
+    :param a: pyparsing expression
+    :param b: pyparsing expression
+    :param names: dict of language code -> lowercase month and weekday names of the language
+    :type names: dict
+    :return: expression of a with name lists matched in any case, a itself if expressions are equal
+        or None if they differ otherwise
+    """
+    if a is b:
+        return a
+    if type(a) is not type(b):
+        return None
+    merged = _caseless_names(a, b, names)
+    if merged is not None:
+        return merged
+    if not _same_settings(a, b):
+        return None
+    if isinstance(a, ParseExpression):
+        if len(a.exprs) != len(b.exprs):
+            return None
+        exprs = []
+        for x, y in zip(a.exprs, b.exprs):
+            merged = merge_case_variants_expr(x, y, names)
+            if merged is None:
+                return None
+            exprs.append(merged)
+        if all(x is y for x, y in zip(exprs, a.exprs)):
+            return a
+        merged = copy.copy(a)
+        merged.exprs = exprs
+        return merged
+    if isinstance(a, ParseElementEnhance):
+        expr = merge_case_variants_expr(a.expr, b.expr, names)
+        if expr is None:
+            return None
+        if expr is a.expr:
+            return a
+        merged = copy.copy(a)
+        merged.expr = expr
+        return merged
+    if _leaf_signature(a) == _leaf_signature(b):
+        return a
+    return None
+
+
+def _variant_fields(pattern):
+    return {k: v for k, v in pattern.items() if k not in _VARIANT_FIELDS}
+
+
+def merge_case_variants(patterns, names=None, languages=None):
+    """Merges patterns which differ only by case of month and weekday names, like
+    "dt:date:date_eng1" and "dt:date:date_eng1_lc", into one pattern matching names in any case.
+
+    Merged pattern takes place and key of the first pattern of the pair, keys of merged patterns
+    are listed in its "case_keys".
+
+    :param patterns: list of pattern dicts
+    :type patterns: list
+    :param names: dict of language code -> lowercase month and weekday names, names of
+        qddate.patterns modules by default. Only names lists of the same language are merged
+    :type names: dict|None
+    :param languages: language codes of patterns, names of only these languages are collected
+        when names are not given. All languages by default
+    :type languages: list|tuple|set|None
+    :return: new list of patterns, pattern dicts without case variants are the same objects
+    :rtype: list
+    """
+    cache_key = None
+    if names is None:
+        if languages is not None:
+            languages = frozenset(languages)
+        cache_key = (languages, tuple(map(id, patterns)))
+        cached = _MERGED.get(cache_key)
+        if cached is not None:
+            return list(cached[1])
+        names = collect_pattern_names(languages)
+    result = list(patterns)
+    merged_into = {}
+    for i, a in enumerate(patterns):
+        if i in merged_into:
+            continue
+        fields = _variant_fields(a)
+        for j in range(i + 1, len(patterns)):
+            b = patterns[j]
+            if j in merged_into or _variant_fields(b) != fields:
+                continue
+            expr = merge_case_variants_expr(result[i]["pattern"], b["pattern"], names)
+            if expr is None or expr is result[i]["pattern"]:
+                continue
+            merged = {**result[i], "pattern": expr}
+            merged["case_keys"] = result[i].get("case_keys", ()) + (b["key"],)
+            result[i] = merged
+            merged_into[j] = i
+    result = [p for j, p in enumerate(result) if j not in merged_into]
+    if cache_key is not None:
+        _MERGED[cache_key] = (tuple(patterns), tuple(result))
+    return result
@@ -4,7 +4,10 @@
 __author__ = "Ivan Begtin (ivan@begtin.tech)"
 __license__ = "BSD"
 
-# Pre-computed basekey lists as constants for performance optimization
+from .index_tables import (PREFIX_ALL, PREFIX_ALPHA, PREFIX_DIGIT, PREFIX_DOT, PREFIX_SLASH,
+                           PREFIX_DASH, PREFIX_COMMA, PREFIX_SPACE, PREFIX_COMPACT)
+
+# Basekey groups of prefix matching
 _ALPHA_ENGLISH_BASEKEYS = [
     "dt:date:eng1",
     "dt:date:eng3",
@@ -171,45 +174,71 @@ _CZ_BASEKEYS = [
     "dt:date:cz_gen_lc",
 ]
 
-# Combined lists for O(1) access without runtime concatenation
-# Using tuples for immutability and slight performance benefit
-_ALPHA_ENGLISH_FULL = tuple(
-    _ALPHA_ENGLISH_BASEKEYS
-    + _PT_BASEKEYS
-    + _ES_BASEKEYS
-    + _IT_BASEKEYS
-    + _NL_ALPHA_BASEKEYS
-    + _FR_BASEKEYS
-)
-_DOT_SEPARATOR_FULL = tuple(_DOT_SEPARATOR_BASEKEYS + _DE_BASEKEYS)
-_DEFAULT_DIGIT_FULL = tuple(
-    _DEFAULT_DIGIT_BASEKEYS
-    + _EXTENDED_DIGIT_BASEKEYS
-    + _PT_BASEKEYS
-    + _DE_BASEKEYS
-    + _BG_BASEKEYS
-    + _ES_BASEKEYS
-    + _IT_BASEKEYS
-    + _TR_BASEKEYS
-    + _PL_BASEKEYS
-    + _NL_BASEKEYS
-    + _CZ_BASEKEYS
-    + _FR_BASEKEYS
-)
 _RUS_SEPARATOR_BASEKEYS = ("dt:date:date_rus",)
 _DASH_LONG_BASEKEYS = ("dt:date:date_iso8601", "dt:date:date_9")
 _DOT_LONG_BASEKEYS = ("dt:date:date_10",)
 
+# Combined basekey sets of the groups above are generated by scripts/generate_index_tables.py,
+# run it after editing the groups
+
+# Flags of separators found in text prefix
+_SEPARATOR_FLAGS = {'.': 1, '/': 2, '-': 4, ',': 8, ' ': 16}
+_FLAG_COMPACT = 32
+_FLAG_SETS = ((1, PREFIX_DOT), (2, PREFIX_SLASH), (4, PREFIX_DASH), (8, PREFIX_COMMA),
+              (16, PREFIX_SPACE), (_FLAG_COMPACT, PREFIX_COMPACT))
+
+# Basekey sets by flags, built on first use of each flags combination
+_PREFIX_SETS = {}
+
+
+def prefix_basekeys(text):
+    """Returns frozenset of pattern basekeys that could match text, see :func:`matchPrefix`.
 
-# Combined pattern sets for accuracy-first matching
-# These unions ensure we don't miss valid patterns due to overly restrictive filtering
-_ALL_ALPHA_PATTERNS = tuple(set(_ALPHA_ENGLISH_FULL + tuple(_ALPHA_NON_ENGLISH_BASEKEYS)))
-_ALL_SEPARATOR_PATTERNS = tuple(set(
-    list(_DOT_SEPARATOR_FULL) + 
-    list(_SLASH_SEPARATOR_BASEKEYS) + 
-    list(_DASH_SEPARATOR_BASEKEYS) + 
-    list(_RUS_SEPARATOR_BASEKEYS)
-))
+    Texts with the same separators in prefix get the same frozenset object.
+
+    :param text: text with date to match (typically first 6 characters)
+    :return: frozenset of pattern basekeys to run against
+    :rtype: frozenset
+    """
+    if not text:
+        return frozenset()
+
+    # Strip leading whitespace for analysis (but preserve original for matching)
+    text_stripped = text.lstrip()
+    if not text_stripped:
+        # All whitespace - return all patterns (comprehensive fallback)
+        return PREFIX_ALL
+
+    # Include all alpha patterns when we see a letter, this covers English and non-English patterns.
+    # Also include digit patterns that might match with leading text (e.g., "Wed 12/31/2023")
+    first_char = text_stripped[0]
+    if not first_char.isdigit() and first_char.isalpha():
+        return PREFIX_ALPHA
+
+    # Scan first 10 characters for separators, stop when 4 separator kinds are found
+    flags = 0
+    found = 0
+    for char in text_stripped[1:10]:
+        flag = _SEPARATOR_FLAGS.get(char)
+        if flag is not None and not flags & flag:
+            flags |= flag
+            found += 1
+            if found >= 4:
+                break
+
+    # If no separators found, it might be ISO format with dash later in the text
+    if not flags and len(text) >= 4 and text_stripped[:4].isdigit():
+        flags = _FLAG_COMPACT
+
+    basekeys = _PREFIX_SETS.get(flags)
+    if basekeys is None:
+        # Default digit patterns are always included as fallback for formats like "20231215"
+        basekeys = PREFIX_DIGIT
+        for flag, flag_basekeys in _FLAG_SETS:
+            if flags & flag:
+                basekeys = basekeys | flag_basekeys
+        _PREFIX_SETS[flags] = basekeys
+    return basekeys
 
 
 def matchPrefix(text):
@@ -230,102 +259,4 @@ def matchPrefix(text):
     :param text: text with date to match (typically first 6 characters)
     :return: list of pattern basekeys to run against
     """
-    text_len = len(text)
-    if text_len == 0:
-        return []
-
-    # Strip leading whitespace for analysis (but preserve original for matching)
-    text_stripped = text.lstrip()
-    if not text_stripped:
-        # All whitespace - return all patterns (comprehensive fallback)
-        all_patterns = list(_DEFAULT_DIGIT_FULL) + list(_ALL_ALPHA_PATTERNS) + list(_ALL_SEPARATOR_PATTERNS)
-        return list(set(all_patterns))
-    
-    first_char = text_stripped[0]
-    result_patterns = []
-    
-    # Check if text starts with a letter (alpha-based patterns)
-    if not first_char.isdigit():
-        fc = first_char.lower()
-        
-        # Include all alpha patterns when we see a letter
-        # This covers English and non-English patterns
-        if fc.isalpha():
-            result_patterns.extend(_ALL_ALPHA_PATTERNS)
-            # Also include digit patterns that might match with leading text
-            # (e.g., "Wed 12/31/2023")
-            result_patterns.extend(_ALL_SEPARATOR_PATTERNS)
-            return list(set(result_patterns))  # Remove duplicates
-    
-    # Text starts with a digit - analyze separator positions more comprehensively
-    # Check for separators across multiple positions, not just specific ones
-    separators_found = set()
-    has_dot = False
-    has_slash = False
-    has_dash = False
-    has_comma = False
-    has_space = False
-    
-    # Scan first 10 characters for separators (more thorough than original)
-    # This catches separators at various positions, not just 1, 2, 4
-    scan_len = min(10, len(text_stripped))
-    for i in range(1, scan_len):
-        char = text_stripped[i]
-        if char == '.':
-            has_dot = True
-            separators_found.add('dot')
-        elif char == '/':
-            has_slash = True
-            separators_found.add('slash')
-        elif char == '-':
-            has_dash = True
-            separators_found.add('dash')
-        elif char == ',':
-            has_comma = True
-            separators_found.add('comma')
-        elif char == ' ':
-            has_space = True
-            separators_found.add('space')
-        # Early exit optimization: if we've found all common separators, we can stop
-        if len(separators_found) >= 4:
-            break
-    
-    # Build result set based on what we found
-    # Be inclusive - if multiple separator types found, include all relevant patterns
-    # This ensures we don't miss dates due to format ambiguity
-    
-    if has_dot:
-        result_patterns.extend(_DOT_SEPARATOR_FULL)
-        result_patterns.extend(_DOT_LONG_BASEKEYS)
-    
-    if has_slash:
-        result_patterns.extend(_SLASH_SEPARATOR_BASEKEYS)
-    
-    if has_dash:
-        result_patterns.extend(_DASH_SEPARATOR_BASEKEYS)
-        result_patterns.extend(_DASH_LONG_BASEKEYS)
-    
-    if has_comma:
-        result_patterns.extend(_RUS_SEPARATOR_BASEKEYS)
-        # Comma can also appear in some English formats
-        result_patterns.extend(_ALPHA_ENGLISH_FULL)
-    
-    if has_space:
-        # Space is common in many formats - include alpha patterns
-        result_patterns.extend(_ALPHA_ENGLISH_FULL)
-        result_patterns.extend(_ALPHA_NON_ENGLISH_BASEKEYS)
-        # Also digit-based patterns with spaces (e.g., Russian dates)
-        result_patterns.extend(_DEFAULT_DIGIT_FULL)
-    
-    # Always include default digit patterns as fallback
-    # This handles cases like "20231215" (no separators), unusual formats,
-    # or formats that don't match any specific separator category
-    result_patterns.extend(_DEFAULT_DIGIT_FULL)
-    
-    # If no separators found, also check if it might be ISO format
-    # (even if dash isn't in first 10 chars, it might be later)
-    if not separators_found and text_len >= 4 and text_stripped[:4].isdigit():
-        result_patterns.extend(_DASH_SEPARATOR_BASEKEYS)
-    
-    # Remove duplicates and return
-    return list(set(result_patterns))
+    return list(prefix_basekeys(text))
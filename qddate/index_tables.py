@@ -0,0 +1,605 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Pattern index tables generated by scripts/generate_index_tables.py, do not edit by hand
+__author__ = "Ivan Begtin (ivan@begtin.tech)"
+__license__ = "BSD"
+
+# Pattern key -> (language of month and weekday names or None, separator kind,
+# year format without noyear and yearshort flags, required character sets)
+PATTERN_PROPERTIES = {
+    'dt:date:bg_base': ('bg', 'space', 'any', frozenset({'cyrillic', 'digits'})),
+    'dt:date:bg_base_lc': ('bg', 'space', 'any', frozenset({'cyrillic', 'digits'})),
+    'dt:date:cz_base': ('cz', 'space', 'any', frozenset({'accented', 'digits'})),
+    'dt:date:cz_base_lc': ('cz', 'space', 'any', frozenset({'accented', 'digits'})),
+    'dt:date:cz_gen': ('cz', 'space', 'any', frozenset({'accented', 'digits'})),
+    'dt:date:cz_gen_lc': ('cz', 'space', 'any', frozenset({'accented', 'digits'})),
+    'dt:date:date_1': (None, 'slash', 'any', frozenset({'digits'})),
+    'dt:date:date_10': (None, 'dot', '4digit', frozenset({'digits'})),
+    'dt:date:date_2': (None, 'dot', 'any', frozenset({'digits'})),
+    'dt:date:date_3': (None, 'slash', 'any', frozenset({'digits'})),
+    'dt:date:date_4': (None, 'dot', 'any', frozenset({'digits'})),
+    'dt:date:date_4_point': (None, 'dot', 'any', frozenset({'digits'})),
+    'dt:date:date_5': (None, 'none', 'any', frozenset({'digits'})),
+    'dt:date:date_6': (None, 'none', 'any', frozenset({'digits'})),
+    'dt:date:date_8': (None, 'slash', 'any', frozenset({'digits'})),
+    'dt:date:date_9': (None, 'dash', '4digit', frozenset({'digits'})),
+    'dt:date:date_eng1': ('en', 'dot', 'any', frozenset({'digits', 'latin'})),
+    'dt:date:date_eng1_lc': ('en', 'dot', 'any', frozenset({'digits', 'latin'})),
+    'dt:date:date_eng1_short': ('en', 'dot', 'any', frozenset({'digits', 'latin'})),
+    'dt:date:date_eng1x': ('en', 'dot', 'any', frozenset({'digits', 'latin'})),
+    'dt:date:date_eng2': ('en', 'space', 'any', frozenset({'digits', 'latin'})),
+    'dt:date:date_eng2_lc': ('en', 'space', 'any', frozenset({'digits', 'latin'})),
+    'dt:date:date_eng2_short': ('en', 'space', 'any', frozenset({'digits', 'latin'})),
+    'dt:date:date_eng3': ('en', 'space', 'any', frozenset({'digits', 'latin'})),
+    'dt:date:date_eng3_nolc': ('en', 'space', 'any', frozenset({'digits', 'latin'})),
+    'dt:date:date_eng4_short': ('en', 'space', 'any', frozenset({'digits', 'latin'})),
+    'dt:date:date_eng_abbrev1': ('en', 'space', 'any', frozenset({'digits', 'latin'})),
+    'dt:date:date_eng_abbrev2': ('en', 'space', 'any', frozenset({'digits', 'latin'})),
+    'dt:date:date_eng_abbrev3': ('en', 'space', 'any', frozenset({'digits', 'latin'})),
+    'dt:date:date_eng_abbrev_postfix': ('en', 'space', 'any', frozenset({'digits', 'latin'})),
+    'dt:date:date_iso8601': (None, 'dash', '4digit', frozenset({'digits'})),
+    'dt:date:date_iso8601_short': (None, 'dash', '4digit', frozenset({'digits'})),
+    'dt:date:date_rus': ('ru', 'space', 'any', frozenset({'cyrillic', 'digits'})),
+    'dt:date:date_rus2': ('ru', 'space', 'any', frozenset({'cyrillic', 'digits'})),
+    'dt:date:date_rus3': ('ru', 'dot', 'any', frozenset({'cyrillic', 'digits'})),
+    'dt:date:date_rus_lc1': ('ru', 'space', 'any', frozenset({'cyrillic', 'digits'})),
+    'dt:date:date_rus_lc2': ('ru', 'space', 'any', frozenset({'cyrillic', 'digits'})),
+    'dt:date:date_usa': ('en', 'slash', 'any', frozenset({'digits'})),
+    'dt:date:date_usa_1': ('en', 'slash', 'any', frozenset({'digits'})),
+    'dt:date:de_base': ('de', 'space', 'any', frozenset({'digits', 'latin'})),
+    'dt:date:de_base_lc': ('de', 'space', 'any', frozenset({'digits', 'latin'})),
+    'dt:date:de_rare_1': ('de', 'slash', 'any', frozenset({'digits', 'latin'})),
+    'dt:date:de_rare_2': ('de', 'dot', 'any', frozenset({'digits', 'latin'})),
+    'dt:date:de_short': ('de', 'space', 'any', frozenset({'digits', 'latin'})),
+    'dt:date:de_short_lc': ('de', 'space', 'any', frozenset({'digits', 'latin'})),
+    'dt:date:de_weekday': ('de', 'space', 'any', frozenset({'digits', 'latin'})),
+    'dt:date:de_weekday_lc': ('de', 'space', 'any', frozenset({'digits', 'latin'})),
+    'dt:date:es_base': ('es', 'space', 'any', frozenset({'accented', 'digits'})),
+    'dt:date:es_base_article': ('es', 'space', 'any', frozenset({'accented', 'digits'})),
+    'dt:date:es_base_lc': ('es', 'space', 'any', frozenset({'accented', 'digits'})),
+    'dt:date:es_base_lc_article': ('es', 'space', 'any', frozenset({'accented', 'digits'})),
+    'dt:date:es_rare_1': ('es', 'slash', 'any', frozenset({'accented', 'digits'})),
+    'dt:date:es_rare_2': ('es', 'dot', 'any', frozenset({'accented', 'digits'})),
+    'dt:date:es_short': ('es', 'space', 'any', frozenset({'accented', 'digits'})),
+    'dt:date:es_short_lc': ('es', 'space', 'any', frozenset({'accented', 'digits'})),
+    'dt:date:es_short_lc_monthfirst': ('es', 'space', 'any', frozenset({'accented', 'digits'})),
+    'dt:date:es_short_monthfirst': ('es', 'space', 'any', frozenset({'accented', 'digits'})),
+    'dt:date:es_weekday': ('es', 'space', 'any', frozenset({'accented', 'digits'})),
+    'dt:date:es_weekday_lc': ('es', 'space', 'any', frozenset({'accented', 'digits'})),
+    'dt:date:fr_base': ('fr', 'space', 'any', frozenset({'accented', 'digits'})),
+    'dt:date:fr_base_article': ('fr', 'space', 'any', frozenset({'accented', 'digits'})),
+    'dt:date:fr_base_lc': ('fr', 'space', 'any', frozenset({'accented', 'digits'})),
+    'dt:date:fr_base_lc_article': ('fr', 'space', 'any', frozenset({'accented', 'digits'})),
+    'dt:date:fr_short': ('fr', 'space', 'any', frozenset({'accented', 'digits'})),
+    'dt:date:fr_short_lc': ('fr', 'space', 'any', frozenset({'accented', 'digits'})),
+    'dt:date:fr_short_lc_monthfirst': ('fr', 'space', 'any', frozenset({'accented', 'digits'})),
+    'dt:date:fr_short_monthfirst': ('fr', 'space', 'any', frozenset({'accented', 'digits'})),
+    'dt:date:fr_weekday': ('fr', 'space', 'any', frozenset({'accented', 'digits'})),
+    'dt:date:fr_weekday_lc': ('fr', 'space', 'any', frozenset({'accented', 'digits'})),
+    'dt:date:it_base': ('it', 'space', 'any', frozenset({'accented', 'digits'})),
+    'dt:date:it_base_article': ('it', 'space', 'any', frozenset({'accented', 'digits'})),
+    'dt:date:it_base_lc': ('it', 'space', 'any', frozenset({'accented', 'digits'})),
+    'dt:date:it_base_lc_article': ('it', 'space', 'any', frozenset({'accented', 'digits'})),
+    'dt:date:it_rare_1': ('it', 'slash', 'any', frozenset({'accented', 'digits'})),
+    'dt:date:it_rare_2': ('it', 'dot', 'any', frozenset({'accented', 'digits'})),
+    'dt:date:it_short': ('it', 'space', 'any', frozenset({'accented', 'digits'})),
+    'dt:date:it_short_lc': ('it', 'space', 'any', frozenset({'accented', 'digits'})),
+    'dt:date:it_short_lc_monthfirst': ('it', 'space', 'any', frozenset({'accented', 'digits'})),
+    'dt:date:it_short_monthfirst': ('it', 'space', 'any', frozenset({'accented', 'digits'})),
+    'dt:date:it_weekday': ('it', 'space', 'any', frozenset({'accented', 'digits'})),
+    'dt:date:it_weekday_lc': ('it', 'space', 'any', frozenset({'accented', 'digits'})),
+    'dt:date:nl_base': ('nl', 'space', 'any', frozenset({'digits', 'latin'})),
+    'dt:date:nl_base_lc': ('nl', 'space', 'any', frozenset({'digits', 'latin'})),
+    'dt:date:nl_rare_1': ('nl', 'slash', 'any', frozenset({'digits', 'latin'})),
+    'dt:date:nl_rare_2': ('nl', 'dot', 'any', frozenset({'digits', 'latin'})),
+    'dt:date:nl_short': ('nl', 'space', 'any', frozenset({'digits', 'latin'})),
+    'dt:date:nl_short_lc': ('nl', 'space', 'any', frozenset({'digits', 'latin'})),
+    'dt:date:nl_weekday': ('nl', 'space', 'any', frozenset({'digits', 'latin'})),
+    'dt:date:nl_weekday_lc': ('nl', 'space', 'any', frozenset({'digits', 'latin'})),
+    'dt:date:noyear_1': (None, 'dot', 'any', frozenset({'digits'})),
+    'dt:date:pl_base': ('pl', 'space', 'any', frozenset({'accented', 'digits'})),
+    'dt:date:pl_base_lc': ('pl', 'space', 'any', frozenset({'accented', 'digits'})),
+    'dt:date:pl_gen': ('pl', 'space', 'any', frozenset({'accented', 'digits'})),
+    'dt:date:pl_gen_lc': ('pl', 'space', 'any', frozenset({'accented', 'digits'})),
+    'dt:date:pt_base': ('pt', 'space', 'any', frozenset({'accented', 'digits'})),
+    'dt:date:pt_base_article': ('pt', 'space', 'any', frozenset({'accented', 'digits'})),
+    'dt:date:pt_base_lc': ('pt', 'space', 'any', frozenset({'accented', 'digits'})),
+    'dt:date:pt_base_lc_article': ('pt', 'space', 'any', frozenset({'accented', 'digits'})),
+    'dt:date:pt_short': ('pt', 'space', 'any', frozenset({'accented', 'digits'})),
+    'dt:date:pt_short_lc': ('pt', 'space', 'any', frozenset({'accented', 'digits'})),
+    'dt:date:pt_short_lc_monthfirst': ('pt', 'space', 'any', frozenset({'accented', 'digits'})),
+    'dt:date:pt_short_monthfirst': ('pt', 'space', 'any', frozenset({'accented', 'digits'})),
+    'dt:date:pt_weekday': ('pt', 'space', 'any', frozenset({'accented', 'digits'})),
+    'dt:date:pt_weekday_lc': ('pt', 'space', 'any', frozenset({'accented', 'digits'})),
+    'dt:date:pt_weekday_short': ('pt', 'space', 'any', frozenset({'accented', 'digits'})),
+    'dt:date:pt_weekday_short_lc': ('pt', 'space', 'any', frozenset({'accented', 'digits'})),
+    'dt:date:rus_rare_2': ('ru', 'dot', 'any', frozenset({'cyrillic', 'digits'})),
+    'dt:date:rus_rare_3': ('ru', 'dot', 'any', frozenset({'cyrillic', 'digits'})),
+    'dt:date:rus_rare_5': ('ru', 'space', 'any', frozenset({'cyrillic', 'digits'})),
+    'dt:date:rus_rare_6': ('ru', 'space', 'any', frozenset({'cyrillic', 'digits'})),
+    'dt:date:tr_base': ('tr', 'space', 'any', frozenset({'digits', 'latin'})),
+    'dt:date:tr_base_lc': ('tr', 'space', 'any', frozenset({'digits', 'latin'})),
+    'dt:date:weekday_eng': ('en', 'space', 'any', frozenset({'digits', 'latin'})),
+    'dt:date:weekday_eng_abbrev1': ('en', 'space', 'any', frozenset({'digits', 'latin'})),
+    'dt:date:weekday_eng_abbrev2': ('en', 'space', 'any', frozenset({'digits', 'latin'})),
+    'dt:date:weekday_eng_abbrev3': ('en', 'space', 'any', frozenset({'digits', 'latin'})),
+    'dt:date:weekday_eng_iso': ('en', 'space', 'any', frozenset({'digits', 'latin'})),
+    'dt:date:weekday_eng_lc': ('en', 'space', 'any', frozenset({'digits', 'latin'})),
+    'dt:date:weekday_eng_mixed': ('en', 'space', 'any', frozenset({'digits', 'latin'})),
+    'dt:date:weekday_eng_mshort_wshort': ('en', 'space', 'any', frozenset({'digits', 'latin'})),
+    'dt:date:weekday_eng_wshort': ('en', 'space', 'any', frozenset({'digits', 'latin'})),
+    'dt:date:weekday_rus': ('ru', 'space', 'any', frozenset({'cyrillic', 'digits'})),
+    'dt:date:weekday_rus_lc1': ('ru', 'space', 'any', frozenset({'cyrillic', 'digits'})),
+    'dt:date:weekday_short_eng_iso': ('en', 'space', 'any', frozenset({'digits', 'latin'})),
+}
+
+# Whitespace only text
+PREFIX_ALL = frozenset({
+    'dt:date:bg_base',
+    'dt:date:bg_base_lc',
+    'dt:date:cz_base',
+    'dt:date:cz_base_lc',
+    'dt:date:cz_gen',
+    'dt:date:cz_gen_lc',
+    'dt:date:date_1',
+    'dt:date:date_2',
+    'dt:date:date_3',
+    'dt:date:date_4',
+    'dt:date:date_4_point',
+    'dt:date:date_5',
+    'dt:date:date_6',
+    'dt:date:date_7',
+    'dt:date:date_8',
+    'dt:date:date_9',
+    'dt:date:date_eng1',
+    'dt:date:date_eng1_lc',
+    'dt:date:date_eng1_short',
+    'dt:date:date_eng1x',
+    'dt:date:date_eng1xx',
+    'dt:date:date_eng2',
+    'dt:date:date_eng2_lc',
+    'dt:date:date_eng2_short',
+    'dt:date:date_eng3',
+    'dt:date:date_eng3_nolc',
+    'dt:date:date_iso8601',
+    'dt:date:date_iso8601_short',
+    'dt:date:date_rus',
+    'dt:date:date_rus2',
+    'dt:date:date_rus3',
+    'dt:date:date_rus_lc1',
+    'dt:date:date_rus_lc2',
+    'dt:date:date_usa',
+    'dt:date:date_usa_1',
+    'dt:date:de_base',
+    'dt:date:de_base_lc',
+    'dt:date:de_rare_1',
+    'dt:date:de_rare_2',
+    'dt:date:de_weekday',
+    'dt:date:de_weekday_lc',
+    'dt:date:eng1',
+    'dt:date:eng3',
+    'dt:date:es_base',
+    'dt:date:es_base_article',
+    'dt:date:es_base_lc',
+    'dt:date:es_base_lc_article',
+    'dt:date:es_rare_1',
+    'dt:date:es_rare_2',
+    'dt:date:es_short',
+    'dt:date:es_short_lc',
+    'dt:date:es_short_lc_monthfirst',
+    'dt:date:es_short_monthfirst',
+    'dt:date:es_weekday',
+    'dt:date:es_weekday_lc',
+    'dt:date:fr_base',
+    'dt:date:fr_base_article',
+    'dt:date:fr_base_lc',
+    'dt:date:fr_base_lc_article',
+    'dt:date:fr_short',
+    'dt:date:fr_short_lc',
+    'dt:date:fr_short_lc_monthfirst',
+    'dt:date:fr_short_monthfirst',
+    'dt:date:fr_weekday',
+    'dt:date:fr_weekday_lc',
+    'dt:date:it_base',
+    'dt:date:it_base_article',
+    'dt:date:it_base_lc',
+    'dt:date:it_base_lc_article',
+    'dt:date:it_rare_1',
+    'dt:date:it_rare_2',
+    'dt:date:nl_base',
+    'dt:date:nl_base_lc',
+    'dt:date:nl_rare_1',
+    'dt:date:nl_rare_2',
+    'dt:date:nl_short',
+    'dt:date:nl_short_lc',
+    'dt:date:nl_weekday',
+    'dt:date:nl_weekday_lc',
+    'dt:date:noyear_1',
+    'dt:date:pl_base',
+    'dt:date:pl_base_lc',
+    'dt:date:pl_gen',
+    'dt:date:pl_gen_lc',
+    'dt:date:pt_base',
+    'dt:date:pt_base_article',
+    'dt:date:pt_base_lc',
+    'dt:date:pt_base_lc_article',
+    'dt:date:pt_short',
+    'dt:date:pt_short_lc',
+    'dt:date:pt_short_lc_monthfirst',
+    'dt:date:pt_short_monthfirst',
+    'dt:date:pt_weekday_short',
+    'dt:date:pt_weekday_short_lc',
+    'dt:date:rare_1',
+    'dt:date:rare_2',
+    'dt:date:rare_3',
+    'dt:date:rare_4',
+    'dt:date:rare_5',
+    'dt:date:rare_6',
+    'dt:date:rus_rare_2',
+    'dt:date:rus_rare_3',
+    'dt:date:rus_rare_5',
+    'dt:date:rus_rare_6',
+    'dt:date:tr_base',
+    'dt:date:tr_base_lc',
+    'dt:date:weekday_eng',
+    'dt:date:weekday_eng_abbrev3',
+    'dt:date:weekday_eng_iso',
+    'dt:date:weekday_eng_lc',
+    'dt:date:weekday_eng_mixed',
+    'dt:date:weekday_eng_mshort_wshort',
+    'dt:date:weekday_eng_wshort',
+    'dt:date:weekday_rus',
+    'dt:date:weekday_rus_lc1',
+    'dt:date:weekday_short_eng_iso',
+})
+
+# Text starting with a letter
+PREFIX_ALPHA = frozenset({
+    'dt:date:date_1',
+    'dt:date:date_2',
+    'dt:date:date_4',
+    'dt:date:date_4_point',
+    'dt:date:date_8',
+    'dt:date:date_9',
+    'dt:date:date_eng1',
+    'dt:date:date_eng2',
+    'dt:date:date_eng2_lc',
+    'dt:date:date_eng2_short',
+    'dt:date:date_eng3',
+    'dt:date:date_eng3_nolc',
+    'dt:date:date_iso8601',
+    'dt:date:date_iso8601_short',
+    'dt:date:date_rus',
+    'dt:date:date_rus3',
+    'dt:date:date_usa',
+    'dt:date:date_usa_1',
+    'dt:date:de_base',
+    'dt:date:de_base_lc',
+    'dt:date:de_rare_1',
+    'dt:date:de_rare_2',
+    'dt:date:de_weekday',
+    'dt:date:de_weekday_lc',
+    'dt:date:eng1',
+    'dt:date:eng3',
+    'dt:date:es_base',
+    'dt:date:es_base_article',
+    'dt:date:es_base_lc',
+    'dt:date:es_base_lc_article',
+    'dt:date:es_rare_1',
+    'dt:date:es_rare_2',
+    'dt:date:es_short',
+    'dt:date:es_short_lc',
+    'dt:date:es_short_lc_monthfirst',
+    'dt:date:es_short_monthfirst',
+    'dt:date:es_weekday',
+    'dt:date:es_weekday_lc',
+    'dt:date:fr_base',
+    'dt:date:fr_base_article',
+    'dt:date:fr_base_lc',
+    'dt:date:fr_base_lc_article',
+    'dt:date:fr_short',
+    'dt:date:fr_short_lc',
+    'dt:date:fr_short_lc_monthfirst',
+    'dt:date:fr_short_monthfirst',
+    'dt:date:fr_weekday',
+    'dt:date:fr_weekday_lc',
+    'dt:date:it_base',
+    'dt:date:it_base_article',
+    'dt:date:it_base_lc',
+    'dt:date:it_base_lc_article',
+    'dt:date:it_rare_1',
+    'dt:date:it_rare_2',
+    'dt:date:nl_rare_1',
+    'dt:date:nl_rare_2',
+    'dt:date:nl_weekday',
+    'dt:date:nl_weekday_lc',
+    'dt:date:noyear_1',
+    'dt:date:pt_base',
+    'dt:date:pt_base_article',
+    'dt:date:pt_base_lc',
+    'dt:date:pt_base_lc_article',
+    'dt:date:pt_short',
+    'dt:date:pt_short_lc',
+    'dt:date:pt_short_lc_monthfirst',
+    'dt:date:pt_short_monthfirst',
+    'dt:date:pt_weekday_short',
+    'dt:date:pt_weekday_short_lc',
+    'dt:date:rare_1',
+    'dt:date:rare_2',
+    'dt:date:rare_3',
+    'dt:date:rare_5',
+    'dt:date:rare_6',
+    'dt:date:rus_rare_2',
+    'dt:date:rus_rare_3',
+    'dt:date:rus_rare_5',
+    'dt:date:rus_rare_6',
+    'dt:date:weekday_eng',
+    'dt:date:weekday_eng_abbrev3',
+    'dt:date:weekday_eng_iso',
+    'dt:date:weekday_eng_lc',
+    'dt:date:weekday_eng_mixed',
+    'dt:date:weekday_eng_mshort_wshort',
+    'dt:date:weekday_eng_wshort',
+    'dt:date:weekday_rus',
+    'dt:date:weekday_rus_lc1',
+    'dt:date:weekday_short_eng_iso',
+})
+
+# Text starting with a digit, always included
+PREFIX_DIGIT = frozenset({
+    'dt:date:bg_base',
+    'dt:date:bg_base_lc',
+    'dt:date:cz_base',
+    'dt:date:cz_base_lc',
+    'dt:date:cz_gen',
+    'dt:date:cz_gen_lc',
+    'dt:date:date_1',
+    'dt:date:date_3',
+    'dt:date:date_5',
+    'dt:date:date_6',
+    'dt:date:date_7',
+    'dt:date:date_8',
+    'dt:date:date_9',
+    'dt:date:date_eng1',
+    'dt:date:date_eng1_lc',
+    'dt:date:date_eng1_short',
+    'dt:date:date_eng1x',
+    'dt:date:date_eng1xx',
+    'dt:date:date_rus',
+    'dt:date:date_rus2',
+    'dt:date:date_rus_lc1',
+    'dt:date:date_rus_lc2',
+    'dt:date:date_usa',
+    'dt:date:date_usa_1',
+    'dt:date:de_base',
+    'dt:date:de_base_lc',
+    'dt:date:de_rare_1',
+    'dt:date:de_rare_2',
+    'dt:date:de_weekday',
+    'dt:date:de_weekday_lc',
+    'dt:date:es_base',
+    'dt:date:es_base_article',
+    'dt:date:es_base_lc',
+    'dt:date:es_base_lc_article',
+    'dt:date:es_rare_1',
+    'dt:date:es_rare_2',
+    'dt:date:es_short',
+    'dt:date:es_short_lc',
+    'dt:date:es_short_lc_monthfirst',
+    'dt:date:es_short_monthfirst',
+    'dt:date:es_weekday',
+    'dt:date:es_weekday_lc',
+    'dt:date:fr_base',
+    'dt:date:fr_base_article',
+    'dt:date:fr_base_lc',
+    'dt:date:fr_base_lc_article',
+    'dt:date:fr_short',
+    'dt:date:fr_short_lc',
+    'dt:date:fr_short_lc_monthfirst',
+    'dt:date:fr_short_monthfirst',
+    'dt:date:fr_weekday',
+    'dt:date:fr_weekday_lc',
+    'dt:date:it_base',
+    'dt:date:it_base_article',
+    'dt:date:it_base_lc',
+    'dt:date:it_base_lc_article',
+    'dt:date:it_rare_1',
+    'dt:date:it_rare_2',
+    'dt:date:nl_base',
+    'dt:date:nl_base_lc',
+    'dt:date:nl_short',
+    'dt:date:nl_short_lc',
+    'dt:date:pl_base',
+    'dt:date:pl_base_lc',
+    'dt:date:pl_gen',
+    'dt:date:pl_gen_lc',
+    'dt:date:pt_base',
+    'dt:date:pt_base_article',
+    'dt:date:pt_base_lc',
+    'dt:date:pt_base_lc_article',
+    'dt:date:pt_short',
+    'dt:date:pt_short_lc',
+    'dt:date:pt_short_lc_monthfirst',
+    'dt:date:pt_short_monthfirst',
+    'dt:date:pt_weekday_short',
+    'dt:date:pt_weekday_short_lc',
+    'dt:date:rare_1',
+    'dt:date:rare_2',
+    'dt:date:rare_3',
+    'dt:date:rare_4',
+    'dt:date:tr_base',
+    'dt:date:tr_base_lc',
+})
+
+# Dot in the first 10 characters
+PREFIX_DOT = frozenset({
+    'dt:date:date_10',
+    'dt:date:date_2',
+    'dt:date:date_4',
+    'dt:date:date_4_point',
+    'dt:date:date_eng1',
+    'dt:date:date_rus3',
+    'dt:date:de_base',
+    'dt:date:de_base_lc',
+    'dt:date:de_rare_1',
+    'dt:date:de_rare_2',
+    'dt:date:de_weekday',
+    'dt:date:de_weekday_lc',
+    'dt:date:noyear_1',
+    'dt:date:rare_2',
+    'dt:date:rare_3',
+    'dt:date:rus_rare_2',
+    'dt:date:rus_rare_3',
+})
+
+# Slash in the first 10 characters
+PREFIX_SLASH = frozenset({
+    'dt:date:date_1',
+    'dt:date:date_8',
+    'dt:date:date_9',
+    'dt:date:date_usa',
+    'dt:date:date_usa_1',
+    'dt:date:rare_1',
+})
+
+# Dash in the first 10 characters
+PREFIX_DASH = frozenset({
+    'dt:date:date_9',
+    'dt:date:date_iso8601',
+    'dt:date:date_iso8601_short',
+})
+
+# Comma in the first 10 characters
+PREFIX_COMMA = frozenset({
+    'dt:date:date_eng2',
+    'dt:date:date_eng2_lc',
+    'dt:date:date_eng2_short',
+    'dt:date:date_eng3',
+    'dt:date:date_eng3_nolc',
+    'dt:date:date_rus',
+    'dt:date:eng1',
+    'dt:date:eng3',
+    'dt:date:es_base',
+    'dt:date:es_base_article',
+    'dt:date:es_base_lc',
+    'dt:date:es_base_lc_article',
+    'dt:date:es_rare_1',
+    'dt:date:es_rare_2',
+    'dt:date:es_short',
+    'dt:date:es_short_lc',
+    'dt:date:es_short_lc_monthfirst',
+    'dt:date:es_short_monthfirst',
+    'dt:date:es_weekday',
+    'dt:date:es_weekday_lc',
+    'dt:date:fr_base',
+    'dt:date:fr_base_article',
+    'dt:date:fr_base_lc',
+    'dt:date:fr_base_lc_article',
+    'dt:date:fr_short',
+    'dt:date:fr_short_lc',
+    'dt:date:fr_short_lc_monthfirst',
+    'dt:date:fr_short_monthfirst',
+    'dt:date:fr_weekday',
+    'dt:date:fr_weekday_lc',
+    'dt:date:it_base',
+    'dt:date:it_base_article',
+    'dt:date:it_base_lc',
+    'dt:date:it_base_lc_article',
+    'dt:date:it_rare_1',
+    'dt:date:it_rare_2',
+    'dt:date:nl_rare_1',
+    'dt:date:nl_rare_2',
+    'dt:date:nl_weekday',
+    'dt:date:nl_weekday_lc',
+    'dt:date:pt_base',
+    'dt:date:pt_base_article',
+    'dt:date:pt_base_lc',
+    'dt:date:pt_base_lc_article',
+    'dt:date:pt_short',
+    'dt:date:pt_short_lc',
+    'dt:date:pt_short_lc_monthfirst',
+    'dt:date:pt_short_monthfirst',
+    'dt:date:pt_weekday_short',
+    'dt:date:pt_weekday_short_lc',
+    'dt:date:weekday_eng',
+    'dt:date:weekday_eng_abbrev3',
+    'dt:date:weekday_eng_iso',
+    'dt:date:weekday_eng_lc',
+    'dt:date:weekday_eng_mixed',
+    'dt:date:weekday_eng_mshort_wshort',
+    'dt:date:weekday_eng_wshort',
+    'dt:date:weekday_short_eng_iso',
+})
+
+# Space in the first 10 characters
+PREFIX_SPACE = frozenset({
+    'dt:date:date_eng2',
+    'dt:date:date_eng2_lc',
+    'dt:date:date_eng2_short',
+    'dt:date:date_eng3',
+    'dt:date:date_eng3_nolc',
+    'dt:date:eng1',
+    'dt:date:eng3',
+    'dt:date:es_base',
+    'dt:date:es_base_article',
+    'dt:date:es_base_lc',
+    'dt:date:es_base_lc_article',
+    'dt:date:es_rare_1',
+    'dt:date:es_rare_2',
+    'dt:date:es_short',
+    'dt:date:es_short_lc',
+    'dt:date:es_short_lc_monthfirst',
+    'dt:date:es_short_monthfirst',
+    'dt:date:es_weekday',
+    'dt:date:es_weekday_lc',
+    'dt:date:fr_base',
+    'dt:date:fr_base_article',
+    'dt:date:fr_base_lc',
+    'dt:date:fr_base_lc_article',
+    'dt:date:fr_short',
+    'dt:date:fr_short_lc',
+    'dt:date:fr_short_lc_monthfirst',
+    'dt:date:fr_short_monthfirst',
+    'dt:date:fr_weekday',
+    'dt:date:fr_weekday_lc',
+    'dt:date:it_base',
+    'dt:date:it_base_article',
+    'dt:date:it_base_lc',
+    'dt:date:it_base_lc_article',
+    'dt:date:it_rare_1',
+    'dt:date:it_rare_2',
+    'dt:date:nl_rare_1',
+    'dt:date:nl_rare_2',
+    'dt:date:nl_weekday',
+    'dt:date:nl_weekday_lc',
+    'dt:date:pt_base',
+    'dt:date:pt_base_article',
+    'dt:date:pt_base_lc',
+    'dt:date:pt_base_lc_article',
+    'dt:date:pt_short',
+    'dt:date:pt_short_lc',
+    'dt:date:pt_short_lc_monthfirst',
+    'dt:date:pt_short_monthfirst',
+    'dt:date:pt_weekday_short',
+    'dt:date:pt_weekday_short_lc',
+    'dt:date:rare_5',
+    'dt:date:rare_6',
+    'dt:date:rus_rare_5',
+    'dt:date:rus_rare_6',
+    'dt:date:weekday_eng',
+    'dt:date:weekday_eng_abbrev3',
+    'dt:date:weekday_eng_iso',
+    'dt:date:weekday_eng_lc',
+    'dt:date:weekday_eng_mixed',
+    'dt:date:weekday_eng_mshort_wshort',
+    'dt:date:weekday_eng_wshort',
+    'dt:date:weekday_rus',
+    'dt:date:weekday_rus_lc1',
+    'dt:date:weekday_short_eng_iso',
+})
+
+# No separators and 4 leading digits, like yyyymmdd
+PREFIX_COMPACT = frozenset({
+    'dt:date:date_iso8601',
+    'dt:date:date_iso8601_short',
+})
@@ -0,0 +1,249 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Month and weekday name based language detection
+__author__ = "Ivan Begtin (ivan@begtin.tech)"
+__license__ = "BSD"
+
+import re
+from importlib import import_module
+
+# Same values as CHAR_SET_* constants of qdparser, which imports this module
+CHAR_SET_LATIN = 'latin'
+CHAR_SET_CYRILLIC = 'cyrillic'
+CHAR_SET_ACCENTED = 'accented'
+
+# Month names that make language detection confident,
+# as groups of (language, names, whole words only).
+# Languages of a group are checked in order and the first one with a name in text wins.
+_RUSSIAN_MONTHS = frozenset(['января', 'февраля', 'марта', 'апреля', 'мая', 'июня',
+                             'июля', 'августа', 'сентября', 'октября', 'ноября', 'декабря',
+                             'январь', 'февраль', 'март', 'апрель', 'июнь', 'июль',
+                             'август', 'сентябрь', 'октябрь', 'ноябрь', 'декабрь'])
+_FRENCH_MONTHS = frozenset(['janvier', 'février', 'mars', 'avril', 'mai', 'juin',
+                            'juillet', 'août', 'septembre', 'octobre', 'novembre', 'décembre'])
+_SPANISH_MONTHS = frozenset(['enero', 'febrero', 'marzo', 'abril', 'mayo', 'junio',
+                            'julio', 'agosto', 'septiembre', 'octubre', 'noviembre', 'diciembre'])
+_ITALIAN_MONTHS = frozenset(['gennaio', 'febbraio', 'marzo', 'aprile', 'maggio', 'giugno',
+                            'luglio', 'agosto', 'settembre', 'ottobre', 'novembre', 'dicembre'])
+_PORTUGUESE_MONTHS = frozenset(['janeiro', 'fevereiro', 'março', 'abril', 'maio', 'junho',
+                               'julho', 'agosto', 'setembro', 'outubro', 'novembro', 'dezembro'])
+_CZECH_MONTHS = frozenset(['leden', 'únor', 'březen', 'duben', 'květen', 'červen',
+                           'červenec', 'srpen', 'září', 'říjen', 'listopad', 'prosinec'])
+_POLISH_MONTHS = frozenset(['styczeń', 'stycznia', 'luty', 'lutego', 'marzec', 'marca',
+                            'kwiecień', 'kwietnia', 'maj', 'maja', 'czerwiec', 'czerwca',
+                            'lipiec', 'lipca', 'sierpień', 'sierpnia', 'wrzesień', 'września',
+                            'październik', 'października', 'listopad', 'listopada',
+                            'grudzień', 'grudnia'])
+_ENGLISH_MONTHS = frozenset(['january', 'february', 'march', 'april', 'may', 'june',
+                            'july', 'august', 'september', 'october', 'november', 'december',
+                            'jan', 'feb', 'mar', 'apr', 'may', 'jun',
+                            'jul', 'aug', 'sep', 'oct', 'nov', 'dec'])
+_GERMAN_MONTHS = frozenset(['januar', 'februar', 'märz', 'april', 'mai', 'juni',
+                           'juli', 'august', 'september', 'oktober', 'november', 'dezember'])
+_DUTCH_MONTHS = frozenset(['januari', 'februari', 'maart', 'april', 'mei', 'juni',
+                          'juli', 'augustus', 'september', 'oktober', 'november', 'december'])
+_TURKISH_MONTHS = frozenset(['ocak', 'şubat', 'mart', 'nisan', 'mayıs', 'haziran',
+                            'temmuz', 'ağustos', 'eylül', 'ekim', 'kasım', 'aralık'])
+
+CYRILLIC_LANGUAGES = (('ru', _RUSSIAN_MONTHS, False),)
+ACCENTED_LANGUAGES = (
+    ('fr', _FRENCH_MONTHS, False),
+    ('es', _SPANISH_MONTHS, False),
+    ('it', _ITALIAN_MONTHS, False),
+    ('pt', _PORTUGUESE_MONTHS, False),
+    ('cz', _CZECH_MONTHS, False),
+    ('pl', _POLISH_MONTHS, False),
+)
+LATIN_LANGUAGES = (
+    ('en', _ENGLISH_MONTHS, True),
+    ('nl', _DUTCH_MONTHS, False),
+    ('de', _GERMAN_MONTHS, True),
+    ('tr', _TURKISH_MONTHS, False),
+)
+
+# Pattern modules and language of month and weekday names defined there
+PATTERN_MODULES = (
+    ('base', 'en'), ('bg', 'bg'), ('cz', 'cz'), ('de', 'de'), ('es', 'es'), ('fr', 'fr'),
+    ('it', 'it'), ('nl', 'nl'), ('pl', 'pl'), ('pt', 'pt'), ('ru', 'ru'), ('tr', 'tr'),
+)
+_NAME_LIST_RE = re.compile(r'^[A-Z]+_(MONTHS|WEEKDAYS)(_[A-Z]+)*$')
+
+
+def collect_pattern_names(languages=None):
+    """Collects lowercase month and weekday names of qddate.patterns modules.
+
+    :param languages: language codes to collect names of, all languages by default.
+        Modules of other languages are not imported
+    :type languages: list|tuple|set|None
+    :return: dict of language code -> frozenset of names
+    :rtype: dict
+    """
+    names = {}
+    for module_name, lang in PATTERN_MODULES:
+        if languages is not None and lang not in languages:
+            continue
+        module = import_module('qddate.patterns.' + module_name)
+        found = names.setdefault(lang, set())
+        for attr, value in vars(module).items():
+            if _NAME_LIST_RE.match(attr) and isinstance(value, (list, tuple)):
+                found.update(name.lower() for name in value if isinstance(name, str) and name)
+    return {lang: frozenset(found) for lang, found in names.items()}
+
+
+def _trie_regex(tokens):
+    """Returns re source matching the longest of tokens at current position.
+
+    Tokens are put into a trie, so each position is dispatched by its characters
+    instead of trying every token in turn.
+    """
+    trie = {}
+    for token in tokens:
+        node = trie
+        for char in token:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def emit(node):
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        # children first, so longer tokens win over the token ending here
+        if '' in node:
+            branches.append('')
+        if len(branches) == 1:
+            return branches[0]
+        return '(?:' + '|'.join(branches) + ')'
+
+    return emit(trie)
+
+
+def _is_word_char(char):
+    return char.isalnum() or char == '_'
+
+
+class LanguageDetector:
+    """Finds month and weekday names of all languages in a single regex pass.
+
+    The regex is a lookahead over a trie of all names, so it reports the longest name starting
+    at every position, overlapping names included. Each name maps to the list of names which
+    are its prefixes (shorter names starting at the same position) with their languages.
+
+    :meth:`detect` returns the same confident language as checking month name sets of each
+    language one by one in fixed order, and ranks all other languages with name hits after it.
+    """
+
+    def __init__(self, names,
+                 confident_groups=(CYRILLIC_LANGUAGES, ACCENTED_LANGUAGES, LATIN_LANGUAGES),
+                 language_order=None):
+        """
+        :param names: dict of language code -> names, lowercase
+        :type names: dict
+        :param confident_groups: groups of (language, month names, whole words only),
+            checked in order
+        :type confident_groups: tuple
+        :param language_order: tie break order of languages in ranking, sorted codes by default
+        :type language_order: list|tuple|None
+        """
+        self.confident_groups = tuple(tuple(lang for lang, _, _ in group)
+                                      for group in confident_groups)
+        if language_order is None:
+            confident = {lang for group in self.confident_groups for lang in group}
+            language_order = sorted(set(names) | confident)
+        self._order = {lang: i for i, lang in enumerate(language_order)}
+
+        # token -> (languages of any name, confident languages,
+        #           confident languages requiring word bounds)
+        info = {}
+        for lang, lang_names in names.items():
+            for name in lang_names:
+                info.setdefault(name, (set(), set(), set()))[0].add(lang)
+        for group in confident_groups:
+            for lang, month_names, whole_words in group:
+                for name in month_names:
+                    info.setdefault(name, (set(), set(), set()))[2 if whole_words else 1].add(lang)
+        self._table = {}
+        for token in info:
+            entries = []
+            for length in range(1, len(token) + 1):
+                prefix_info = info.get(token[:length])
+                if prefix_info is not None:
+                    entries.append((length,) + tuple(frozenset(langs) for langs in prefix_info))
+            self._table[token] = tuple(entries)
+        self._finditer = re.compile('(?=(' + _trie_regex(info) + '))').finditer
+
+    def hits(self, text_lower):
+        """Finds languages of names in lowercase text.
+
+        :param text_lower: lowercase text
+        :type text_lower: str
+        :return: tuple of (set of confident languages,
+            dict of language -> number of whole word name hits)
+        :rtype: tuple
+        """
+        confident = set()
+        counts = {}
+        n = len(text_lower)
+        table = self._table
+        for m in self._finditer(text_lower):
+            start = m.start()
+            starts_word = start == 0 or not _is_word_char(text_lower[start - 1])
+            for length, languages, substring_confident, word_confident in table[m.group(1)]:
+                if substring_confident:
+                    confident |= substring_confident
+                end = start + length
+                if starts_word and (end == n or not _is_word_char(text_lower[end])):
+                    if word_confident:
+                        confident |= word_confident
+                    for lang in languages:
+                        counts[lang] = counts.get(lang, 0) + 1
+        return confident, counts
+
+    def detect(self, text, char_sets):
+        """Detects language of text from month and weekday names and character sets.
+
+        :param text: Input string
+        :type text: str
+        :param char_sets: character sets of the text, see :func:`qddate.qdparser.scan_char_sets`
+        :type char_sets: set|frozenset
+        :return: tuple of (confident languages or None, all languages with name hits ranked).
+            Confident languages are a single language found by month name or ('ru', 'bg') for
+            Cyrillic text without Russian month, ranking starts with them and follows by number
+            of hits
+        :rtype: tuple
+        """
+        if not text:
+            return None, ()
+        confident, counts = self.hits(text.lower())
+        languages = None
+        cyrillic_group, accented_group, latin_group = self.confident_groups
+        if CHAR_SET_CYRILLIC in char_sets:
+            languages = (tuple(lang for lang in cyrillic_group if lang in confident)[:1]
+                         or ('ru', 'bg'))
+        else:
+            if CHAR_SET_ACCENTED in char_sets or CHAR_SET_LATIN in char_sets:
+                languages = next(((lang,) for lang in accented_group if lang in confident), None)
+            if languages is None and CHAR_SET_LATIN in char_sets:
+                languages = next(((lang,) for lang in latin_group if lang in confident), None)
+        order = self._order
+        ranking = sorted((lang for lang in counts if not languages or lang not in languages),
+                         key=lambda lang: (-counts[lang], order.get(lang, len(order))))
+        return languages, (languages or ()) + tuple(ranking)
+
+
+# Shared detectors by frozenset of language codes, None for all languages
+_DETECTORS = {}
+
+
+def get_detector(languages=None):
+    """Returns shared :class:`LanguageDetector` over names of pattern modules, built on first call.
+
+    :param languages: language codes which names are counted in ranking, all languages by default.
+        Confident languages are detected by month names of all languages anyway
+    :type languages: list|tuple|set|None
+    :rtype: LanguageDetector
+    """
+    key = frozenset(languages) if languages is not None else None
+    detector = _DETECTORS.get(key)
+    if detector is None:
+        detector = _DETECTORS[key] = LanguageDetector(collect_pattern_names(key))
+    return detector
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Retained memory estimation of DateParser structures
+__author__ = "Ivan Begtin (ivan@begtin.tech)"
+__license__ = "BSD"
+
+import gc
+import sys
+import types
+
+# Objects owned by the interpreter or by modules, not by the structure referencing them
+_SKIPPED_TYPES = (type, types.ModuleType, types.CodeType, types.FrameType)
+
+
+def _referents(obj):
+    if isinstance(obj, types.FunctionType):
+        # closures of parse actions are retained by grammars, globals and code belong to modules
+        refs = [cell for cell in obj.__closure__ or ()]
+        if obj.__defaults__:
+            refs.append(obj.__defaults__)
+        if obj.__dict__:
+            refs.append(obj.__dict__)
+        return refs
+    return gc.get_referents(obj)
+
+
+def deep_sizeof(obj, seen=None):
+    """Returns size in bytes of object and all objects reachable from it.
+
+    Walks gc.get_referents() of containers and instances. Classes, modules and code objects
+    are not counted, functions are counted with their closures but without module globals.
+
+    :param obj: object to measure
+    :param seen: ids of objects already counted, updated by the walk. Pass the same set to
+        several calls to count objects shared between them only once, objects measured with
+        the same set should stay alive until the last call, or their ids may be reused
+    :type seen: set|None
+    :return: size in bytes
+    :rtype: int
+    """
+    if seen is None:
+        seen = set()
+    size = 0
+    stack = [obj]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, _SKIPPED_TYPES):
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        stack.extend(_referents(obj))
+    return size
+
+
+def packrat_cache_contents(cache):
+    """Returns objects held by pyparsing packrat cache.
+
+    pyparsing keeps cached results in closures of the cache methods, so they are collected
+    from these closures.
+
+    :param cache: pyparsing.ParserElement.packrat_cache
+    :rtype: list
+    """
+    contents = []
+    for name in ("get", "set", "clear"):
+        method = getattr(cache, name, None)
+        func = getattr(method, "__func__", None)
+        for cell in getattr(func, "__closure__", None) or ():
+            try:
+                contents.append(cell.cell_contents)
+            except ValueError:
+                # empty cell
+                pass
+    return contents
@@ -3,23 +3,10 @@ __version__ = "0.1.1"
 __author__ = "Ivan Begtin (ivan@begtin.tech)"
 __license__ = "BSD"
 
+from collections.abc import Mapping
+from importlib import import_module
+
 from .base import PATTERNS_EN, BASE_TIME_PATTERNS, INTEGER_LIKE_PATTERNS
-from .bg import PATTERNS_BG
-from .cz import PATTERNS_CZ
-from .de import PATTERNS_DE
-from .es import PATTERNS_ES
-from .fr import PATTERNS_FR
-from .it import PATTERNS_IT
-from .nl import PATTERNS_NL
-from .pl import PATTERNS_PL
-from .pt import PATTERNS_PT
-from .ru import PATTERNS_RU
-from .tr import PATTERNS_TR
-
-ALL_PATTERNS = (PATTERNS_EN + INTEGER_LIKE_PATTERNS + PATTERNS_BG +
-                PATTERNS_CZ + PATTERNS_DE + PATTERNS_ES + PATTERNS_FR +
-                PATTERNS_IT + PATTERNS_NL + PATTERNS_PL + PATTERNS_PT +
-                PATTERNS_RU + PATTERNS_TR)
 
 SUPPORTED_LANGUAGES = [
     "bg",
@@ -36,22 +23,73 @@ SUPPORTED_LANGUAGES = [
     "tr",
 ]
 
-# Mapping of language codes to their pattern lists
-PATTERNS_BY_LANGUAGE = {
-    "en": PATTERNS_EN + INTEGER_LIKE_PATTERNS,
-    "bg": PATTERNS_BG,
-    "cz": PATTERNS_CZ,
-    "de": PATTERNS_DE,
-    "es": PATTERNS_ES,
-    "fr": PATTERNS_FR,
-    "it": PATTERNS_IT,
-    "nl": PATTERNS_NL,
-    "pl": PATTERNS_PL,
-    "pt": PATTERNS_PT,
-    "ru": PATTERNS_RU,
-    "tr": PATTERNS_TR,
+# Modules and pattern list names of languages other than English, imported on first use
+LANGUAGE_MODULES = {
+    "bg": ("bg", "PATTERNS_BG"),
+    "cz": ("cz", "PATTERNS_CZ"),
+    "de": ("de", "PATTERNS_DE"),
+    "es": ("es", "PATTERNS_ES"),
+    "fr": ("fr", "PATTERNS_FR"),
+    "it": ("it", "PATTERNS_IT"),
+    "nl": ("nl", "PATTERNS_NL"),
+    "pl": ("pl", "PATTERNS_PL"),
+    "pt": ("pt", "PATTERNS_PT"),
+    "ru": ("ru", "PATTERNS_RU"),
+    "tr": ("tr", "PATTERNS_TR"),
 }
 
+# Order of languages in ALL_PATTERNS
+ALL_PATTERNS_LANGUAGES = ["en", "bg", "cz", "de", "es", "fr", "it", "nl", "pl", "pt", "ru", "tr"]
+
+
+class LazyPatternsByLanguage(Mapping):
+    """Mapping of language codes to their pattern lists.
+
+    Language module is imported and its grammars are built on first access to its patterns.
+    """
+
+    def __init__(self):
+        self._patterns = {"en": PATTERNS_EN + INTEGER_LIKE_PATTERNS}
+
+    def __getitem__(self, lang):
+        patterns = self._patterns.get(lang)
+        if patterns is None:
+            if lang not in LANGUAGE_MODULES:
+                raise KeyError(lang)
+            module_name, list_name = LANGUAGE_MODULES[lang]
+            module = import_module("." + module_name, __name__)
+            patterns = self._patterns[lang] = getattr(module, list_name)
+        return patterns
+
+    def __iter__(self):
+        return iter(ALL_PATTERNS_LANGUAGES)
+
+    def __len__(self):
+        return len(ALL_PATTERNS_LANGUAGES)
+
+    def is_loaded(self, lang):
+        """Returns True if patterns of language are already loaded"""
+        return lang in self._patterns
+
+
+# Mapping of language codes to their pattern lists
+PATTERNS_BY_LANGUAGE = LazyPatternsByLanguage()
+
+_PATTERNS_LIST_LANGUAGES = {list_name: lang for lang, (_, list_name) in LANGUAGE_MODULES.items()}
+
+
+def __getattr__(name):
+    """Loads ALL_PATTERNS and PATTERNS_* lists of languages on first access"""
+    if name == "ALL_PATTERNS":
+        patterns = []
+        for lang in ALL_PATTERNS_LANGUAGES:
+            patterns.extend(PATTERNS_BY_LANGUAGE[lang])
+        globals()[name] = patterns
+        return patterns
+    if name in _PATTERNS_LIST_LANGUAGES:
+        return PATTERNS_BY_LANGUAGE[_PATTERNS_LIST_LANGUAGES[name]]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 def get_patterns_for_languages(languages):
     """Get patterns for specified languages.
@@ -64,7 +102,7 @@ def get_patterns_for_languages(languages):
     :raises ValueError: If any language code is not in SUPPORTED_LANGUAGES
     """
     if languages is None:
-        return ALL_PATTERNS
+        return __getattr__("ALL_PATTERNS")
     
     # Normalize to list
     if isinstance(languages, str):
@@ -73,7 +111,7 @@ def get_patterns_for_languages(languages):
         raise TypeError("languages must be a string, list of strings, or None")
     
     if len(languages) == 0:
-        return ALL_PATTERNS
+        return __getattr__("ALL_PATTERNS")
     
     # Validate all language codes
     invalid_languages = [lang for lang in languages if lang not in SUPPORTED_LANGUAGES]
@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Persistent result cache and session of DateParser
+__author__ = "Ivan Begtin (ivan@begtin.tech)"
+__license__ = "BSD"
+
+import hashlib
+import json
+import os
+import sqlite3
+
+import pyparsing
+
+# Version of cache entries layout, bumped when keys or values of saved caches change
+CACHE_FORMAT = 2
+
+# Seconds to wait for another process writing the same cache file
+_TIMEOUT = 30
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS qddate_cache (
+    version TEXT NOT NULL,
+    pattern_hash TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    entry TEXT NOT NULL,
+    PRIMARY KEY (version, pattern_hash, kind, position)
+)
+"""
+
+
+def pattern_set_hash(pattern_keys, **options):
+    """Returns digest identifying parser patterns and options results depend on.
+
+    :param pattern_keys: keys of patterns in the order they are tried
+    :type pattern_keys: list|tuple
+    :param options: DateParser arguments changing results, like engine or split_time
+    :return: hex digest of cache format, pyparsing version, options and pattern keys
+    :rtype: str
+    """
+    digest = hashlib.sha256()
+    header = (CACHE_FORMAT, pyparsing.__version__, sorted(options.items()))
+    digest.update(repr(header).encode("utf-8"))
+    digest.update("\n".join(pattern_keys).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def load_caches(path, version, pattern_hash):
+    """Loads cache entries saved for qddate version and pattern set.
+
+    Entries of other versions and pattern sets are ignored.
+
+    :param path: SQLite cache file
+    :type path: str
+    :param version: qddate version
+    :type version: str
+    :param pattern_hash: pattern set digest, see :func:`pattern_set_hash`
+    :type pattern_hash: str
+    :return: dict of cache kind -> list of (key, value) in saved order, empty if file is missing
+        or can't be read. Entries are decoded from JSON, so tuples come back as lists
+    :rtype: dict
+    """
+    caches = {}
+    if not os.path.exists(path):
+        # connecting would create an empty file
+        return caches
+    try:
+        conn = sqlite3.connect(path, timeout=_TIMEOUT)
+    except sqlite3.Error:
+        return caches
+    try:
+        rows = conn.execute(
+            "SELECT kind, entry FROM qddate_cache WHERE version = ? AND pattern_hash = ? "
+            "ORDER BY kind, position",
+            (version, pattern_hash)).fetchall()
+        for kind, entry in rows:
+            key, value = json.loads(entry)
+            caches.setdefault(kind, []).append((key, value))
+    except (sqlite3.Error, ValueError, TypeError):
+        # missing table, not a database or broken entries
+        return {}
+    finally:
+        conn.close()
+    return caches
+
+
+def save_caches(path, version, pattern_hash, caches):
+    """Saves cache entries for qddate version and pattern set, replacing entries saved for them.
+
+    Entries of other versions and pattern sets stay in the file.
+
+    :param path: SQLite cache file, created if missing
+    :type path: str
+    :param version: qddate version
+    :type version: str
+    :param pattern_hash: pattern set digest, see :func:`pattern_set_hash`
+    :type pattern_hash: str
+    :param caches: dict of cache kind -> list of (key, value), keys and values of JSON types
+    :type caches: dict
+    :return: number of saved entries
+    :rtype: int
+    """
+    rows = [(version, pattern_hash, kind, position, json.dumps(entry, ensure_ascii=False))
+            for kind, entries in caches.items() for position, entry in enumerate(entries)]
+    conn = sqlite3.connect(path, timeout=_TIMEOUT)
+    try:
+        with conn:
+            conn.execute(_SCHEMA)
+            conn.execute("DELETE FROM qddate_cache WHERE version = ? AND pattern_hash = ?",
+                         (version, pattern_hash))
+            conn.executemany("INSERT INTO qddate_cache VALUES (?, ?, ?, ?, ?)", rows)
+    finally:
+        conn.close()
+    return len(rows)
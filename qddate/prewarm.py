@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Warming DateParser state in a master process before forking workers
+__author__ = "Ivan Begtin (ivan@begtin.tech)"
+__license__ = "BSD"
+
+import gc
+import itertools
+
+from pyparsing import ParserElement, Regex
+
+from .qdparser import (DateParser, ENGINE_RE, PRIORITY_SEPARATORS, CHAR_SET_DIGITS, CHAR_SET_LATIN,
+                       CHAR_SET_CYRILLIC, CHAR_SET_ACCENTED, CHAR_SET_SEPARATORS)
+
+# Texts matched by every warmed parser, they fill lazily built filter masks for common text features
+WARMUP_TEXTS = (
+    "01.12.2009", "1.2.09", "2013-01-12", "20130112", "12/31/2009", "2009/12/31",
+    "6 Jan 2009", "January 6, 2009", "Thursday, Jun 25, 2026 - 09:08", "Jun 25, 2026",
+    "2009-12-01T10:20:30", "01.12.2009 10:20", "12 января 2010", "12 января 2010 г. 10:20",
+    "3 mars 2019", "3. März 2019", "3 de marzo de 2019", "3 marzo 2019", "3 maart 2019",
+    "Updated 12.03.2019", "not a date", "$19.99",
+)
+
+_CHAR_SETS = (CHAR_SET_DIGITS, CHAR_SET_LATIN, CHAR_SET_CYRILLIC, CHAR_SET_ACCENTED,
+              CHAR_SET_SEPARATORS)
+
+
+def _warm_expressions(exprs):
+    """Streamlines pyparsing expressions and compiles their Regex elements.
+
+    pyparsing does both on first parse, doing it before fork keeps these objects unchanged in
+    workers.
+    """
+    seen = set()
+    stack = [expr for expr in exprs if expr is not None]
+    while stack:
+        expr = stack.pop()
+        if id(expr) in seen:
+            continue
+        seen.add(id(expr))
+        if not expr.streamlined:
+            expr.streamline()
+        if isinstance(expr, Regex):
+            expr.re  # noqa: B018, compiled on first access
+        stack.extend(expr.recurse())
+
+
+def warm_parser(parser, texts=WARMUP_TEXTS):
+    """Builds everything DateParser builds lazily on first use.
+
+    Streamlines pattern grammars, compiles native re expressions with the "re" engine, builds
+    priority buckets for every text length and character set masks for every combination of
+    character sets, and matches texts to fill the other filter masks. Texts are matched past
+    the result, negative, shape, filter and shared caches, so they leave no entries or counters
+    there. Built state is shared with parsers of the same configuration.
+
+    :param parser: parser to warm
+    :type parser: DateParser
+    :param texts: texts to match
+    :type texts: iterable of str
+    :return: parser
+    :rtype: DateParser
+    """
+    candidates = parser._candidates
+    _warm_expressions([p.pattern for p in candidates] + [p.time_pattern for p in candidates])
+    if parser.engine == ENGINE_RE:
+        for p in candidates:
+            parser._get_regex_pattern(p.pattern)
+            if p.time_pattern is not None:
+                parser._get_regex_pattern(p.time_pattern)
+    for separator in PRIORITY_SEPARATORS:
+        for n in parser._length_masks:
+            parser._priority_buckets(separator, n)
+    for size in range(len(_CHAR_SETS) + 1):
+        for char_sets in itertools.combinations(_CHAR_SETS, size):
+            parser._charset_mask(frozenset(char_sets))
+    parser._get_cached_year()
+    for text in texts:
+        parser._match(text, use_caches=False)
+    # warmup results should not be kept in the packrat cache
+    ParserElement.reset_cache()
+    return parser
+
+
+def prewarm(configs=None, texts=WARMUP_TEXTS, freeze=False):
+    """Builds and warms parsers of given configurations in a master process before forking workers.
+
+    Forked workers get generated patterns, indexes, grammars and filter masks from the master
+    instead of rebuilding them, and since warmed objects are not changed on first use, their memory
+    pages stay shared copy-on-write. Parsers created in workers with the same configuration share
+    this state too.
+
+    :param configs: DateParser keyword arguments for each parser, default parser if None
+    :type configs: list of dict|None
+    :param texts: texts matched by each parser to fill lazily built filter masks
+    :type texts: iterable of str
+    :param freeze: If True, collect garbage and move all objects to permanent generation with
+        gc.freeze(), so garbage collection in workers doesn't write to their pages
+    :type freeze: bool
+    :return: warmed parsers in order of configs
+    :rtype: list of DateParser
+    """
+    if configs is None:
+        configs = [{}]
+    texts = tuple(texts)
+    parsers = []
+    for config in configs:
+        if not isinstance(config, dict):
+            raise ValueError(
+                f"Parser config should be a dict of DateParser arguments, got {config!r}")
+        parsers.append(warm_parser(DateParser(**config), texts))
+    if freeze:
+        gc.collect()
+        gc.freeze()
+    return parsers
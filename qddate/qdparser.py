@@ -4,11 +4,13 @@ __author__ = "Ivan Begtin (ivan@begtin.tech)"
 __license__ = "BSD"
 
 import datetime
+import itertools
 import os
 import time
 import re
 
-from pyparsing import Optional, lineStart, oneOf, Literal, restOfLine, Word, nums, Regex
+from pyparsing import (Optional, lineStart, oneOf, Literal, restOfLine, ParseBaseException,
+                       ParserElement)
 
 try:
    import dill
@@ -23,51 +25,19 @@ try:
 except:
     pass
 
-from .dirty import matchPrefix
-from .patterns import ALL_PATTERNS, BASE_TIME_PATTERNS, get_patterns_for_languages, SUPPORTED_LANGUAGES
-
-# Pre-compiled month name sets for language detection (lowercase for fast matching)
-_RUSSIAN_MONTHS = frozenset(['января', 'февраля', 'марта', 'апреля', 'мая', 'июня',
-                             'июля', 'августа', 'сентября', 'октября', 'ноября', 'декабря',
-                             'январь', 'февраль', 'март', 'апрель', 'июнь', 'июль',
-                             'август', 'сентябрь', 'октябрь', 'ноябрь', 'декабрь'])
-_FRENCH_MONTHS = frozenset(['janvier', 'février', 'mars', 'avril', 'mai', 'juin',
-                            'juillet', 'août', 'septembre', 'octobre', 'novembre', 'décembre'])
-_SPANISH_MONTHS = frozenset(['enero', 'febrero', 'marzo', 'abril', 'mayo', 'junio',
-                            'julio', 'agosto', 'septiembre', 'octubre', 'noviembre', 'diciembre'])
-_ITALIAN_MONTHS = frozenset(['gennaio', 'febbraio', 'marzo', 'aprile', 'maggio', 'giugno',
-                            'luglio', 'agosto', 'settembre', 'ottobre', 'novembre', 'dicembre'])
-_PORTUGUESE_MONTHS = frozenset(['janeiro', 'fevereiro', 'março', 'abril', 'maio', 'junho',
-                               'julho', 'agosto', 'setembro', 'outubro', 'novembro', 'dezembro'])
-_CZECH_MONTHS = frozenset(['leden', 'únor', 'březen', 'duben', 'květen', 'červen',
-                           'červenec', 'srpen', 'září', 'říjen', 'listopad', 'prosinec'])
-_POLISH_MONTHS = frozenset(['styczeń', 'stycznia', 'luty', 'lutego', 'marzec', 'marca', 
-                            'kwiecień', 'kwietnia', 'maj', 'maja', 'czerwiec', 'czerwca',
-                            'lipiec', 'lipca', 'sierpień', 'sierpnia', 'wrzesień', 'września',
-                            'październik', 'października', 'listopad', 'listopada', 
-                            'grudzień', 'grudnia'])
-_ENGLISH_MONTHS = frozenset(['january', 'february', 'march', 'april', 'may', 'june',
-                            'july', 'august', 'september', 'october', 'november', 'december',
-                            'jan', 'feb', 'mar', 'apr', 'may', 'jun',
-                            'jul', 'aug', 'sep', 'oct', 'nov', 'dec'])
-_GERMAN_MONTHS = frozenset(['januar', 'februar', 'märz', 'april', 'mai', 'juni',
-                           'juli', 'august', 'september', 'oktober', 'november', 'dezember'])
-_DUTCH_MONTHS = frozenset(['januari', 'februari', 'maart', 'april', 'mei', 'juni',
-                          'juli', 'augustus', 'september', 'oktober', 'november', 'december'])
-_TURKISH_MONTHS = frozenset(['ocak', 'şubat', 'mart', 'nisan', 'mayıs', 'haziran',
-                            'temmuz', 'ağustos', 'eylül', 'ekim', 'kasım', 'aralık'])
-
-# Pre-compiled pyparsing patterns for language detection (compiled once at module level)
-# Use Regex within pyparsing for word boundary matching (pyparsing's oneOf doesn't support word boundaries)
-# Create regex patterns that match any English/German month with word boundaries
-_ENGLISH_MONTH_PATTERN = Regex(r'\b(' + '|'.join(re.escape(m) for m in _ENGLISH_MONTHS) + r')\b')
-_GERMAN_MONTH_PATTERN = Regex(r'\b(' + '|'.join(re.escape(m) for m in _GERMAN_MONTHS) + r')\b')
-
-# Pre-compiled pyparsing patterns for year format detection (compiled once at module level)
-# 4-digit year: 4 consecutive digits (Word naturally handles word boundaries)
-_YEAR_4DIGIT_PATTERN = Word(nums, exact=4)
-# 2-digit year: separator + 2 digits + boundary (use Regex for complex pattern within pyparsing)
-_YEAR_2DIGIT_PATTERN = Regex(r'[/.\-,\s]\d{2}(?=\s|$|[^\d])')
+from .cache import ShapeCache, ResultCache, BloomFilter, FilterCache, MISSING
+from .re_engine import compile_expression, to_parse_results, UnsupportedExpression
+from .dirty import matchPrefix, prefix_basekeys
+from .index_tables import PATTERN_PROPERTIES
+from .langdetect import get_detector
+from .casefold import merge_case_variants
+from .snapshot import snapshot_key, load_snapshot, save_snapshot
+from .spec import to_specs
+from .memory import deep_sizeof, packrat_cache_contents
+from .persist import pattern_set_hash, load_caches, save_caches
+from .shmcache import SharedParseCache
+from .patterns import (BASE_TIME_PATTERNS, PATTERNS_BY_LANGUAGE, get_patterns_for_languages,
+                       SUPPORTED_LANGUAGES)
 
 # Character set constants for pattern filtering
 CHAR_SET_DIGITS = 'digits'
@@ -76,6 +46,24 @@ CHAR_SET_CYRILLIC = 'cyrillic'
 CHAR_SET_ACCENTED = 'accented'
 CHAR_SET_SEPARATORS = 'separators'
 
+# Match engines: how each candidate pattern is run against the text
+ENGINE_SCAN = 'scan'          # pyparsing scanString, match accepted only if it starts at position 0
+ENGINE_ANCHORED = 'anchored'  # pyparsing parse attempt only at text start, after whitespace
+ENGINE_RE = 're'              # same as anchored, but each pattern is compiled into one native re
+ENGINES = (ENGINE_SCAN, ENGINE_ANCHORED, ENGINE_RE)
+
+# Time suffixes tried after the date: (key suffix, pattern, time format, min length add,
+# max length add). Either appended to each date pattern as ":time_*" variants or matched
+# after the date with split_time
+TIME_SUFFIXES = (
+    (":time_1", Optional(Literal(",")).suppress() + BASE_TIME_PATTERNS["pat:time:minutes"],
+     "%H:%M", 5, 8),
+    (":time_2", Optional(oneOf([",", "|", "T"])).suppress() + BASE_TIME_PATTERNS["pat:time:full"],
+     "%H:%M:%S", 9, 9),
+    (":time_3", Optional(Literal("[")).suppress() + BASE_TIME_PATTERNS["pat:time:minutes"] +
+     Optional(Literal("]")).suppress(), "%H:%M", 7, 10),
+)
+
 # Language to character set mapping
 LANGUAGE_CHAR_SETS = {
     'ru': {CHAR_SET_DIGITS, CHAR_SET_CYRILLIC},
@@ -93,81 +81,535 @@ LANGUAGE_CHAR_SETS = {
 }
 
 
+# Character class codes written by _CHAR_CLASS_TABLE. Separator characters './-, ' map to themselves
+_CLASS_DIGIT = 'd'
+_CLASS_CYRILLIC = 'c'
+_CLASS_LATIN = 'l'
+_CLASS_ACCENTED = 'a'
+_CLASS_ALPHA = 'x'   # other letters, count only as text
+_CLASS_OTHER = '_'
+
+# Accented characters for various languages
+# French: éàèùâêîôûçÉÀÈÙÂÊÎÔÛÇ
+# Spanish: áíóúñÁÍÓÚÑ
+# German: äöüÄÖÜ
+# Czech/Polish: řžýčšďťňŘŽÝČŠĎŤŇ
+_ACCENTED_CHARS = 'éàèùâêîôûçÉÀÈÙÂÊÎÔÛÇáíóúñÁÍÓÚÑäöüÄÖÜřžýčšďťňŘŽÝČŠĎŤŇ'
+
+_CLASS_CHAR_SETS = {
+    _CLASS_DIGIT: CHAR_SET_DIGITS,
+    _CLASS_CYRILLIC: CHAR_SET_CYRILLIC,
+    _CLASS_LATIN: CHAR_SET_LATIN,
+    _CLASS_ACCENTED: CHAR_SET_ACCENTED,
+}
+_CLASS_CHAR_SETS.update((c, CHAR_SET_SEPARATORS) for c in './-, ')
+_TEXT_CLASSES = frozenset([_CLASS_CYRILLIC, _CLASS_LATIN, _CLASS_ACCENTED, _CLASS_ALPHA])
+_SEPARATOR_KINDS = {'/': 'slash', '.': 'dot', '-': 'dash', ' ': 'space'}
+
+
+# Maximum number of entries of _CHAR_CLASS_TABLE, including precomputed ones
+_CHAR_CLASS_TABLE_SIZE = 4096
+
+
+class _CharClassTable(dict):
+    """str.translate table mapping each character to its class code.
+
+    Classes follow the order of checks scan_char_sets always used. ASCII, Latin, Cyrillic and
+    accented characters are classified upfront, so translating text of supported languages is
+    a single C-level pass. Other characters (CJK, emoji) are classified on first sight and
+    remembered only while the table has less than _CHAR_CLASS_TABLE_SIZE entries.
+    """
+
+    def __init__(self):
+        super().__init__()
+        for code in itertools.chain(range(0x250), range(0x400, 0x500), map(ord, _ACCENTED_CHARS)):
+            self[code] = self._classify(code)
+
+    def __missing__(self, code):
+        cls = self._classify(code)
+        if len(self) < _CHAR_CLASS_TABLE_SIZE:
+            self[code] = cls
+        return cls
+
+    @staticmethod
+    def _classify(code):
+        char = chr(code)
+        if char.isdigit():
+            cls = _CLASS_DIGIT
+        elif 'а' <= char.lower() <= 'я' or char in 'ёЁ':
+            cls = _CLASS_CYRILLIC
+        elif char.isalpha() and code < 128:
+            cls = _CLASS_LATIN
+        elif char in _ACCENTED_CHARS:
+            cls = _CLASS_ACCENTED
+        elif char in './-, ':
+            cls = char
+        elif char.isalpha():
+            cls = _CLASS_ALPHA
+        else:
+            cls = _CLASS_OTHER
+        return cls
+
+
+_CHAR_CLASS_TABLE = _CharClassTable()
+
+# Year format detection. 4-digit year: 4 consecutive digits anywhere.
+# 2-digit year: separator + 2 digits not followed by a digit. Separator can't be a space, tab or
+# newline since scanning for a date always skips them before a match attempt.
+_YEAR_4DIGIT_RE = re.compile(r'[0-9]{4}')
+_YEAR_2DIGIT_RE = re.compile(r'(?:[/.\-,]|(?![ \t\n\r])\s)\d{2}(?!\d)')
+
+
 def scan_char_sets(text):
     """Single-pass scanner returning set of character categories present in text.
     
-    Optimized version: limits scanning to first 100 characters and uses early exit.
+    Optimized version: limits scanning to first 100 characters.
     
     :param text: Input string to scan
     :type text: str
     :return: Set of character set constants present in the text
     :rtype: set
     """
-    if not text:
-        return set()
-    
-    char_sets = set()
-    # Accented characters for various languages
-    # French: éàèùâêîôûçÉÀÈÙÂÊÎÔÛÇ
-    # Spanish: áíóúñÁÍÓÚÑ
-    # German: äöüÄÖÜ
-    # Czech/Polish: řžýčšďťňŘŽÝČŠĎŤŇ
-    accented_chars = 'éàèùâêîôûçÉÀÈÙÂÊÎÔÛÇáíóúñÁÍÓÚÑäöüÄÖÜřžýčšďťňŘŽÝČŠĎŤŇ'
-    
-    # Limit scanning to first 100 characters (dates are rarely longer)
-    scan_len = min(100, len(text))
-    
-    # Scan for character sets with early exit optimization
-    for i in range(scan_len):
-        char = text[i]
-        if char.isdigit():
-            char_sets.add(CHAR_SET_DIGITS)
-        elif 'а' <= char.lower() <= 'я' or char in 'ёЁ':
-            char_sets.add(CHAR_SET_CYRILLIC)
-        elif char.isalpha() and ord(char) < 128:
-            char_sets.add(CHAR_SET_LATIN)
-        elif char in accented_chars:
-            char_sets.add(CHAR_SET_ACCENTED)
-        elif char in './-, ':
-            char_sets.add(CHAR_SET_SEPARATORS)
-        
-        # Early exit optimization: once we've found all possible sets, we can stop
-        # Maximum possible sets: digits, cyrillic, latin, accented, separators (5)
-        if len(char_sets) >= 5:
-            break
-    
-    return char_sets
+    classes = set(text[:100].translate(_CHAR_CLASS_TABLE))
+    return {_CLASS_CHAR_SETS[c] for c in classes if c in _CLASS_CHAR_SETS}
+
+
+# Translation table for shape signatures: ASCII digits -> 9, ASCII letters -> a,
+# Cyrillic letters (same range as in scan_char_sets) -> я. Everything else is kept as is,
+# so texts with the same shape always pass the same pattern filters.
+_SHAPE_TABLE = {ord(c): '9' for c in '0123456789'}
+_SHAPE_TABLE.update((ord(c), 'a') for c in 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ')
+_SHAPE_TABLE.update((code, 'я') for code in range(ord('А'), ord('я') + 1))
+_SHAPE_TABLE.update((ord(c), 'я') for c in 'ёЁ')
+
+
+def shape_signature(text):
+    """Reduce text to its shape, e.g. "01.12.2009" -> "99.99.9999", "6 Jan 2009" -> "9 aaa 9999".
+
+    :param text: Input string
+    :type text: str
+    :return: Shape signature of the text
+    :rtype: str
+    """
+    return text.translate(_SHAPE_TABLE)
+
+
+class TextProfile:
+    """Features of input text used by DateParser pattern filters, computed once per text.
+
+    Character classes of the text start come from a single str.translate pass and are shared by
+    the character set, separator and text detection. Language, found by a single pass of
+    :class:`qddate.langdetect.LanguageDetector`, and prefix basekeys are computed on first use
+    since not every filter configuration needs them. Build it once and pass to
+    :meth:`DateParser.match` or :meth:`DateParser.parse` to reuse it for several calls.
+    """
+
+    __slots__ = ('text', 'length', 'char_sets', 'separators', 'has_text', 'year_format',
+                 '_detector', '_languages', '_language_ranking', '_prefix_basekeys')
+
+    def __init__(self, text, detector=None):
+        """
+        :param text: Input string
+        :type text: str
+        :param detector: Language detector, shared detector over all languages by default
+        :type detector: :class:`qddate.langdetect.LanguageDetector`
+        """
+        self.text = text
+        self._detector = detector
+        n = self.length = len(text)
+        classes = text[:100].translate(_CHAR_CLASS_TABLE)
+        seen = set(classes)
+        self.char_sets = frozenset(_CLASS_CHAR_SETS[c] for c in seen if c in _CLASS_CHAR_SETS)
+
+        # Separators are looked for in the first 20 characters
+        separators = {_SEPARATOR_KINDS[c] for c in set(classes[:20]) if c in _SEPARATOR_KINDS}
+        if not separators and n:
+            # Compact format like yyyymmdd or ddmmyyyy, default to mixed if we can't determine
+            if classes[:8] == _CLASS_DIGIT * 8:
+                separators.add('none')
+            else:
+                separators.add('mixed')
+        self.separators = frozenset(separators)
+
+        self.has_text = not _TEXT_CLASSES.isdisjoint(seen) or (
+            n > 100 and any(c.isalpha() for c in text[100:]))
+
+        if _YEAR_4DIGIT_RE.search(text) is not None:
+            self.year_format = '4digit'
+        elif _YEAR_2DIGIT_RE.search(text) is not None:
+            self.year_format = '2digit'
+        else:
+            self.year_format = 'unknown'
+        self._languages = False
+        self._language_ranking = None
+        self._prefix_basekeys = None
+
+    def _detect_languages(self):
+        detector = self._detector or get_detector()
+        self._languages, self._language_ranking = detector.detect(self.text, self.char_sets)
+
+    @property
+    def languages(self):
+        """Tuple of possible language codes detected by month names and character sets or None"""
+        if self._languages is False:
+            self._detect_languages()
+        return self._languages
+
+    @property
+    def language_ranking(self):
+        """Tuple of all languages with month or weekday names in text, most likely first"""
+        if self._languages is False:
+            self._detect_languages()
+        return self._language_ranking
+
+    @property
+    def prefix_basekeys(self):
+        """Frozenset of pattern basekeys matching text prefix (:func:`qddate.dirty.matchPrefix`)"""
+        if self._prefix_basekeys is None:
+            self._prefix_basekeys = prefix_basekeys(self.text[:6])
+        return self._prefix_basekeys
+
+
+# Separator kinds returned by priority_separator()
+PRIORITY_SEPARATORS = ('/', '.', '-', ' ', '')
+
+
+def priority_separator(text):
+    """Returns separator kind used by pattern priority: first of '/', '.', '-', ' ' in text or ''.
+
+    :param text: Input string
+    :type text: str
+    :rtype: str
+    """
+    if '/' in text:
+        return '/'
+    if '.' in text:
+        return '.'
+    if '-' in text:
+        return '-'
+    if ' ' in text:
+        return ' '
+    return ''
+
+
+def _ids_mask(ids, size):
+    """Returns int bitmask with bits of given ids set"""
+    bits = bytearray((size + 7) // 8)
+    for i in ids:
+        bits[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(bits, 'little')
+
+
+def anchored_parse(expr, text, loc=0):
+    """Matches pyparsing expression only at the start of text (or at loc).
+
+    Same single attempt as the first step of ``scanString``, but without scanning the rest
+    of the text if it fails, so a failing pattern stops at the first character that can't match.
+    Leading whitespace is skipped as pyparsing does.
+
+    :param expr: pyparsing expression
+    :param text: Input string
+    :type text: str
+    :param loc: position in text to match at
+    :type loc: int
+    :return: tuple of (tokens, start, end) or None
+    :rtype: tuple|None
+    """
+    if not expr.streamlined:
+        expr.streamline()
+    if not expr.keepTabs and '\t' in text:
+        text = text.expandtabs()
+    try:
+        start = expr.preParse(text, loc)
+        end, tokens = expr._parse(text, start, callPreParse=False)
+    except ParseBaseException:
+        return None
+    return tokens, start, end
+
+
+def _unexpanded_offset(text, pos):
+    """Maps position in text.expandtabs() back to position in text.
+
+    pyparsing expands tabs before matching, so match positions of text with tabs refer to
+    the expanded text. Position inside an expanded tab is mapped to the character after it.
+    """
+    expanded = 0
+    column = 0
+    for i, char in enumerate(text):
+        if expanded >= pos:
+            return i
+        if char == '\t':
+            width = 8 - column % 8
+            expanded += width
+            column += width
+        else:
+            expanded += 1
+            column = 0 if char in '\r\n' else column + 1
+    return len(text)
+
+
+# Generated patterns and indexes of built-in pattern configurations, shared by all DateParser
+# instances of the same configuration. Shared values are never changed after they are built,
+# lazily built filter masks only get new entries
+_SHARED_STATES = {}
+
+
+def _builtin_pattern_refs(patterns):
+    """Returns patterns with pattern dicts of qddate.patterns replaced by (language, position)
+    references"""
+    positions = {}
+    for lang in PATTERNS_BY_LANGUAGE:
+        if PATTERNS_BY_LANGUAGE.is_loaded(lang):
+            for i, p in enumerate(PATTERNS_BY_LANGUAGE[lang]):
+                positions[id(p)] = (lang, i)
+    return [positions.get(id(p), p) for p in patterns]
+
+
+def _unpickle_parser(config, session_keys):
+    """Rebuilds pickled DateParser from its constructor arguments (:meth:`DateParser.__reduce__`)"""
+    if config["patterns"] is not None:
+        patterns = [PATTERNS_BY_LANGUAGE[p[0]][p[1]] if isinstance(p, tuple) else p
+                    for p in config["patterns"]]
+        config = {**config, "patterns": patterns}
+    parser = DateParser(**config)
+    if session_keys is not None:
+        parser.startSession(session_keys)
+    return parser
+
+
+def _from_isoformat(value):
+    """Returns datetime of ISO string saved by :meth:`DateParser.save_caches` or None"""
+    return datetime.datetime.fromisoformat(value) if value is not None else None
 
 
 class DateParser:
     """Class to use pyparsing-based patterns to parse dates"""
 
-    def __init__(self, generate=True, patterns=ALL_PATTERNS, base_only=False, languages=None):
+    # Generated patterns and indexes saved to snapshot, other filter masks are built lazily
+    _SNAPSHOT_ATTRS = (
+        "patterns", "_patterns_by_separator", "_patterns_by_year_format", "_patterns_by_language",
+        "_basekey_masks", "_charset_groups",
+        "_fixed_mask", "_length_masks", "_language_masks", "_year_format_masks", "_candidates",
+        "_variant_masks", "_min_length_masks", "_max_length_masks", "_static_priority_masks",
+    )
+    # Filter masks and compiled expressions built on first use of a text feature or pattern
+    _LAZY_ATTRS = (
+        "_charset_masks", "_separator_basekeys", "_separator_masks", "_prefix_masks",
+        "_priority_bucket_cache", "_regex_patterns",
+    )
+    # State shared by parsers of the same built-in pattern configuration
+    _SHARED_ATTRS = _SNAPSHOT_ATTRS + _LAZY_ATTRS + ("_case_keys", "_detector")
+
+    def __init__(self, generate=True, patterns=None, base_only=False, languages=None,
+                 shape_cache_size=0, engine=ENGINE_SCAN, split_time=False, prefix_match=False,
+                 casefold=False, snapshot_dir=None, result_cache_size=0, negative_cache_size=0,
+                 negative_cache_error_rate=0.001, cache_file=None, shared_cache=None,
+                 filter_cache_size=0):
         """Inits class DataParser
         :param generate: Boolean value, if true, than automatically generate all patterns from base list self.patterns
-        :param patterns: list of patterns to be used. Default ALL_PATTERNS. See qddate.patterns for more info
+        :param patterns: list of patterns to be used. Default (None) ALL_PATTERNS.
+                         See qddate.patterns for more info
         :param base_only: Use only base patterns during generation of final list. Filters all patterns with text after datetime.
         :param languages: Language code (str) or list of language codes (list of str) to filter patterns by.
                          If None, uses all patterns. If specified, filters patterns to only include those for the specified languages.
                          Examples: languages="ru", languages=["en", "de"], languages=None (default)
         :type languages: str|list|None
+        :param shape_cache_size: If > 0, remember up to this number of text shapes (like
+                         "99.99.9999") (with the confident language and prefix) together with the
+                         candidates tried up to the one that matched. Texts with a known shape
+                         replay them and continue with the rest of candidates if none of them
+                         matches, results are the same as without cache. 0 disables it.
+        :type shape_cache_size: int
+        :param engine: How patterns are matched against text. ENGINE_SCAN ("scan", default) scans
+                         whole text and accepts only matches at position 0. ENGINE_ANCHORED
+                         ("anchored") tries only the start of the text (after leading whitespace)
+                         and fails fast on misses. ENGINE_RE ("re") matches as anchored, but uses
+                         patterns compiled into native re expressions (see qddate.re_engine);
+                         patterns that can't be compiled use anchored matching.
+        :type engine: str
+        :param split_time: If True, don't generate ":time_1", ":time_2" and ":time_3" copies of each
+                         pattern, match the date part once and then try time suffixes
+                         (TIME_SUFFIXES) on the rest of text. Matched pattern is still reported with
+                         the same ":time_*" key and time_format.
+        :type split_time: bool
+        :param prefix_match: If True, don't generate ":t_right" copies of each pattern accepting
+                         text after the date, match the pattern as a prefix of text instead. Matched
+                         pattern is still reported with the same ":t_right" key, its "span" ends
+                         where the date ends.
+        :type prefix_match: bool
+        :param casefold: If True, patterns which differ only by case of month and weekday names
+                         (like "*_lc" keys) are merged into one pattern matching names in any case
+                         (see qddate.casefold). Matched pattern is reported with the key of the
+                         first pattern of the pair.
+        :type casefold: bool
+        :param snapshot_dir: Directory with snapshots of generated patterns and indexes (see
+                         qddate.snapshot). If a snapshot for this configuration (qddate version,
+                         languages, base_only, pyparsing version and other pattern options) exists,
+                         it is loaded instead of generating patterns and building indexes, otherwise
+                         it is saved there after init. Only built-in patterns can be snapshotted.
+                         Snapshots are unpickled, so the directory must be writable only by trusted
+                         users: on POSIX systems snapshots are ignored unless the directory and the
+                         file are owned by the current user and not writable by others.
+        :type snapshot_dir: str|None
+        :param result_cache_size: If > 0, remember results of up to this number of recent match()
+                         and parse() calls (see qddate.cache.ResultCache), keyed by text and filter
+                         flags. Least recently used results are evicted, results of patterns without
+                         year expire when the year changes. Cache is thread-safe and not used during
+                         sessions. Cached match() results are shared between calls and should not be
+                         changed. 0 disables it.
+        :type result_cache_size: int
+        :param negative_cache_size: If > 0, remember texts (with filter flags) no pattern matched in
+                         a Bloom filter sized for this number of texts (see
+                         qddate.cache.BloomFilter), so repeated non-dates are rejected by one hash
+                         lookup before filtering patterns. Filter takes fixed memory and is cleared
+                         when this number of texts has been added. Dates falsely reported as known
+                         non-dates are not matched, their share is at most
+                         negative_cache_error_rate. Not used during sessions. 0 disables it.
+        :type negative_cache_size: int
+        :param negative_cache_error_rate: false positive rate of negative cache, between 0 and 1
+        :type negative_cache_error_rate: float
+        :param cache_file: SQLite file (see qddate.persist) with result cache and session keys saved
+                         by :meth:`save_caches`, they are loaded into enabled caches on init. Saved
+                         session keys are only kept in loaded_session_keys, the session is not
+                         started, call startSession(parser.loaded_session_keys) to restore it.
+                         Entries are saved per qddate version and pattern set hash (keys of patterns
+                         and options results depend on), entries of other versions and pattern sets
+                         are ignored. Only parse() results of the result cache are saved, shape
+                         cache is not saved.
+        :type cache_file: str|None
+        :param shared_cache: :class:`qddate.shmcache.SharedParseCache` or name of its shared memory
+                         block to attach to. parse() results are looked up there after the result
+                         cache and stored there, so processes of a machine share one cache. Keys
+                         include pattern set hash, so parsers of different configurations can use
+                         the same table. Pickled parser attaches to the table by name. Not used
+                         during sessions.
+        :type shared_cache: :class:`qddate.shmcache.SharedParseCache`|str|None
+        :param filter_cache_size: If > 0, remember filtered candidate masks for up to this number of
+                         text feature signatures (length, character sets, separators, confident
+                         language, year format and prefix basekeys, those of them the filter flags
+                         use), so texts with a known signature skip all filter levels. Not used
+                         during sessions. 0 disables it.
+        :type filter_cache_size: int
+
+        Parsers with built-in patterns (patterns not given or languages given) share generated
+        patterns and indexes with previously created parsers of the same languages, base_only,
+        generate, split_time, prefix_match and casefold, so only the first of them generates
+        patterns.
+
+        Pickled parser keeps only these arguments and keys of the current session, it is rebuilt
+        by unpickling, from patterns shared in the process or from snapshot_dir if they are there.
         """
-        # Filter patterns by language if languages parameter is provided
-        if languages is not None:
-            patterns = get_patterns_for_languages(languages)
-        
-        self.patterns = patterns
+        if engine not in ENGINES:
+            raise ValueError(f"Unsupported engine: {engine!r}. Supported engines: {ENGINES}")
+        self.engine = engine
+        self.split_time = split_time
+        self.prefix_match = prefix_match
+        self.casefold = casefold
+        if snapshot_dir is not None and patterns is not None and languages is None:
+            raise ValueError("snapshot_dir can't be used with custom patterns")
         self._current_year = datetime.datetime.now().year
         self._year_refresh_interval = 3600  # seconds
         self._next_year_refresh = time.monotonic() + self._year_refresh_interval
-        if generate:
-            self.__generate(base_only)
-        self._build_length_index()
-        self._build_separator_index()
-        self._build_year_format_index()
-        self._build_language_index()
         self.cachedpats = None
         self.ind = []
+        self._session_mask = None
+        self._shape_cache = ShapeCache(shape_cache_size) if shape_cache_size > 0 else None
+        self._result_cache = ResultCache(result_cache_size) if result_cache_size > 0 else None
+        self._negative_cache = (BloomFilter(negative_cache_size, negative_cache_error_rate)
+                                if negative_cache_size > 0 else None)
+        self._filter_cache = FilterCache(filter_cache_size) if filter_cache_size > 0 else None
+        # Constructor arguments the parser is rebuilt from when unpickled, custom patterns are
+        # not used when languages are given
+        self._config = {
+            "generate": generate, "patterns": patterns if languages is None else None,
+            "base_only": base_only, "languages": languages, "shape_cache_size": shape_cache_size,
+            "engine": engine, "split_time": split_time, "prefix_match": prefix_match,
+            "casefold": casefold, "snapshot_dir": snapshot_dir,
+            "result_cache_size": result_cache_size,
+            "negative_cache_size": negative_cache_size,
+            "negative_cache_error_rate": negative_cache_error_rate,
+            "cache_file": cache_file,
+            "shared_cache": (shared_cache.name if isinstance(shared_cache, SharedParseCache)
+                             else shared_cache),
+            "filter_cache_size": filter_cache_size,
+        }
+        self._session_keys = None
+        shared_key = None
+        if (patterns is None and languages is None) or isinstance(languages, (str, list, tuple)):
+            # order of languages is order of patterns, so it is a part of the key
+            shared_key = ((languages,) if isinstance(languages, str) else
+                          tuple(languages) if languages is not None else None,
+                          bool(base_only), bool(generate), bool(split_time), bool(prefix_match),
+                          bool(casefold))
+        state = _SHARED_STATES.get(shared_key) if shared_key is not None else None
+        if state is None:
+            self._init_patterns(patterns, languages, base_only, generate, snapshot_dir)
+            if shared_key is not None:
+                # another thread may have built the same configuration meanwhile,
+                # the first one is kept
+                state = _SHARED_STATES.setdefault(shared_key, {name: getattr(self, name)
+                                                               for name in self._SHARED_ATTRS})
+        if state is not None:
+            for name in self._SHARED_ATTRS:
+                setattr(self, name, state[name])
+        self._cache_file = cache_file
+        # session keys saved to cache_file, restoring the session is up to the caller
+        self.loaded_session_keys = None
+        if cache_file is not None:
+            self._load_caches()
+        if isinstance(shared_cache, str):
+            shared_cache = SharedParseCache.attach(shared_cache)
+        self._shared_cache = shared_cache
+        # shared cache keys start with pattern set hash,
+        # results of other configurations are not found
+        self._shared_prefix = self._cache_hash()[:16] if shared_cache is not None else None
+
+    def _init_patterns(self, patterns, languages, base_only, generate, snapshot_dir):
+        """Loads, generates and indexes patterns or loads them from snapshot"""
+        snapshot_languages = languages
+        # Filter patterns by language if languages parameter is provided,
+        # pattern modules of other languages are not imported
+        if languages is not None:
+            patterns = get_patterns_for_languages(languages)
+            if isinstance(languages, str):
+                languages = [languages]
+            languages = frozenset(languages) | {"en"} if languages else None
+        elif patterns is None:
+            patterns = get_patterns_for_languages(None)
+        # Language detector counts names of parser languages only, English names are always loaded
+        self._detector = get_detector(languages)
+        if self.casefold:
+            patterns = merge_case_variants(patterns, languages=languages)
+        # Keys of merged case variants -> key of the pattern they were merged into
+        self._case_keys = {alias: p["key"] for p in patterns for alias in p.get("case_keys", ())}
+
+        self.patterns = patterns
+        split_time = self.split_time
+        prefix_match = self.prefix_match
+        state = None
+        if snapshot_dir is not None:
+            snapshot = snapshot_key(snapshot_languages, base_only, [p["key"] for p in patterns],
+                                    generate=bool(generate), split_time=bool(split_time),
+                                    prefix_match=bool(prefix_match), casefold=bool(self.casefold))
+            # Pattern module grammars are already built, snapshot keeps only references to them
+            shared = ([p["pattern"] for p in patterns] +
+                      [suffix for _, suffix, _, _, _ in TIME_SUFFIXES])
+            state = load_snapshot(snapshot_dir, snapshot, shared)
+        if state is not None:
+            self._restore_snapshot(state)
+        else:
+            if generate:
+                self.__generate(base_only, split_time, prefix_match)
+            # Pattern id is its position, variants share the id of their pattern
+            self.patterns = to_specs(self.patterns)
+            self._build_length_index()
+            self._build_separator_index()
+            self._build_year_format_index()
+            self._build_language_index()
+            self._build_bitset_index()
+            if snapshot_dir is not None:
+                state = {name: getattr(self, name) for name in self._SNAPSHOT_ATTRS}
+                save_snapshot(snapshot_dir, snapshot, state, shared)
 
     def __matchPrefix(self, text):
         """
@@ -181,103 +623,147 @@ class DateParser:
 
     def startSession(self, cached_p):
         cached_set = set(cached_p) if not isinstance(cached_p, set) else cached_p
-        self.cachedpats = [x for x in self.patterns if x["key"] in cached_set]
+        if self._case_keys:
+            # keys of merged case variants, like "dt:date:de_base_lc:time_1",
+            # select the merged pattern
+            cached_set = set(cached_set)
+            for key in list(cached_set):
+                parts = key.split(":")
+                basekey = ":".join(parts[:3])
+                if basekey in self._case_keys:
+                    cached_set.add(":".join([self._case_keys[basekey]] + parts[3:]))
+        self._session_keys = frozenset(cached_p)
+        self.cachedpats = [x for x in self.patterns if x.key in cached_set or
+                           any(v.key in cached_set for v in x.variants) or
+                           any(v.key in cached_set for v in x.right_variants)]
 
     def endSession(self):
         self.cachedpats = None
+        self._session_keys = None
+
+    def __reduce__(self):
+        """Pickles constructor arguments and session keys instead of patterns and indexes.
+
+        Generated pyparsing grammars and packrat state are rebuilt on unpickling, so parser is cheap
+        to send to multiprocessing or concurrent.futures workers. Custom patterns taken from
+        qddate.patterns are pickled as references to them, other custom patterns are pickled as
+        given.
+        """
+        config = self._config
+        if config["patterns"] is not None:
+            config = {**config, "patterns": _builtin_pattern_refs(config["patterns"])}
+        return _unpickle_parser, (config, self._session_keys)
 
-    def __generate(self, base_only=False):
+    def __generate(self, base_only=False, split_time=False, prefix_match=False):
         """Generates dates patterns"""
         base = []
         texted = []
         for pat in self.patterns:
-            # Assign character set metadata to base pattern
+            # Assign character set metadata to copies,
+            # pattern dicts of qddate.patterns stay unchanged
             if "required_chars" not in pat:
-                pat["required_chars"] = self._infer_char_sets(pat)
-            
-            data = {**pat}
-            data["basekey"] = data["key"]
-            data["key"] += ":time_1"
-            data["right"] = True
-            data["pattern"] = (data["pattern"] +
-                               Optional(Literal(",")).suppress() +
-                               BASE_TIME_PATTERNS["pat:time:minutes"])
-            data["time_format"] = "%H:%M"
-            data["length"] = {
-                "min": data["length"]["min"] + 5,
-                "max": data["length"]["max"] + 8,
-            }
-            # Preserve character set metadata
-            if "required_chars" in pat:
-                data["required_chars"] = pat["required_chars"]
-            base.append(data)
-
-            data = {**pat}
-            data["basekey"] = data["key"]
-            data["right"] = True
-            data["key"] += ":time_2"
-            data["pattern"] = (data["pattern"] +
-                               Optional(oneOf([",", "|", "T"])).suppress() +
-                               BASE_TIME_PATTERNS["pat:time:full"])
-            data["time_format"] = "%H:%M:%S"
-            data["length"] = {
-                "min": data["length"]["min"] + 9,
-                "max": data["length"]["max"] + 9,
-            }
-            # Preserve character set metadata
-            if "required_chars" in pat:
-                data["required_chars"] = pat["required_chars"]
-            base.append(data)
+                properties = PATTERN_PROPERTIES.get(pat.get("basekey", pat["key"]))
+                if properties is not None:
+                    required_chars = properties[3]
+                else:
+                    required_chars = self._infer_char_sets(pat)
+                pat = {**pat, "required_chars": required_chars}
 
-            data = {**pat}
-            data["basekey"] = data["key"]
-            data["right"] = True
-            data["key"] += ":time_3"
-            data["pattern"] = (data["pattern"] +
-                               Optional(Literal("[")).suppress() +
-                               BASE_TIME_PATTERNS["pat:time:minutes"] +
-                               Optional(Literal("]")).suppress())
-            data["time_format"] = "%H:%M"
-            data["length"] = {
-                "min": data["length"]["min"] + 7,
-                "max": data["length"]["max"] + 10,
-            }
-            # Preserve character set metadata
-            if "required_chars" in pat:
-                data["required_chars"] = pat["required_chars"]
-            base.append(data)
+            variants = []
+            for suffix_key, suffix, time_format, min_add, max_add in TIME_SUFFIXES:
+                data = {**pat}
+                data["basekey"] = data["key"]
+                data["key"] += suffix_key
+                data["right"] = True
+                data["time_format"] = time_format
+                data["length"] = {
+                    "min": data["length"]["min"] + min_add,
+                    "max": data["length"]["max"] + max_add,
+                }
+                if split_time:
+                    # Date part is matched once, suffix is tried on the rest of the text
+                    data["time_pattern"] = suffix
+                else:
+                    data["pattern"] = data["pattern"] + suffix
+                variants.append(data)
 
             data = {**pat}
-            data["pattern"] = data["pattern"]
             data["right"] = True
             data["basekey"] = data["key"]
-            # Preserve character set metadata
-            if "required_chars" in pat:
-                data["required_chars"] = pat["required_chars"]
+            if split_time:
+                # Bare date pattern is the last variant, it needs no time suffix
+                variants.append({**data, "time_pattern": None})
+                data["variants"] = tuple(variants)
+                data["length"] = {
+                    "min": min(v["length"]["min"] for v in variants),
+                    "max": max(v["length"]["max"] for v in variants),
+                }
+            else:
+                base.extend(variants)
             base.append(data)
 
         if not base_only:
             for pat in base:
+                if prefix_match:
+                    # No grammar copy accepting text after the date: the same pattern is matched
+                    # as a prefix of text and the match span shows where the date ends
+                    variants = pat.get("variants", (pat,))
+                    right_variants = []
+                    for v in variants:
+                        v = {**v}
+                        v["key"] += ":t_right"
+                        # like lineStart in generated ":t_right" pattern, accepts leading whitespace
+                        v["prefix"] = True
+                        v["length"] = {
+                            "min": v["length"]["min"] + 1,
+                            "max": v["length"]["max"] + 90,
+                        }
+                        right_variants.append(v)
+                    data = {**pat}
+                    data["variants"] = variants
+                    data["right_variants"] = tuple(right_variants)
+                    data["length"] = {
+                        "min": min(v["length"]["min"] for v in variants),
+                        "max": max(v["length"]["max"] for v in right_variants),
+                    }
+                    texted.append(data)
+                    continue
                 # Right
                 data = {**pat}
                 data["key"] += ":t_right"
-                data["pattern"] = (
-                    lineStart + data["pattern"] +
-                    Optional(oneOf([",", "|", ":", ")"])).suppress() +
-                    restOfLine.suppress())
                 data["length"] = {
                     "min": data["length"]["min"] + 1,
                     "max": data["length"]["max"] + 90,
                 }
-                # Preserve character set metadata
-                if "required_chars" in pat:
-                    data["required_chars"] = pat["required_chars"]
+                if split_time:
+                    # Text after the date (and time) is never checked, only start of line is needed
+                    data["pattern"] = lineStart + data["pattern"]
+                    variants = []
+                    for v in data["variants"]:
+                        v = {**v}
+                        v["key"] += ":t_right"
+                        v["pattern"] = data["pattern"]
+                        v["length"] = {
+                            "min": v["length"]["min"] + 1,
+                            "max": v["length"]["max"] + 90,
+                        }
+                        variants.append(v)
+                    data["variants"] = tuple(variants)
+                else:
+                    data["pattern"] = (
+                        lineStart + data["pattern"] +
+                        Optional(oneOf([",", "|", ":", ")"])).suppress() +
+                        restOfLine.suppress())
                 texted.append(data)
 
-            base.extend(texted)
+            if prefix_match:
+                base = texted
+            else:
+                base.extend(texted)
         self.patterns = base
 
-    def _infer_char_sets(self, pattern):
+    @staticmethod
+    def _infer_char_sets(pattern):
         """Infer required character sets from pattern metadata.
         
         :param pattern: Pattern dictionary
@@ -350,15 +836,26 @@ class DateParser:
         return {CHAR_SET_DIGITS, CHAR_SET_LATIN}
 
     def _build_length_index(self):
-        """Pre-index patterns by length ranges for faster filtering"""
-        self._patterns_by_length = {}
+        """Pre-index patterns by length ranges for faster filtering.
+
+        Length ranges are turned into sorted interval endpoints: bits of patterns are set at their
+        min length and cleared after their max length, so a single sweep over the endpoints gives
+        the bitmask of patterns accepting each length without expanding every range into lists.
+        """
+        starts = {}
+        ends = {}
         for p in self.patterns:
-            min_len = p["length"]["min"]
-            max_len = p["length"]["max"]
-            for length in range(min_len, max_len + 1):
-                if length not in self._patterns_by_length:
-                    self._patterns_by_length[length] = []
-                self._patterns_by_length[length].append(p)
+            bit = 1 << p.id
+            starts[p.min_length] = starts.get(p.min_length, 0) | bit
+            ends[p.max_length + 1] = ends.get(p.max_length + 1, 0) | bit
+        self._length_masks = {}
+        endpoints = sorted(starts.keys() | ends.keys())
+        mask = 0
+        for length, next_length in zip(endpoints, endpoints[1:]):
+            mask = (mask | starts.get(length, 0)) & ~ends.get(length, 0)
+            if mask:
+                for n in range(length, next_length):
+                    self._length_masks[n] = mask
 
     def _build_separator_index(self):
         """Pre-index patterns by separator types for faster filtering"""
@@ -371,73 +868,10 @@ class DateParser:
             'mixed': []       # Patterns with multiple separator types
         }
         
+        # Separator kind is inferred from pattern basekey when pattern record is built,
+        # see qddate.spec.pattern_separator
         for p in self.patterns:
-            key = p.get("key", "")
-            basekey = p.get("basekey", key)
-            
-            # Infer separator from pattern key or format
-            # Note: Check more specific patterns first (e.g., date_10 before date_1) to avoid substring matching issues
-            if any(x in basekey for x in ["date_10", "date_4_point", "date_rus3", "date_usa_1"]):
-                # More specific patterns first to avoid substring matching (e.g., date_1 matching date_10)
-                if "date_10" in basekey or "date_4_point" in basekey or "date_rus3" in basekey:
-                    self._patterns_by_separator['dot'].append(p)
-                elif "date_usa_1" in basekey:
-                    self._patterns_by_separator['slash'].append(p)
-            elif any(x in basekey for x in ["date_2", "date_4", "noyear_1", "rare_2", "rare_3", "rus_rare_2", "rus_rare_3", "date_eng1", "date_eng1_lc", "date_eng1_short"]):
-                self._patterns_by_separator['dot'].append(p)
-            elif any(x in basekey for x in ["date_1", "date_8", "date_usa", "rare_1"]):
-                self._patterns_by_separator['slash'].append(p)
-            elif any(x in basekey for x in ["date_3"]):
-                # date_3 (yyyy/m/d) can accept both / and space, index under slash for now
-                # The separator filter will handle space detection
-                self._patterns_by_separator['slash'].append(p)
-            elif any(x in basekey for x in ["date_iso8601", "date_iso8601_short", "date_9"]):
-                self._patterns_by_separator['dash'].append(p)
-            elif any(x in basekey for x in ["date_5", "date_6", "date_7"]):
-                self._patterns_by_separator['none'].append(p)
-            elif any(x in basekey for x in ["eng", "rus", "fr", "de", "es", "it", "pt", "bg", "cz", 
-                                             "pl", "tr", "nl", "weekday"]):
-                self._patterns_by_separator['space'].append(p)
-            else:
-                self._patterns_by_separator['mixed'].append(p)
-
-    def _detect_separators(self, text):
-        """Quickly detect separator types in text.
-        
-        :param text: Input string to scan
-        :type text: str
-        :return: Set of detected separator types
-        :rtype: set
-        """
-        if not text:
-            return set()
-        
-        separators = set()
-        # Check first 20 chars for efficiency
-        scan_len = min(20, len(text))
-        for i in range(scan_len):
-            char = text[i]
-            if char == '/':
-                separators.add('slash')
-            elif char == '.':
-                separators.add('dot')
-            elif char == '-':
-                separators.add('dash')
-            elif char == ' ':
-                separators.add('space')
-        
-        # If no separators found and text is mostly digits, it might be 'none'
-        if not separators and text and text[0].isdigit():
-            # Check if it's a compact format like yyyymmdd or ddmmyyyy
-            if len(text) >= 8 and all(c.isdigit() for c in text[:8]):
-                separators.add('none')
-            else:
-                # Default to mixed if we can't determine
-                separators.add('mixed')
-        elif not separators:
-            separators.add('mixed')
-        
-        return separators
+            self._patterns_by_separator[p.separator].append(p)
 
     def _build_year_format_index(self):
         """Pre-index patterns by year format requirements for faster filtering"""
@@ -448,178 +882,49 @@ class DateParser:
             'any': []       # Patterns that accept any year format
         }
         
+        # see qddate.spec.pattern_year_format
         for p in self.patterns:
-            key = p.get("key", "")
-            basekey = p.get("basekey", key)
-            
-            if p.get("noyear", False):
-                self._patterns_by_year_format['noyear'].append(p)
-            elif p.get("yearshort", False):
-                self._patterns_by_year_format['2digit'].append(p)
-            elif any(x in basekey for x in ["date_iso8601", "date_9", "date_10"]):
-                # ISO formats typically use 4-digit years
-                self._patterns_by_year_format['4digit'].append(p)
-            else:
-                # Most patterns can handle both, but default to 4-digit preference
-                self._patterns_by_year_format['any'].append(p)
-
-    def _detect_year_format(self, text):
-        """Detect if text likely has 2-digit or 4-digit year.
-        
-        Optimized version: uses pre-compiled pyparsing patterns.
-        
-        :param text: Input string to scan
-        :type text: str
-        :return: '4digit', '2digit', or 'unknown'
-        :rtype: str
-        """
-        if not text:
-            return 'unknown'
-        
-        # Look for 4-digit year patterns (more specific, check first)
-        # Use pyparsing scanString for consistency with codebase
-        if next(_YEAR_4DIGIT_PATTERN.scanString(text), None) is not None:
-            return '4digit'
-        
-        # Look for 2-digit year patterns using pyparsing
-        if next(_YEAR_2DIGIT_PATTERN.scanString(text), None) is not None:
-            return '2digit'
-        
-        return 'unknown'
+            self._patterns_by_year_format[p.year_format].append(p)
 
     def _detect_language(self, text):
         """Detect language from text using character sets and month name detection.
-        
-        Optimized version: uses simple 'in' operator instead of regex for faster matching.
-        
+
         :param text: Input string to analyze
         :type text: str
         :return: List of possible language codes, or None if unknown
         :rtype: list|None
         """
-        if not text:
-            return None
-        
-        char_sets = scan_char_sets(text)
-        text_lower = text.lower()
-        detected_languages = []
-        
-        # Check for Cyrillic languages
-        if CHAR_SET_CYRILLIC in char_sets:
-            # Use simple 'in' operator - faster than regex for date strings
-            if any(month in text_lower for month in _RUSSIAN_MONTHS):
-                detected_languages.append('ru')
-                # Early exit: high confidence match
-                return detected_languages
-            else:
-                # Could be Russian or Bulgarian
-                detected_languages.extend(['ru', 'bg'])
-                return detected_languages
-        
-        # Check for accented languages with month name detection
-        if CHAR_SET_ACCENTED in char_sets or CHAR_SET_LATIN in char_sets:
-            # Use simple 'in' operator instead of regex - sufficient for date strings
-            # French month names
-            if any(month in text_lower for month in _FRENCH_MONTHS):
-                detected_languages.append('fr')
-                return detected_languages  # Early exit: high confidence
-            
-            # Spanish month names
-            if any(month in text_lower for month in _SPANISH_MONTHS):
-                detected_languages.append('es')
-                return detected_languages  # Early exit: high confidence
-            
-            # Italian month names
-            if any(month in text_lower for month in _ITALIAN_MONTHS):
-                detected_languages.append('it')
-                return detected_languages  # Early exit: high confidence
-            
-            # Portuguese month names
-            if any(month in text_lower for month in _PORTUGUESE_MONTHS):
-                detected_languages.append('pt')
-                return detected_languages  # Early exit: high confidence
-            
-            # Czech month names
-            if any(month in text_lower for month in _CZECH_MONTHS):
-                detected_languages.append('cz')
-                return detected_languages  # Early exit: high confidence
-            
-            # Polish month names (including genitive forms)
-            if any(month in text_lower for month in _POLISH_MONTHS):
-                detected_languages.append('pl')
-                return detected_languages  # Early exit: high confidence
-        
-        # Check for Latin-based languages (English, German, Dutch, Turkish)
-        # Only check if no accented languages were detected (to avoid false matches)
-        if CHAR_SET_LATIN in char_sets and not detected_languages:
-            # English month names (use pyparsing for consistency with codebase)
-            # pyparsing's oneOf with scanString naturally handles word boundaries
-            if next(_ENGLISH_MONTH_PATTERN.scanString(text_lower, maxMatches=1), None) is not None:
-                detected_languages.append('en')
-                return detected_languages  # Early exit: high confidence
-            
-            # Dutch month names (check before German since they share month names like "juli")
-            if any(month in text_lower for month in _DUTCH_MONTHS):
-                detected_languages.append('nl')
-                return detected_languages  # Early exit: high confidence
-            
-            # German month names (use pyparsing for consistency)
-            if next(_GERMAN_MONTH_PATTERN.scanString(text_lower, maxMatches=1), None) is not None:
-                detected_languages.append('de')
-                return detected_languages  # Early exit: high confidence
-            
-            # Turkish month names
-            if any(month in text_lower for month in _TURKISH_MONTHS):
-                detected_languages.append('tr')
-                return detected_languages  # Early exit: high confidence
-        
-        # If no specific language detected but we have character sets, return None
-        # (let other filters handle it)
-        return detected_languages if detected_languages else None
+        languages = TextProfile(text, self._detector).languages
+        return list(languages) if languages else None
 
     def _build_language_index(self):
         """Pre-index patterns by language for faster filtering"""
         self._patterns_by_language = {}
         
+        # Language of month and weekday names of pattern, see qddate.spec.pattern_language
         for p in self.patterns:
-            key = p.get("key", "")
-            basekey = p.get("basekey", key)
-            
-            # Extract language from pattern basekey
-            lang = None
-            if "_rus" in basekey or "rus_" in basekey:
-                lang = 'ru'
-            elif "_bg" in basekey or "bg_" in basekey:
-                lang = 'bg'
-            elif "_fr" in basekey or "fr_" in basekey:
-                lang = 'fr'
-            elif "_cz" in basekey or "cz_" in basekey:
-                lang = 'cz'
-            elif "_pl" in basekey or "pl_" in basekey:
-                lang = 'pl'
-            elif "_es" in basekey or "es_" in basekey:
-                lang = 'es'
-            elif "_it" in basekey or "it_" in basekey:
-                lang = 'it'
-            elif "_pt" in basekey or "pt_" in basekey:
-                lang = 'pt'
-            elif "_de" in basekey or "de_" in basekey:
-                lang = 'de'
-            elif "_tr" in basekey or "tr_" in basekey:
-                lang = 'tr'
-            elif "_nl" in basekey or "nl_" in basekey:
-                lang = 'nl'
-            elif "_eng" in basekey or "eng" in basekey or "date_usa" in basekey:
-                lang = 'en'
-            
-            if lang:
-                if lang not in self._patterns_by_language:
-                    self._patterns_by_language[lang] = []
-                self._patterns_by_language[lang].append(p)
+            if p.language:
+                self._patterns_by_language.setdefault(p.language, []).append(p)
 
     def _filter_patterns_hierarchical(self, text, n, noprefix=False, noyear=True, 
                                        nocharsetfilter=False, noseparatorfilter=False, 
-                                       noyearformatfilter=False, nolanguagefilter=False):
+                                       noyearformatfilter=False, nolanguagefilter=False,
+                                       profile=None):
+        """Apply multiple filters in optimal order for maximum efficiency, see :meth:`_filter_mask`.
+
+        :return: Filtered list of patterns, or None if no patterns remain
+        :rtype: list|None
+        """
+        mask = self._filter_mask(text, n, noprefix=noprefix, noyear=noyear,
+                                 nocharsetfilter=nocharsetfilter,
+                                 noseparatorfilter=noseparatorfilter,
+                                 noyearformatfilter=noyearformatfilter,
+                                 nolanguagefilter=nolanguagefilter, profile=profile)
+        return self._patterns_of(mask) if mask else None
+
+    def _filter_mask(self, text, n, noprefix=False, noyear=True, nocharsetfilter=False,
+                     noseparatorfilter=False, noyearformatfilter=False, nolanguagefilter=False,
+                     profile=None):
         """Apply multiple filters in optimal order for maximum efficiency.
         
         Filters are applied in order from cheapest/most selective to more expensive:
@@ -645,159 +950,314 @@ class DateParser:
         :type noyearformatfilter: bool
         :param nolanguagefilter: If True, skip language filtering
         :type nolanguagefilter: bool
-        :return: Filtered list of patterns, or None if no patterns remain
-        :rtype: list|None
+        :param profile: Features of text, computed if not given
+        :type profile: :class:`TextProfile`
+        :return: Bitmask of filtered patterns, 0 if no patterns remain
+        :rtype: int
         """
+        if profile is None:
+            profile = TextProfile(text, self._detector)
+        if self._filter_cache is None or self.cachedpats is not None:
+            return self._apply_filters(n, profile, noprefix, nocharsetfilter, noseparatorfilter,
+                                       noyearformatfilter, nolanguagefilter)
+        return self._filter_entry(n, profile, noprefix, nocharsetfilter, noseparatorfilter,
+                                  noyearformatfilter, nolanguagefilter)[0]
+
+    def _filter_entry(self, n, profile, noprefix=False, nocharsetfilter=False,
+                      noseparatorfilter=False, noyearformatfilter=False, nolanguagefilter=False):
+        """Returns filter cache entry for text features, filters them on first use.
+
+        :return: tuple of (mask of :meth:`_filter_mask`, dict of priority separator -> tuple of
+            candidates in the order of :meth:`_ordered_candidates`, filled by :meth:`match`)
+        :rtype: tuple
+        """
+        filter_cache = self._filter_cache
+        # Signature holds only features used by filter levels enabled for this length and flags
+        long_text = n > 5
+        languages = profile.languages if long_text and not nolanguagefilter else None
+        signature = (
+            n,
+            profile.char_sets if long_text and not noprefix and not nocharsetfilter else None,
+            (profile.separators, profile.has_text) if n > 0 and not noseparatorfilter else None,
+            languages[0] if languages and len(languages) == 1 else None,
+            profile.year_format if n > 0 and not noyearformatfilter else None,
+            profile.prefix_basekeys if long_text and not noprefix else None,
+        )
+        entry = filter_cache.get(signature)
+        if entry is not None:
+            return entry
+        entry = (self._apply_filters(n, profile, noprefix, nocharsetfilter, noseparatorfilter,
+                                     noyearformatfilter, nolanguagefilter), {})
+        filter_cache.put(signature, entry)
+        return entry
+
+    def _apply_filters(self, n, profile, noprefix=False, nocharsetfilter=False,
+                       noseparatorfilter=False, noyearformatfilter=False, nolanguagefilter=False):
+        """Applies filter levels of :meth:`_filter_mask` to text profile"""
+        # Every index is an int bitmask over pattern ids (positions in self.patterns), so each level
+        # is a single & with a mask cached by the text feature it depends on
         # Level 1: Length filter (cheapest, most selective)
         if self.cachedpats is not None:
-            pats = self.cachedpats
+            session = self._session_mask
+            if session is None or session[0] is not self.cachedpats:
+                session = self._session_mask = (self.cachedpats, self._mask_of(self.cachedpats))
+            mask = session[1]
         else:
-            if hasattr(self, '_patterns_by_length'):
-                pats = self._patterns_by_length.get(n, [])
-            else:
-                pats = self.patterns
+            mask = self._length_mask(n)
         
-        if not pats:
-            return None
+        if not mask:
+            return 0
         
         # Level 2: Character set filter (cheap, very selective)
         if n > 5 and not noprefix and not nocharsetfilter:
-            text_char_sets = scan_char_sets(text)
-            compatible_patterns = []
-            for p in pats:
-                required_chars = p.get("required_chars")
-                if not required_chars:
-                    compatible_patterns.append(p)
-                    continue
-                
-                # Early exit: check if required character sets are present
-                required_cyrillic = CHAR_SET_CYRILLIC in required_chars
-                if required_cyrillic and CHAR_SET_CYRILLIC not in text_char_sets:
-                    continue
-                
-                required_accented = CHAR_SET_ACCENTED in required_chars
-                has_latin = CHAR_SET_LATIN in text_char_sets
-                has_accented = CHAR_SET_ACCENTED in text_char_sets
-                if required_accented and not has_accented and not has_latin:
-                    continue
-                
-                # Use set operations directly instead of copying
-                # Check if required chars (with accented->latin substitution) are subset of text chars
-                if CHAR_SET_ACCENTED in required_chars and has_latin:
-                    # Create adjusted set without copying
-                    if required_chars - {CHAR_SET_ACCENTED} | {CHAR_SET_LATIN} <= text_char_sets:
-                        compatible_patterns.append(p)
-                else:
-                    if required_chars <= text_char_sets:
-                        compatible_patterns.append(p)
-            
-            if compatible_patterns:
-                pats = compatible_patterns
-            else:
-                return None
+            mask &= self._charset_mask(profile.char_sets)
+            if not mask:
+                return 0
         
         # Level 3: Separator filter (cheap, selective)
-        if n > 0 and not noseparatorfilter and hasattr(self, '_patterns_by_separator'):
-            separators = self._detect_separators(text)
-            if separators:
-                separator_basekeys = set()
-                for sep in separators:
-                    for p in self._patterns_by_separator.get(sep, []):
-                        basekey = p.get("basekey", p.get("key", ""))
-                        separator_basekeys.add(basekey)
-                
-                # Patterns that accept multiple separator types (e.g., date_1, date_8, date_3 now accept both / and space)
-                # Include slash and mixed patterns when space is detected (since patterns now accept both)
-                if 'space' in separators:
-                    # Combine both checks in one pass for efficiency
-                    space_compatible_patterns = []
-                    space_compatible_patterns.extend(self._patterns_by_separator.get('slash', []))
-                    space_compatible_patterns.extend(self._patterns_by_separator.get('mixed', []))
-                    for p in space_compatible_patterns:
-                        basekey = p.get("basekey", p.get("key", ""))
-                        # Include patterns that can accept spaces (date_1, date_8, date_3)
-                        if any(x in basekey for x in ["date_1", "date_8", "date_3"]):
-                            separator_basekeys.add(basekey)
-                
-                has_text = any(c.isalpha() for c in text)
-                
-                if separator_basekeys:
-                    filtered_pats = []
-                    for p in pats:
-                        basekey = p.get("basekey", p.get("key", ""))
-                        if basekey in separator_basekeys:
-                            filtered_pats.append(p)
-                        elif has_text and any(x in basekey for x in ["eng", "rus", "fr", "de", "es", "it", 
-                                                                      "pt", "bg", "cz", "pl", "tr", "nl", 
-                                                                      "weekday", "rare"]):
-                            if 'space' in separators or 'mixed' in separators:
-                                filtered_pats.append(p)
-                    pats = filtered_pats
-                else:
-                    pats = []
+        if n > 0 and not noseparatorfilter:
+            if profile.separators:
+                mask &= self._separator_mask(profile.separators, profile.has_text)
             
-            if not pats:
-                return None
+            if not mask:
+                return 0
         
         # Level 4: Language filter (after character sets, before separators)
         # Only apply if we have high confidence (single language detected with month names)
-        if n > 5 and not nolanguagefilter and hasattr(self, '_patterns_by_language'):
-            detected_languages = self._detect_language(text)
+        if n > 5 and not nolanguagefilter:
+            detected_languages = profile.languages
             # Only filter if we detected exactly one language (high confidence)
             # Multiple languages or None means we're not confident, so don't filter
             if detected_languages and len(detected_languages) == 1:
-                lang = detected_languages[0]
-                language_pats = []
-                language_pat_keys = set()
-                for p in self._patterns_by_language.get(lang, []):
-                    pat_key = p.get("key")
-                    if pat_key not in language_pat_keys:
-                        language_pats.append(p)
-                        language_pat_keys.add(pat_key)
-                
-                if language_pat_keys:
-                    pats = [p for p in pats if p.get("key") in language_pat_keys]
-                else:
-                    pats = []
+                mask &= self._language_mask(detected_languages[0])
             
-            if not pats:
-                return None
+            if not mask:
+                return 0
         
         # Level 5: Year format filter (cheap)
-        if n > 0 and not noyearformatfilter and hasattr(self, '_patterns_by_year_format'):
-            year_format = self._detect_year_format(text)
+        if n > 0 and not noyearformatfilter:
+            year_format = profile.year_format
             if year_format != 'unknown':
-                year_pats = []
-                year_pat_keys = set()
-                # Include patterns matching detected format
-                for p in self._patterns_by_year_format.get(year_format, []):
-                    pat_key = p.get("key")
-                    if pat_key not in year_pat_keys:
-                        year_pats.append(p)
-                        year_pat_keys.add(pat_key)
-                # Also include 'any' patterns
-                for p in self._patterns_by_year_format.get('any', []):
-                    pat_key = p.get("key")
-                    if pat_key not in year_pat_keys:
-                        year_pats.append(p)
-                        year_pat_keys.add(pat_key)
-                
-                if year_pat_keys:
-                    pats = [p for p in pats if p.get("key") in year_pat_keys]
-                else:
-                    pats = []
+                mask &= self._year_format_mask(year_format)
             
-            if not pats:
-                return None
+            if not mask:
+                return 0
         
         # Level 6: Prefix filter (existing, most selective)
         if n > 5 and not noprefix:
-            basekeys_list = self.__matchPrefix(text[:6])
-            basekeys = set(basekeys_list) if basekeys_list else set()
+            basekeys = profile.prefix_basekeys
             if basekeys:
-                pats = [p for p in pats if p.get("basekey") in basekeys or not p.get("right", False)]
+                mask &= self._prefix_mask(basekeys)
         
-        return pats if pats else None
+        return mask
+
+    def _build_bitset_index(self):
+        """Assigns integer ids to patterns for bitmask indexes.
+
+        Patterns sharing the property a filter depends on (basekey, required character sets,
+        length bounds) are grouped into masks once, masks for text features are then
+        combined from these groups lazily on first use.
+        """
+        size = len(self.patterns)
+        key_ids = {}
+        basekey_ids = {}
+        charset_ids = {}
+        fixed_ids = []
+        for p in self.patterns:
+            i = p.id
+            key_ids.setdefault(p.key, []).append(i)
+            basekey_ids.setdefault(p.basekey, []).append(i)
+            # merged case variants pass filters of each of them
+            for case_key in p.case_keys:
+                basekey_ids.setdefault(case_key, []).append(i)
+            charset_ids.setdefault(p.required_chars or None, []).append(i)
+            if not p.right:
+                fixed_ids.append(i)
+        key_masks = {key: _ids_mask(ids, size) for key, ids in key_ids.items()}
+        self._basekey_masks = {basekey: _ids_mask(ids, size)
+                               for basekey, ids in basekey_ids.items()}
+        self._charset_groups = [(required_chars, _ids_mask(ids, size))
+                                for required_chars, ids in charset_ids.items()]
+        # Patterns without "right" flag pass prefix filter
+        self._fixed_mask = _ids_mask(fixed_ids, size)
+        # Language and year format filters keep all patterns sharing key with indexed patterns
+        self._language_masks = {
+            lang: self._keys_mask(key_masks, {p.key for p in patterns})
+            for lang, patterns in self._patterns_by_language.items()}
+        any_year_keys = {p.key for p in self._patterns_by_year_format.get('any', [])}
+        self._year_format_masks = {
+            year_format: self._keys_mask(key_masks, {p.key for p in patterns} | any_year_keys)
+            for year_format, patterns in self._patterns_by_year_format.items()}
+
+        # Candidates are ordered by priority in their own id space: patterns themselves or,
+        # with split_time or prefix_match, their variants in the order generated patterns would have
+        if self.split_time or self.prefix_match:
+            self._candidates = ([v for p in self.patterns for v in p.variants or (p,)] +
+                                [v for p in self.patterns for v in p.right_variants])
+            candidate_ids = {id(v): i for i, v in enumerate(self._candidates)}
+            self._variant_masks = [
+                _ids_mask([candidate_ids[id(v)] for v in (p.variants or (p,)) + p.right_variants],
+                          len(self._candidates))
+                for p in self.patterns]
+        else:
+            self._candidates = self.patterns
+            self._variant_masks = None
+        size = len(self._candidates)
+        priority_ids = {}
+        min_ids = {}
+        max_ids = {}
+        for i, p in enumerate(self._candidates):
+            # static priority depends only on these pattern properties
+            key = (p.basekey, bool(p.noyear))
+            priority_ids.setdefault(key, (p, []))[1].append(i)
+            min_ids.setdefault(p.min_length, []).append(i)
+            max_ids.setdefault(p.max_length, []).append(i)
+        priority_groups = [(p, _ids_mask(ids, size)) for p, ids in priority_ids.values()]
+        self._min_length_masks = {n: _ids_mask(ids, size) for n, ids in min_ids.items()}
+        self._max_length_masks = {n: _ids_mask(ids, size) for n, ids in max_ids.items()}
+        # Candidate masks by static priority score per separator kind
+        self._static_priority_masks = {}
+        for separator in PRIORITY_SEPARATORS:
+            static = {}
+            for p, group_mask in priority_groups:
+                score = self._static_priority(p, separator)
+                static[score] = static.get(score, 0) | group_mask
+            self._static_priority_masks[separator] = tuple(static.items())
+        self._reset_lazy_masks()
+
+    def _reset_lazy_masks(self):
+        """Clears filter masks and compiled expressions built on first use"""
+        for name in self._LAZY_ATTRS:
+            setattr(self, name, {})
+
+    def _restore_snapshot(self, state):
+        """Sets generated patterns and indexes loaded from snapshot"""
+        for name in self._SNAPSHOT_ATTRS:
+            setattr(self, name, state[name])
+        self._reset_lazy_masks()
+
+    def _mask_of(self, patterns):
+        """Returns bitmask of given patterns"""
+        return _ids_mask([p.id for p in patterns], len(self.patterns))
+
+    def _patterns_of(self, mask):
+        """Returns list of patterns from bitmask, in the order of self.patterns"""
+        patterns = self.patterns
+        result = []
+        while mask:
+            low = mask & -mask
+            result.append(patterns[low.bit_length() - 1])
+            mask ^= low
+        return result
+
+    @staticmethod
+    def _keys_mask(key_masks, keys):
+        """Returns union of key_masks for given keys"""
+        mask = 0
+        for key in keys:
+            mask |= key_masks.get(key, 0)
+        return mask
+
+    def _basekeys_mask(self, basekeys):
+        """Returns bitmask of patterns with given basekeys"""
+        masks = self._basekey_masks
+        mask = 0
+        for basekey in basekeys:
+            mask |= masks.get(basekey, 0)
+        return mask
+
+    def _length_mask(self, n):
+        return self._length_masks.get(n, 0)
+
+    def _charset_mask(self, text_char_sets):
+        """Mask of patterns which required character sets are compatible with text character sets"""
+        mask = self._charset_masks.get(text_char_sets)
+        if mask is not None:
+            return mask
+        has_latin = CHAR_SET_LATIN in text_char_sets
+        has_accented = CHAR_SET_ACCENTED in text_char_sets
+        mask = 0
+        for required_chars, group_mask in self._charset_groups:
+            if not required_chars:
+                mask |= group_mask
+                continue
+            if CHAR_SET_CYRILLIC in required_chars and CHAR_SET_CYRILLIC not in text_char_sets:
+                continue
+            required_accented = CHAR_SET_ACCENTED in required_chars
+            if required_accented and not has_accented and not has_latin:
+                continue
+            if required_accented and has_latin:
+                # Latin letters may stand for accented ones
+                if required_chars - {CHAR_SET_ACCENTED} | {CHAR_SET_LATIN} <= text_char_sets:
+                    mask |= group_mask
+            elif required_chars <= text_char_sets:
+                mask |= group_mask
+        self._charset_masks[text_char_sets] = mask
+        return mask
+
+    def _get_separator_basekeys(self, sep):
+        """Basekeys of patterns indexed under separator type.
+
+        'space+' holds basekeys of slash and mixed patterns which accept spaces too
+        (date_1, date_8, date_3), 'text' holds basekeys of patterns with words.
+        """
+        basekeys = self._separator_basekeys.get(sep)
+        if basekeys is not None:
+            return basekeys
+        if sep == 'space+':
+            basekeys = set()
+            by_separator = self._patterns_by_separator
+            for p in by_separator.get('slash', []) + by_separator.get('mixed', []):
+                if any(x in p.basekey for x in ["date_1", "date_8", "date_3"]):
+                    basekeys.add(p.basekey)
+        elif sep == 'text':
+            basekeys = {basekey for basekey in self._basekey_masks
+                        if any(x in basekey for x in ["eng", "rus", "fr", "de", "es", "it", "pt",
+                                                      "bg", "cz", "pl", "tr", "nl", "weekday",
+                                                      "rare"])}
+        else:
+            basekeys = {p.basekey for p in self._patterns_by_separator.get(sep, [])}
+        self._separator_basekeys[sep] = basekeys
+        return basekeys
+
+    def _separator_mask(self, separators, has_text):
+        """Mask of patterns compatible with detected separators"""
+        key = (separators, has_text)
+        mask = self._separator_masks.get(key)
+        if mask is not None:
+            return mask
+        separator_basekeys = set()
+        for sep in separators:
+            separator_basekeys |= self._get_separator_basekeys(sep)
+        # Patterns that accept multiple separator types
+        # (e.g., date_1, date_8, date_3 now accept both / and space)
+        if 'space' in separators:
+            separator_basekeys |= self._get_separator_basekeys('space+')
+        mask = 0
+        if separator_basekeys:
+            mask = self._basekeys_mask(separator_basekeys)
+            if has_text and ('space' in separators or 'mixed' in separators):
+                mask |= self._basekeys_mask(self._get_separator_basekeys('text'))
+        self._separator_masks[key] = mask
+        return mask
+
+    def _language_mask(self, lang):
+        """Mask of patterns with the same keys as language patterns"""
+        return self._language_masks.get(lang, 0)
+
+    def _year_format_mask(self, year_format):
+        """Mask of patterns with the same keys as patterns of year format or accepting any year"""
+        mask = self._year_format_masks.get(year_format)
+        if mask is None:
+            mask = self._year_format_masks.get('any', 0)
+        return mask
+
+    def _prefix_mask(self, basekeys):
+        """Mask of patterns allowed by prefix basekeys, patterns without "right" flag always are"""
+        mask = self._prefix_masks.get(basekeys)
+        if mask is None:
+            mask = self._prefix_masks[basekeys] = self._basekeys_mask(basekeys) | self._fixed_mask
+        return mask
 
     def _calculate_pattern_priority(self, pattern, text):
         """Calculate priority score for pattern based on text characteristics.
@@ -812,10 +1272,22 @@ class DateParser:
         :return: Integer priority score (higher = more likely)
         :rtype: int
         """
+        return (self._static_priority(pattern, priority_separator(text)) +
+                self._length_priority(pattern, len(text)))
+
+    def _static_priority(self, pattern, separator):
+        """Part of the priority score that depends only on pattern and text separator kind.
+
+        :param pattern: Pattern dictionary
+        :type pattern: dict
+        :param separator: text separator kind, see :func:`priority_separator`
+        :type separator: str
+        :return: Integer priority score
+        :rtype: int
+        """
         score = 0
         key = pattern.get("key", "")
         basekey = pattern.get("basekey", key)
-        n = len(text)
         
         # Higher priority for common patterns
         if "date_1" in basekey or "date_2" in basekey:
@@ -829,17 +1301,17 @@ class DateParser:
         elif any(x in basekey for x in ["eng", "rus", "fr", "de", "es", "it", "pt"]):
             score += 60
         
-        # Boost if separator matches (optimized: check separator first, then pattern types)
-        if '/' in text:
+        # Boost if separator matches
+        if separator == '/':
             if "date_1" in basekey or "date_8" in basekey or "date_usa" in basekey:
                 score += 20
-        elif '.' in text:
+        elif separator == '.':
             if "date_2" in basekey or "date_4" in basekey or "date_10" in basekey:
                 score += 20
-        elif '-' in text:
+        elif separator == '-':
             if "date_iso8601" in basekey or "date_9" in basekey:
                 score += 20
-        elif ' ' in text:
+        elif separator == ' ':
             # Use 'in' checks directly instead of any() for common patterns
             if ("eng" in basekey or "rus" in basekey or "fr" in basekey or "de" in basekey or 
                 "es" in basekey or "it" in basekey or "pt" in basekey or "bg" in basekey or 
@@ -847,15 +1319,6 @@ class DateParser:
                 "weekday" in basekey):
                 score += 20
         
-        # Boost if length is exact match (more likely to be correct)
-        length_min = pattern.get("length", {}).get("min", 0)
-        length_max = pattern.get("length", {}).get("max", 0)
-        if length_min <= n <= length_max:
-            if n == length_min or n == length_max:
-                score += 10
-            else:
-                score += 5
-        
         # Slight penalty for patterns with noyear (less specific)
         if pattern.get("noyear", False):
             score -= 5
@@ -866,7 +1329,76 @@ class DateParser:
         
         return score
 
-    def match(self, text, noprefix=False, noyear=True, nocharsetfilter=False, noseparatorfilter=False, noyearformatfilter=False, nolanguagefilter=False):
+    def _length_priority(self, pattern, n):
+        """Part of the priority score that depends on text length: boost if length is exact match
+        (more likely to be correct)"""
+        length_min = pattern.get("length", {}).get("min", 0)
+        length_max = pattern.get("length", {}).get("max", 0)
+        if length_min <= n <= length_max:
+            if n == length_min or n == length_max:
+                return 10
+            return 5
+        return 0
+
+    def _priority_buckets(self, separator, n):
+        """Returns candidate masks grouped by priority score, from the highest score to the lowest.
+
+        Walking buckets in order and patterns of each bucket in id order gives the same order
+        as sorting candidates by priority with ties kept in self.patterns order.
+        Buckets are computed once per (separator kind, text length).
+        """
+        key = (separator, n)
+        buckets = self._priority_bucket_cache.get(key)
+        if buckets is not None:
+            return buckets
+        # Length boost: +10 if n is one of length bounds, +5 if inside them
+        exact = self._min_length_masks.get(n, 0) | self._max_length_masks.get(n, 0)
+        above_min = 0
+        for length, mask in self._min_length_masks.items():
+            if length <= n:
+                above_min |= mask
+        below_max = 0
+        for length, mask in self._max_length_masks.items():
+            if length >= n:
+                below_max |= mask
+        in_range = above_min & below_max
+        boosts = ((10, exact), (5, in_range & ~exact), (0, ~in_range))
+        by_score = {}
+        for score, static_mask in self._static_priority_masks[separator]:
+            for boost, boost_mask in boosts:
+                mask = static_mask & boost_mask
+                if mask:
+                    by_score[score + boost] = by_score.get(score + boost, 0) | mask
+        buckets = tuple(by_score[score] for score in sorted(by_score, reverse=True))
+        self._priority_bucket_cache[key] = buckets
+        return buckets
+
+    def _ordered_candidates(self, mask, text, n):
+        """Yields patterns of the filtered mask in priority order (most likely patterns first).
+
+        With split_time or prefix_match yields their variants, in the same order as generated
+        ":time_*" and ":t_right" patterns would be.
+        """
+        if self._variant_masks is not None:
+            variant_masks = self._variant_masks
+            candidate_mask = 0
+            while mask:
+                low = mask & -mask
+                candidate_mask |= variant_masks[low.bit_length() - 1]
+                mask ^= low
+        else:
+            candidate_mask = mask
+        candidates = self._candidates
+        for bucket in self._priority_buckets(priority_separator(text), n):
+            m = candidate_mask & bucket
+            while m:
+                low = m & -m
+                yield candidates[low.bit_length() - 1]
+                m ^= low
+
+    def match(self, text, noprefix=False, noyear=True, nocharsetfilter=False,
+              noseparatorfilter=False, noyearformatfilter=False, nolanguagefilter=False,
+              profile=None):
         """Matches date/datetime string against date patterns and returns pattern and parsed date if matched.
         It's not indeded for common usage, since if successful it returns date as array of numbers and pattern
         that matched this date
@@ -892,58 +1424,244 @@ class DateParser:
         :param nolanguagefilter:
             If set True than doesn't use language based pattern filtering
         :type nolanguagefilter: bool
+        :param profile:
+            :class:`TextProfile` of the text if caller already has it, built from text otherwise
+        :type profile: :class:`TextProfile`
 
 
         :return: Returns dicts with `values` as array of representing parsed date and 'pattern' with info about matched pattern if successful, else returns None
+            `span` is (start, end) tuple of text positions consumed by the pattern. Patterns
+            accepting text after the date (":t_right") consume the rest of the line, so only with
+            prefix_match=True text[end:] is the text after the date
         :rtype: :class:`dict`."""
-        n = len(text)
-        
+        result_cache = self._result_cache
+        if result_cache is None or self.cachedpats is not None:
+            return self._match(text, noprefix, noyear, nocharsetfilter, noseparatorfilter,
+                               noyearformatfilter, nolanguagefilter, profile)
+        if profile is not None and profile.text != text:
+            raise ValueError("Text profile was built for another text")
+        key = ("match", text, noprefix, noyear, nocharsetfilter, noseparatorfilter,
+               noyearformatfilter, nolanguagefilter)
+        res = result_cache.get(key)
+        if res is MISSING:
+            res = self._match(text, noprefix, noyear, nocharsetfilter, noseparatorfilter,
+                              noyearformatfilter, nolanguagefilter, profile)
+            result_cache.put(key, res)
+        return res
+
+    def _match(self, text, noprefix=False, noyear=True, nocharsetfilter=False,
+               noseparatorfilter=False, noyearformatfilter=False, nolanguagefilter=False,
+               profile=None, use_caches=True):
+        """Matches text against patterns without result cache, see :meth:`match`
+
+        :param use_caches: If False, negative, shape and filter caches are neither used nor updated
+        :type use_caches: bool
+        """
+        if profile is not None and profile.text != text:
+            raise ValueError("Text profile was built for another text")
+        # Caches are bypassed during sessions
+        use_caches = use_caches and self.cachedpats is None
+        # Negative cache: texts no pattern matched with the same flags are rejected before filtering
+        negative_cache = self._negative_cache if use_caches else None
+        if negative_cache is not None:
+            negative_key = "%d%d%d%d%d%d:%s" % (noprefix, noyear, nocharsetfilter,
+                                                noseparatorfilter, noyearformatfilter,
+                                                nolanguagefilter, text)
+            if negative_key in negative_cache:
+                return None
+        else:
+            negative_key = None
+        if profile is None:
+            profile = TextProfile(text, self._detector)
+        n = profile.length
+        # With split_time or prefix_match date part matches are shared between variants of a pattern
+        date_matches = {} if self.split_time or self.prefix_match else None
+
+        # Shape cache: shape fixes every feature filters and priority order depend on except the
+        # confident language and prefix basekeys, so texts with the same key get the same ordered
+        # candidates. Replaying candidates tried up to the last match gives the result of the full
+        # walk, which continues after them if none of them matches.
+        shape_cache = self._shape_cache if use_caches else None
+        if shape_cache is not None:
+            long_text = n > 5
+            languages = profile.languages if long_text and not nolanguagefilter else None
+            shape_key = (shape_signature(text),
+                         languages[0] if languages and len(languages) == 1 else None,
+                         profile.prefix_basekeys if long_text and not noprefix else None,
+                         noprefix, noyear, nocharsetfilter, noseparatorfilter, noyearformatfilter,
+                         nolanguagefilter)
+            tried = shape_cache.get(shape_key)
+            if tried is not None:
+                for p in tried:
+                    res = self._try_pattern(p, text, n, noyear, date_matches)
+                    if res is not None:
+                        shape_cache.record(True)
+                        return res
+            shape_cache.record(False)
+        else:
+            shape_key = None
+            tried = None
+
         # Use hierarchical filtering to get candidate patterns
-        pats = self._filter_patterns_hierarchical(text, n, noprefix=noprefix, noyear=noyear,
-                                                   nocharsetfilter=nocharsetfilter, 
-                                                   noseparatorfilter=noseparatorfilter,
-                                                   noyearformatfilter=noyearformatfilter,
-                                                   nolanguagefilter=nolanguagefilter)
-        if pats is None:
+        if self._filter_cache is not None and use_caches:
+            # Filter cache: texts with the same features get the same mask and, per priority
+            # separator, the same ordered candidates
+            mask, ordered = self._filter_entry(n, profile, noprefix, nocharsetfilter,
+                                               noseparatorfilter, noyearformatfilter,
+                                               nolanguagefilter)
+        else:
+            mask = self._apply_filters(n, profile, noprefix, nocharsetfilter, noseparatorfilter,
+                                       noyearformatfilter, nolanguagefilter)
+            ordered = None
+        if not mask:
+            if negative_key is not None:
+                negative_cache.add(negative_key)
             return None
         
-        # Sort patterns by priority (try most likely patterns first)
-        pats = sorted(pats, key=lambda p: self._calculate_pattern_priority(p, text), reverse=True)
-        
-        # Note: basekey filtering is already done in _filter_patterns_hierarchical (Level 6),
+        # Walk candidates in precomputed priority order (try most likely patterns first)
+        # Note: basekey filtering is already done in _filter_mask (Level 6),
         # so we don't need to duplicate it here. The patterns returned already have prefix filtering applied.
-        for p in pats:
-            # Cache dictionary lookups
-            length_min = p["length"]["min"]
-            length_max = p["length"]["max"]
-            if n < length_min or n > length_max:
-                continue
-            if not noyear:
-                p_noyear = p.get("noyear", False)
-                if p_noyear:
-                    continue
-            match_data = next(p["pattern"].scanString(text, maxMatches=1), None)
-            if match_data is None:
-                continue
-            r, start, _ = match_data
-            if start != 0:
-                continue
-            # Do sanity check - cache dict lookup and use dict.get() for efficiency
-            d = r.asDict()
-            month_val = d.get("month")
-            if month_val is not None:
-                val = int(month_val)
-                if val > 12 or val < 1:
-                    continue
-            day_val = d.get("day")
-            if day_val is not None:
-                val = int(day_val)
-                if val > 31 or val < 1:
-                    continue
-            return {"values": r, "pattern": p}
+        if ordered is not None:
+            separator = priority_separator(text)
+            candidates = ordered.get(separator)
+            if candidates is None:
+                candidates = ordered[separator] = tuple(self._ordered_candidates(mask, text, n))
+        else:
+            candidates = self._ordered_candidates(mask, text, n)
+        if tried:
+            # the same candidates in the same order were replayed from shape cache
+            candidates = itertools.islice(candidates, len(tried), None)
+        walked = list(tried or ()) if shape_key is not None else None
+        for p in candidates:
+            if walked is not None:
+                walked.append(p)
+            res = self._try_pattern(p, text, n, noyear, date_matches)
+            if res is not None:
+                if walked is not None:
+                    shape_cache.put(shape_key, tuple(walked))
+                return res
+        if negative_key is not None:
+            negative_cache.add(negative_key)
         return None
 
-    def parse(self, text, noprefix=False, nocharsetfilter=False, noseparatorfilter=False, noyearformatfilter=False, nolanguagefilter=False):
+    def _try_pattern(self, p, text, n, noyear=True, date_matches=None):
+        """Matches text against single pattern and does sanity check of parsed values.
+
+        Split_time variants match the date part and then their time suffix on the rest of text,
+        that is the same as matching generated ":time_*" pattern, since date part is never
+        re-matched differently when suffix fails.
+
+        :param date_matches: dict shared by variants matched against the same text,
+                         date part is matched only once per pattern
+        :type date_matches: dict|None
+
+        :return: match result as in :meth:`match` or None
+        :rtype: dict|None
+        """
+        if n < p.min_length or n > p.max_length:
+            return None
+        if not noyear and p.noyear:
+            return None
+        time_pattern = p.time_pattern
+        pattern = p.pattern
+        # engines expand tabs as pyparsing does, positions are mapped back to the given text
+        expand = time_pattern is not None or not pattern.keepTabs
+        original = text if '\t' in text and expand else None
+        if original is not None and time_pattern is not None:
+            # positions of both stages should refer to the same text
+            text = text.expandtabs()
+        prefix = p.prefix
+        if date_matches is None:
+            match_data = self._match_expression(pattern, text, anchored=prefix)
+        else:
+            key = (id(pattern), prefix)
+            try:
+                match_data = date_matches[key]
+            except KeyError:
+                match_data = self._match_expression(pattern, text, anchored=prefix)
+                date_matches[key] = match_data
+        if match_data is None:
+            return None
+        r, start, end = match_data
+        if time_pattern is not None:
+            time_data = self._match_expression(time_pattern, text, end)
+            if time_data is None:
+                return None
+            if isinstance(r, dict):
+                r = {**r, **time_data[0]}
+            else:
+                r = r + time_data[0]
+            end = time_data[2]
+        if original is not None:
+            start = _unexpanded_offset(original, start)
+            end = _unexpanded_offset(original, end)
+        return self._check_values(r, p, start, end)
+
+    def _match_expression(self, expr, text, loc=0, anchored=False):
+        """Matches pyparsing expression at loc of text using selected engine.
+
+        :param anchored: match after leading whitespace even with ENGINE_SCAN
+        :type anchored: bool
+
+        :return: tuple of (values, start, end) or None
+        :rtype: tuple|None
+        """
+        if self.engine == ENGINE_RE:
+            compiled = self._get_regex_pattern(expr)
+            if compiled is not None:
+                return compiled.match(text, loc)
+            return anchored_parse(expr, text, loc)
+        if self.engine == ENGINE_ANCHORED or loc or anchored:
+            return anchored_parse(expr, text, loc)
+        match_data = next(expr.scanString(text, maxMatches=1), None)
+        if match_data is None or match_data[1] != 0:
+            return None
+        return match_data
+
+    def _check_values(self, r, p, start, end):
+        """Does sanity check of parsed values.
+
+        :return: match result as in :meth:`match` or None
+        :rtype: dict|None
+        """
+        # Cache dict lookup and use dict.get() for efficiency
+        d = r if isinstance(r, dict) else r.asDict()
+        month_val = d.get("month")
+        if month_val is not None:
+            val = int(month_val)
+            if val > 12 or val < 1:
+                return None
+        day_val = d.get("day")
+        if day_val is not None:
+            val = int(day_val)
+            if val > 31 or val < 1:
+                return None
+        if d is r:
+            # re engine values, returned as pyparsing results like with the other engines
+            r = to_parse_results(r)
+        return {"values": r, "pattern": p, "span": (start, end)}
+
+    def _get_regex_pattern(self, expr):
+        """Returns pyparsing expression compiled into native re expression, compiled on first use.
+
+        :param expr: pyparsing expression
+        :return: compiled pattern or None if expression can't be compiled
+        :rtype: :class:`qddate.re_engine.RegexPattern`|None
+        """
+        key = id(expr)
+        try:
+            return self._regex_patterns[key]
+        except KeyError:
+            pass
+        try:
+            compiled = compile_expression(expr)
+        except UnsupportedExpression:
+            compiled = None
+        self._regex_patterns[key] = compiled
+        return compiled
+
+    def parse(self, text, noprefix=False, nocharsetfilter=False, noseparatorfilter=False,
+              noyearformatfilter=False, nolanguagefilter=False, profile=None):
         """Parse date and time from given date string.
 
         :param text:
@@ -964,19 +1682,60 @@ class DateParser:
         :param nolanguagefilter:
             If set True than doesn't use language based pattern filtering
         :type nolanguagefilter: bool
+        :param profile:
+            :class:`TextProfile` of the text if caller already has it
+        :type profile: :class:`TextProfile`
 
 
         :return: Returns :class:`datetime <datetime.datetime>` representing parsed date if successful, else returns None
         :rtype: :class:`datetime <datetime.datetime>`."""
+        result_cache = self._result_cache
+        shared_cache = self._shared_cache
+        if (result_cache is not None or shared_cache is not None) and self.cachedpats is None:
+            if profile is not None and profile.text != text:
+                raise ValueError("Text profile was built for another text")
+            key = ("parse", text, noprefix, nocharsetfilter, noseparatorfilter, noyearformatfilter,
+                   nolanguagefilter)
+            year = self._get_cached_year()
+            dt = result_cache.get(key, year) if result_cache is not None else MISSING
+            if dt is not MISSING:
+                return dt
+            if shared_cache is not None:
+                shared_key = "%s%d%d%d%d%d:%s" % (self._shared_prefix, noprefix, nocharsetfilter,
+                                                  noseparatorfilter, noyearformatfilter,
+                                                  nolanguagefilter, text)
+                dt = shared_cache.get(shared_key, year)
+                if dt is not MISSING:
+                    if result_cache is not None:
+                        # shared entries don't tell if they depend on the year, they expire with it
+                        result_cache.put(key, dt, year)
+                    return dt
+            res = self._match(text, noprefix=noprefix, nocharsetfilter=nocharsetfilter,
+                              noseparatorfilter=noseparatorfilter,
+                              noyearformatfilter=noyearformatfilter,
+                              nolanguagefilter=nolanguagefilter, profile=profile)
+            dt = self._to_datetime(res)
+            # dates of patterns without year (and their validity, like February 29) depend on
+            # the year
+            noyear = bool(res and res["pattern"].noyear)
+            if result_cache is not None:
+                result_cache.put(key, dt, year if noyear else None)
+            if shared_cache is not None and not (noyear and dt is None):
+                shared_cache.put(shared_key, dt, noyear)
+            return dt
 
         res = self.match(text, noprefix=noprefix, nocharsetfilter=nocharsetfilter, 
                         noseparatorfilter=noseparatorfilter, noyearformatfilter=noyearformatfilter,
-                        nolanguagefilter=nolanguagefilter)
+                        nolanguagefilter=nolanguagefilter, profile=profile)
+        return self._to_datetime(res)
+
+    def _to_datetime(self, res):
+        """Converts :meth:`match` result to datetime, None if there is no match or invalid date"""
         if res:
             r = res["values"]
             p = res["pattern"]
             d = {"month": 0, "day": 0, "year": 0}
-            if p.get("noyear", False):
+            if p.noyear:
                 d["year"] = self._get_cached_year()
             for k, v in r.items():
                 d[k] = int(v)
@@ -988,6 +1747,147 @@ class DateParser:
                 return None
         return None
 
+    def cache_stats(self):
+        """Returns counters of enabled caches.
+
+        :return: dict with cache name as key and dict of counters as value, e.g.
+            {"shape": {"size": 12, "maxsize": 1024, "hits": 990, "misses": 10, "hit_rate": 0.99}}
+        :rtype: dict
+        """
+        stats = {}
+        if self._shape_cache is not None:
+            stats["shape"] = self._shape_cache.stats()
+        if self._result_cache is not None:
+            stats["result"] = self._result_cache.stats()
+        if self._negative_cache is not None:
+            stats["negative"] = self._negative_cache.stats()
+        if self._shared_cache is not None:
+            stats["shared"] = self._shared_cache.stats()
+        if self._filter_cache is not None:
+            stats["filter"] = self._filter_cache.stats()
+        return stats
+
+    def _cache_hash(self):
+        """Returns digest of patterns and options cached results depend on,
+        see :func:`qddate.persist.pattern_set_hash`"""
+        return pattern_set_hash([p.key for p in self._candidates], engine=self.engine,
+                                split_time=self.split_time, prefix_match=self.prefix_match,
+                                casefold=self.casefold)
+
+    def _load_caches(self):
+        """Loads result cache and session keys saved by :meth:`save_caches` to cache_file"""
+        from . import __version__
+        caches = load_caches(self._cache_file, __version__, self._cache_hash())
+        try:
+            # entries are JSON: keys are lists and dates are ISO strings
+            results = [(tuple(key), _from_isoformat(result), year)
+                       for key, (result, year) in caches.get("result", ())]
+            sessions = [frozenset(session_keys) for _, session_keys in caches.get("session", ())]
+        except (ValueError, TypeError):
+            # entries of unexpected types, cache file is only a warm start
+            return
+        if self._result_cache is not None:
+            for key, result, year in results:
+                self._result_cache.put(key, result, year)
+        for session_keys in sessions:
+            self.loaded_session_keys = session_keys
+
+    def save_caches(self):
+        """Saves result cache and session keys to cache_file, they are loaded by next parsers
+        of the same qddate version and pattern set created with this cache_file.
+
+        Only parse() results of result cache are saved, match() results hold pyparsing results.
+        Entries are saved as JSON with dates as ISO strings. Entries saved before by parsers
+        of the same version and pattern set are replaced.
+
+        :return: number of saved entries
+        :rtype: int
+        """
+        if self._cache_file is None:
+            raise ValueError("save_caches() needs parser created with cache_file")
+        from . import __version__
+        caches = {}
+        if self._result_cache is not None:
+            caches["result"] = [(key, (result.isoformat() if result is not None else None, year))
+                                for key, result, year in self._result_cache.items()
+                                if key[0] == "parse"]
+        if self._session_keys is not None:
+            caches["session"] = [(None, sorted(self._session_keys))]
+        return save_caches(self._cache_file, __version__, self._cache_hash(), caches)
+
+    def memory_report(self, top=10):
+        """Returns estimation of memory retained by parser structures, see :mod:`qddate.memory`.
+
+        Sections are measured in order and objects shared between sections are counted in the first
+        one only: grammars of patterns and time suffixes, pattern records, each index, filter masks,
+        compiled re expressions, language detector, session, shape, result, negative and filter
+        caches and pyparsing packrat cache.
+        Patterns, indexes and detector are shared by parsers of the same configuration, packrat
+        cache is shared by all parsers of the process.
+
+        :param top: number of patterns with the largest grammars to list, 0 to skip measuring
+            grammars per pattern and per language
+        :type top: int
+        :return: dict with "total" bytes, "sections" dict of section name -> bytes, "shared" flag
+            of state shared with other parsers, "top_patterns" list of dicts with "key", "language"
+            and "bytes" of pattern grammar including its variants and "languages" dict of language
+            -> bytes of grammars of its patterns ("none" for numeric patterns)
+        :rtype: dict
+        """
+        candidates = self._candidates if self._candidates is not self.patterns else ()
+        grammars = ([p.pattern for p in self.patterns] + [p.time_pattern for p in candidates] +
+                    [p.pattern for p in candidates] +
+                    [suffix for _, suffix, _, _, _ in TIME_SUFFIXES])
+        sections = (
+            ("grammars", grammars),
+            ("patterns", [self.patterns, self._candidates]),
+            ("_length_masks", self._length_masks),
+            ("_patterns_by_separator", self._patterns_by_separator),
+            ("_patterns_by_year_format", self._patterns_by_year_format),
+            ("_patterns_by_language", self._patterns_by_language),
+            ("bitset_masks", [self._basekey_masks, self._charset_groups, self._fixed_mask,
+                              self._language_masks, self._year_format_masks, self._variant_masks,
+                              self._min_length_masks, self._max_length_masks,
+                              self._static_priority_masks, self._case_keys]),
+            ("lazy_masks", [self._charset_masks, self._separator_basekeys, self._separator_masks,
+                            self._prefix_masks, self._priority_bucket_cache]),
+            ("regex_patterns", self._regex_patterns),
+            ("language_detector", self._detector),
+            ("session", [self.cachedpats, self._session_mask]),
+            ("shape_cache", self._shape_cache),
+            ("result_cache", self._result_cache),
+            ("negative_cache", self._negative_cache),
+            ("filter_cache", self._filter_cache),
+            ("packrat_cache", packrat_cache_contents(ParserElement.packrat_cache)),
+        )
+        seen = set()
+        sizes = {name: deep_sizeof(value, seen) for name, value in sections}
+        report = {
+            "total": sum(sizes.values()),
+            "sections": sizes,
+            "shared": any(state["patterns"] is self.patterns for state in _SHARED_STATES.values()),
+            "top_patterns": [],
+            "languages": {},
+        }
+        if top > 0:
+            pattern_sizes = []
+            language_seen = {}
+            # lists are kept alive until all are measured, so their ids in seen sets stay unique
+            pattern_exprs = []
+            for p in self.patterns:
+                variants = p.variants + p.right_variants
+                pattern_exprs.append((p, [p.pattern] + [v.pattern for v in variants] +
+                                      [v.time_pattern for v in variants]))
+            for p, exprs in pattern_exprs:
+                language = p.language or "none"
+                pattern_sizes.append({"key": p.key, "language": language,
+                                      "bytes": deep_sizeof(exprs)})
+                language_size = deep_sizeof(exprs, language_seen.setdefault(language, set()))
+                report["languages"][language] = report["languages"].get(language, 0) + language_size
+            pattern_sizes.sort(key=lambda item: item["bytes"], reverse=True)
+            report["top_patterns"] = pattern_sizes[:top]
+        return report
+
     def _get_cached_year(self):
         """Return cached current year, refreshing periodically."""
         now = time.monotonic()
@@ -0,0 +1,254 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Translation of pyparsing date patterns into native re expressions
+__author__ = "Ivan Begtin (ivan@begtin.tech)"
+__license__ = "BSD"
+
+import re
+import sys
+
+from pyparsing import (And, MatchFirst, Or, Opt, Suppress, Literal, CaselessLiteral, Empty, Word,
+                       Regex, White, LineStart, ParseBaseException, ParseResults)
+
+# Python 3.11+ has atomic groups and possessive quantifiers, older versions emulate them
+# with a lookahead and a backreference to it.
+_NATIVE_ATOMIC = sys.version_info >= (3, 11)
+
+_MAX_INT = sys.maxsize
+
+# re inline flag letters, used to scope pyparsing Regex flags to their own group
+_INLINE_FLAGS = ((re.IGNORECASE, 'i'), (re.MULTILINE, 'm'), (re.DOTALL, 's'), (re.VERBOSE, 'x'))
+_ALLOWED_FLAGS = re.IGNORECASE | re.MULTILINE | re.DOTALL | re.VERBOSE | re.UNICODE
+
+# Token types which value is the matched text itself
+_PLAIN_TOKENS = (Word, Literal, White)
+
+# Maximum number of remembered matched text -> value conversions per named field
+_VALUE_CACHE_SIZE = 256
+
+
+class UnsupportedExpression(ValueError):
+    """Raised when pyparsing expression can't be translated into re"""
+
+
+class _TokenValue:
+    """Converts matched text of named element into the value pyparsing returns for it.
+
+    Element is parsed by pyparsing itself, so parse actions (like month name -> month number)
+    give exactly the same result. Values are remembered, month and weekday names repeat a lot.
+    """
+
+    def __init__(self, expr, name):
+        self.expr = expr
+        self.name = name
+        self._values = {}
+
+    def __call__(self, s):
+        value = self._values.get(s)
+        if value is None:
+            value = self.expr.parseString(s, parseAll=True)[self.name]
+            if len(self._values) < _VALUE_CACHE_SIZE:
+                self._values[s] = value
+        return value
+
+
+class RegexPattern:
+    """Pattern compiled to single re expression with the same results as pyparsing pattern"""
+
+    def __init__(self, regex, fields, start_group=1, keep_tabs=False):
+        """
+        :param regex: compiled re expression
+        :param start_group: number of the group spanning the matched date without leading whitespace
+        :type start_group: int
+        :param fields: tuple of (group number, result name, converter or None)
+        :type fields: tuple
+        :param keep_tabs: don't expand tabs before matching, as pyparsing keepTabs
+        :type keep_tabs: bool
+        """
+        self.regex = regex
+        self.fields = fields
+        self.start_group = start_group
+        self.keep_tabs = keep_tabs
+        self._match = regex.match
+
+    def match(self, text, pos=0):
+        """Matches text at its start or at pos (after leading whitespace).
+
+        :param text: Input string
+        :type text: str
+        :param pos: position in text to match at
+        :type pos: int
+        :return: tuple of (values dict, start, end) or None
+        :rtype: tuple|None
+        """
+        if not self.keep_tabs and '\t' in text:
+            text = text.expandtabs()
+        m = self._match(text, pos)
+        if m is None:
+            return None
+        values = {}
+        for group, name, convert in self.fields:
+            s = m.group(group)
+            if s is None:
+                continue
+            if convert is not None:
+                try:
+                    s = convert(s)
+                except ParseBaseException:
+                    # parse action rejected the token, so pyparsing pattern fails too
+                    return None
+            values[name] = s
+        return values, m.start(self.start_group), m.end()
+
+
+def to_parse_results(values):
+    """Converts values dict returned by :meth:`RegexPattern.match` into pyparsing results.
+
+    Results have the named values in both list and names, as pyparsing results of date patterns
+    with unnamed tokens suppressed, so asDict(), attribute access and addition work the same.
+
+    :param values: dict of result name -> value
+    :type values: dict
+    :rtype: pyparsing.ParseResults
+    """
+    results = ParseResults(list(values.values()))
+    for name, value in values.items():
+        results[name] = value
+    return results
+
+
+class _Compiler:
+    """Walks pyparsing expression tree and emits equivalent re source.
+
+    pyparsing is a PEG parser: every element matches greedily and is never backtracked into,
+    so each element becomes an atomic group. Whitespace is skipped before each element
+    the same way as pyparsing preParse does.
+    """
+
+    def __init__(self):
+        self.groups = 0
+        self.fields = []
+
+    def _new_group(self):
+        self.groups += 1
+        return self.groups
+
+    def _atomic(self, build):
+        """Wraps source returned by build() into atomic group"""
+        if _NATIVE_ATOMIC:
+            return '(?>' + build() + ')'
+        group = self._new_group()
+        return '(?=(' + build() + '))\\' + str(group)
+
+    def _whitespace(self, expr):
+        if not expr.skipWhitespace or not expr.whiteChars or isinstance(expr, LineStart):
+            return ''
+        chars = '[' + ''.join(re.escape(c) for c in sorted(expr.whiteChars)) + ']'
+        if _NATIVE_ATOMIC:
+            return chars + '*+'
+        return self._atomic(lambda: chars + '*')
+
+    def element(self, expr, preparse=True, suppressed=False):
+        """Returns re source for expression with leading whitespace skip if preparse is set"""
+        ws = self._whitespace(expr) if preparse else ''
+        name = expr.resultsName
+        if not name or suppressed:
+            return ws + self._body(expr, suppressed)
+        group = self._new_group()
+        body = self._body(expr, suppressed)
+        plain = isinstance(expr, _PLAIN_TOKENS) and not isinstance(expr, CaselessLiteral)
+        if isinstance(expr, Regex):
+            plain = True
+        convert = None if plain and not expr.parseAction else _TokenValue(expr, name)
+        self.fields.append((group, name, convert))
+        return ws + '(' + body + ')'
+
+    def _body(self, expr, suppressed):
+        if isinstance(expr, And):
+            exprs = expr.exprs
+            parts = [self.element(exprs[0], preparse=False, suppressed=suppressed)]
+            parts.extend(self.element(e, suppressed=suppressed) for e in exprs[1:])
+            return ''.join(parts)
+        if isinstance(expr, MatchFirst):
+            return self._atomic(lambda: '|'.join(self.element(e, suppressed=suppressed)
+                                                 for e in expr.exprs))
+        if isinstance(expr, Or):
+            return self._longest_literal(expr, suppressed)
+        if isinstance(expr, Opt):
+            if expr.defaultValue is not Opt._Opt__optionalNotMatched:
+                raise UnsupportedExpression(f"Optional with default value: {expr}")
+            return self._atomic(lambda: '(?:' + self.element(expr.expr, preparse=False,
+                                                             suppressed=suppressed) + ')?')
+        if isinstance(expr, Suppress):
+            return self.element(expr.expr, preparse=False, suppressed=True)
+        if isinstance(expr, CaselessLiteral):
+            return '(?i:' + re.escape(expr.returnString) + ')'
+        if isinstance(expr, Empty):
+            raise UnsupportedExpression(f"Unsupported element: {type(expr).__name__}")
+        if isinstance(expr, Literal):
+            return re.escape(expr.match)
+        if isinstance(expr, Word):
+            if getattr(expr, 're', None) is None:
+                raise UnsupportedExpression(f"Word without regex: {expr}")
+            return self._atomic(lambda: expr.re.pattern)
+        if isinstance(expr, Regex):
+            return self._regex(expr)
+        if isinstance(expr, White):
+            chars = '[' + ''.join(re.escape(c) for c in sorted(expr.matchWhite)) + ']'
+            upper = '' if expr.maxLen == _MAX_INT else str(expr.maxLen)
+            return self._atomic(lambda: chars + '{' + str(expr.minLen) + ',' + upper + '}')
+        if isinstance(expr, LineStart):
+            return '(?:^|(?<=\\n))'
+        raise UnsupportedExpression(f"Unsupported element: {type(expr).__name__}")
+
+    def _regex(self, expr):
+        if expr.asGroupList or expr.asMatch or expr.flags & ~_ALLOWED_FLAGS:
+            raise UnsupportedExpression(f"Unsupported Regex options: {expr}")
+        try:
+            groups = re.compile(expr.pattern, expr.flags).groups
+        except re.error:
+            raise UnsupportedExpression(f"Invalid Regex: {expr}")
+        if groups:
+            # groups would shift numbering and named groups become pyparsing results
+            raise UnsupportedExpression(f"Regex with groups: {expr}")
+        letters = ''.join(letter for flag, letter in _INLINE_FLAGS if expr.flags & flag)
+        source = '(?' + letters + ':' + expr.pattern + ')'
+        return self._atomic(lambda: source)
+
+    def _longest_literal(self, expr, suppressed):
+        """Or picks the longest matching alternative, supported only for literal alternatives"""
+        alternatives = []
+        stack = list(expr.exprs)
+        while stack:
+            e = stack.pop(0)
+            if isinstance(e, Or) and not e.resultsName and not e.parseAction:
+                stack[:0] = e.exprs
+            elif isinstance(e, Literal) and not isinstance(e, Empty) and not e.parseAction:
+                alternatives.append(e)
+            else:
+                raise UnsupportedExpression(f"Or with non literal alternatives: {expr}")
+        # sorted() is stable, so equal length alternatives keep their order as in Or
+        alternatives.sort(key=lambda e: len(e.match), reverse=True)
+        return self._atomic(lambda: '|'.join(self.element(e, suppressed=suppressed)
+                                             for e in alternatives))
+
+
+def compile_expression(expr):
+    """Compiles pyparsing date pattern into :class:`RegexPattern`.
+
+    :param expr: pyparsing expression
+    :return: compiled pattern
+    :rtype: RegexPattern
+    :raises UnsupportedExpression: if expression uses elements without re equivalent
+    """
+    if not expr.streamlined:
+        expr.streamline()
+    compiler = _Compiler()
+    ws = compiler._whitespace(expr)
+    start_group = compiler._new_group()
+    body = compiler.element(expr, preparse=False)
+    try:
+        regex = re.compile(ws + '(' + body + ')')
+    except re.error as e:
+        raise UnsupportedExpression(f"Can't compile {expr}: {e}")
+    return RegexPattern(regex, tuple(compiler.fields), start_group, keep_tabs=expr.keepTabs)
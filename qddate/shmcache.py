@@ -0,0 +1,212 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Parse results cache in shared memory, shared by processes of one machine
+__author__ = "Ivan Begtin (ivan@begtin.tech)"
+__license__ = "BSD"
+
+import datetime
+import hashlib
+import struct
+import sys
+import zlib
+from multiprocessing import shared_memory
+
+from .cache import MISSING
+
+_MAGIC = b"QDSC"
+# Version of table layout, bumped when header or slot layout changes
+SHM_FORMAT = 1
+
+# magic, format, number of slots, slot size
+_HEADER = struct.Struct("<4sIII")
+_HEADER_SIZE = 64
+# key hash, status, year, month, day, hour, minute, second, microsecond
+_ENTRY = struct.Struct("<QBHBBBBBI")
+# entry and crc32 of entry, padded to slot size
+_SLOT = struct.Struct("<%dsI" % _ENTRY.size)
+_SLOT_SIZE = 32
+
+_STATUS_NONE = 1      # text is not a date
+_STATUS_DATE = 2      # date, doesn't depend on current year
+_STATUS_NOYEAR = 3    # date parsed by pattern without year, valid only in its year
+
+_EMPTY_ENTRY = bytes(_ENTRY.size)
+_EMPTY = _ENTRY.unpack(_EMPTY_ENTRY)
+
+# Slots probed from the home slot of a key
+_PROBES = 8
+
+
+def _key_hash(key):
+    digest = hashlib.blake2b(key.encode("utf-8", "surrogatepass"), digest_size=8).digest()
+    value = int.from_bytes(digest, "little")
+    # 0 marks empty slot
+    return value or 1
+
+
+class SharedParseCache:
+    """Fixed-size open addressing table of parse results in shared memory.
+
+    Maps 64-bit blake2b hash of a key to a compact parse result: no date, or datetime fields
+    and whether the date depends on the current year. Each slot has a crc32 of its entry,
+    readers copy the slot without locks and treat torn or foreign entries as misses, writers
+    overwrite slots without locks, so concurrent writes to the same slot leave one of them or
+    an entry failing the check. Keys are looked up in the home slot of their hash and the next
+    _PROBES slots, when all of them are taken the home slot is overwritten.
+
+    Counters are per process. Table is created by one process (usually the master before creating
+    workers) and attached by name by the others, the creator should call :meth:`unlink` when
+    workers are done. Attached blocks are not tracked by the resource tracker, on Python < 3.13
+    this also drops tracking of the creator when they share a tracker.
+    """
+
+    def __init__(self, name=None, slots=65536, create=True):
+        """
+        :param name: shared memory block name, generated if None when creating
+        :type name: str|None
+        :param slots: number of slots of created table, 32 bytes each
+        :type slots: int
+        :param create: create new table if True, attach to existing table by name otherwise
+        :type create: bool
+        """
+        if create:
+            if slots <= 0:
+                raise ValueError(f"Number of slots should be positive, got {slots!r}")
+            size = _HEADER_SIZE + slots * _SLOT_SIZE
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+            self._shm.buf[:size] = bytes(size)
+            _HEADER.pack_into(self._shm.buf, 0, _MAGIC, SHM_FORMAT, slots, _SLOT_SIZE)
+        else:
+            if name is None:
+                raise ValueError("Name of shared parse cache to attach is required")
+            self._shm = _attach(name)
+            magic, shm_format, slots, slot_size = _HEADER.unpack_from(self._shm.buf, 0)
+            if magic != _MAGIC or shm_format != SHM_FORMAT or slot_size != _SLOT_SIZE:
+                self._shm.close()
+                raise ValueError(f"Shared memory block {name!r} is not a qddate parse cache "
+                                 f"of format {SHM_FORMAT}")
+        self.name = self._shm.name
+        self.slots = slots
+        self.created = create
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    @classmethod
+    def attach(cls, name):
+        """Attach to table created by another process
+
+        :param name: shared memory block name, :attr:`name` of created table
+        :type name: str
+        :rtype: SharedParseCache
+        """
+        return cls(name, create=False)
+
+    def _read(self, index):
+        offset = _HEADER_SIZE + index * _SLOT_SIZE
+        entry, crc = _SLOT.unpack(bytes(self._shm.buf[offset:offset + _SLOT.size]))
+        if zlib.crc32(entry) != crc:
+            # never written slot is all zeros, otherwise entry is being written
+            return _EMPTY if entry == _EMPTY_ENTRY and not crc else None
+        return _ENTRY.unpack(entry)
+
+    def get(self, key, year=None):
+        """Return cached parse result (datetime or None) for key or MISSING.
+
+        :param year: current year, dates of patterns without year parsed in another year are misses
+        :type year: int|None
+        """
+        key_hash = _key_hash(key)
+        slots = self.slots
+        for probe in range(_PROBES):
+            entry = self._read((key_hash + probe) % slots)
+            if entry is None:
+                continue
+            if entry[0] == 0:
+                break
+            if entry[0] != key_hash:
+                continue
+            status = entry[1]
+            if status == _STATUS_NONE:
+                self.hits += 1
+                return None
+            if status == _STATUS_NOYEAR and entry[2] != year:
+                break
+            self.hits += 1
+            return datetime.datetime(*entry[2:])
+        self.misses += 1
+        return MISSING
+
+    def put(self, key, result, noyear=False):
+        """Store parse result for key.
+
+        :param result: parsed date or None if text is not a date
+        :type result: datetime.datetime|None
+        :param noyear: date was parsed by pattern without year
+        :type noyear: bool
+        """
+        key_hash = _key_hash(key)
+        slots = self.slots
+        index = key_hash % slots
+        for probe in range(_PROBES):
+            entry = self._read((key_hash + probe) % slots)
+            if entry is not None and (entry[0] == 0 or entry[0] == key_hash):
+                index = (key_hash + probe) % slots
+                break
+        if result is None:
+            entry = _ENTRY.pack(key_hash, _STATUS_NONE, 0, 0, 0, 0, 0, 0, 0)
+        else:
+            status = _STATUS_NOYEAR if noyear else _STATUS_DATE
+            entry = _ENTRY.pack(key_hash, status, result.year, result.month, result.day,
+                                result.hour, result.minute, result.second, result.microsecond)
+        _SLOT.pack_into(self._shm.buf, _HEADER_SIZE + index * _SLOT_SIZE, entry, zlib.crc32(entry))
+        self.writes += 1
+
+    def __len__(self):
+        """Number of used slots, scans the whole table"""
+        buf = self._shm.buf
+        offsets = (_HEADER_SIZE + i * _SLOT_SIZE for i in range(self.slots))
+        return sum(1 for offset in offsets if buf[offset:offset + 8] != bytes(8))
+
+    def stats(self):
+        """Return counters of this process as dict"""
+        total = self.hits + self.misses
+        return {
+            "name": self.name,
+            "slots": self.slots,
+            "bytes": _HEADER_SIZE + self.slots * _SLOT_SIZE,
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def close(self):
+        """Detach from shared memory, table stays available to other processes"""
+        self._shm.close()
+
+    def unlink(self):
+        """Remove shared memory block, called by the creator once no process needs the table"""
+        if sys.version_info < (3, 13):
+            # attachers sharing the resource tracker of this process unregistered the block,
+            # SharedMemory.unlink() unregisters it once more
+            from multiprocessing import resource_tracker
+            resource_tracker.register(self._shm._name, "shared_memory")
+        self._shm.unlink()
+
+    def __reduce__(self):
+        """Pickled table is attached by name"""
+        return SharedParseCache.attach, (self.name,)
+
+
+def _attach(name):
+    """Attaches to existing shared memory block without registering it for removal at exit of
+    this process"""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    # Older versions register attached blocks in resource tracker, which removes them when this
+    # process exits
+    from multiprocessing import resource_tracker
+    shm = shared_memory.SharedMemory(name=name)
+    resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# On-disk snapshots of generated DateParser patterns and indexes
+__author__ = "Ivan Begtin (ivan@begtin.tech)"
+__license__ = "BSD"
+
+import hashlib
+import os
+import pickle
+import stat
+import sys
+import tempfile
+
+import pyparsing
+
+# Version of snapshot contents, bumped when DateParser state layout changes
+SNAPSHOT_FORMAT = 3
+
+# pyparsing expressions are deeply nested, pickling them needs more than default recursion limit
+_RECURSION_LIMIT = 20000
+
+# Sentinel objects pyparsing compares by identity,
+# saved by name so unpickled expressions get the same objects
+_SINGLETONS = {
+    "optional_not_matched": getattr(pyparsing.Opt, "_Opt__optionalNotMatched", None),
+}
+_SINGLETON_NAMES = {id(obj): name for name, obj in _SINGLETONS.items() if obj is not None}
+
+
+class _Pickler(pickle.Pickler):
+    """Saves shared objects as references to their position in the shared list"""
+
+    def __init__(self, file, shared):
+        super().__init__(file, pickle.HIGHEST_PROTOCOL)
+        self._shared_ids = {id(obj): i for i, obj in enumerate(shared)}
+
+    def persistent_id(self, obj):
+        name = _SINGLETON_NAMES.get(id(obj))
+        if name is not None:
+            return name
+        return self._shared_ids.get(id(obj))
+
+
+class _Unpickler(pickle.Unpickler):
+    def __init__(self, file, shared):
+        super().__init__(file)
+        self._shared = shared
+
+    def persistent_load(self, pid):
+        if isinstance(pid, int):
+            return self._shared[pid]
+        if _SINGLETONS.get(pid) is None:
+            raise pickle.UnpicklingError(f"Unknown persistent id: {pid!r}")
+        return _SINGLETONS[pid]
+
+
+def snapshot_key(languages=None, base_only=False, pattern_keys=(), **options):
+    """Returns key identifying generated patterns and indexes of DateParser configuration.
+
+    :param languages: Language codes of parser, None for all languages
+    :type languages: str|list|None
+    :param base_only: base_only argument of DateParser
+    :type base_only: bool
+    :param pattern_keys: keys of patterns generation starts from, so edited pattern modules
+        don't load a stale snapshot
+    :type pattern_keys: list|tuple
+    :param options: other DateParser arguments changing generated patterns, like split_time
+    :return: tuple of (format, qddate version, languages, base_only, pyparsing version, options,
+        digest of pattern keys)
+    :rtype: tuple
+    """
+    from . import __version__
+    if isinstance(languages, str):
+        languages = [languages]
+    languages = tuple(sorted(languages)) if languages else None
+    keys_digest = hashlib.sha1("\n".join(pattern_keys).encode("utf-8")).hexdigest()
+    return (SNAPSHOT_FORMAT, __version__, languages, bool(base_only), pyparsing.__version__,
+            tuple(sorted(options.items())), keys_digest)
+
+
+def snapshot_path(directory, key):
+    """Returns path of snapshot file for key in directory"""
+    digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(directory, f"qddate-{key[1]}-{digest}.snapshot")
+
+
+def _trusted(st):
+    """Returns True if stat result is of a file or directory only the current user can write to"""
+    getuid = getattr(os, "getuid", None)
+    if getuid is None:
+        # no POSIX owners and modes, the directory is trusted by the caller
+        return True
+    return st.st_uid == getuid() and not st.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+
+def load_snapshot(directory, key, shared=()):
+    """Loads DateParser state saved for key.
+
+    Snapshots are unpickled, so on POSIX systems they are loaded only if both the directory
+    and the file are owned by the current user and not writable by group or others.
+
+    :param directory: Snapshot directory
+    :type directory: str
+    :param key: Snapshot key, see :func:`snapshot_key`
+    :type key: tuple
+    :param shared: the same objects in the same order as given to :func:`save_snapshot`
+    :type shared: list|tuple
+    :return: dict of attribute name -> value or None if there is no usable snapshot
+    :rtype: dict|None
+    """
+    try:
+        if not _trusted(os.stat(directory)):
+            return None
+        with open(snapshot_path(directory, key), "rb") as f:
+            if not _trusted(os.fstat(f.fileno())):
+                return None
+            saved_key, shared_count, state = _Unpickler(f, shared).load()
+    except Exception:
+        # missing, broken or written by incompatible versions of libraries,
+        # it is overwritten by next save
+        return None
+    if saved_key != key or shared_count != len(shared):
+        return None
+    return state
+
+
+def save_snapshot(directory, key, state, shared=()):
+    """Saves DateParser state for key, replacing snapshot file atomically.
+
+    :param directory: Snapshot directory, created if missing
+    :type directory: str
+    :param key: Snapshot key, see :func:`snapshot_key`
+    :type key: tuple
+    :param state: dict of attribute name -> value
+    :type state: dict
+    :param shared: objects referenced by state which are not saved, but restored from the list
+        given to :func:`load_snapshot`, like pattern expressions of qddate.patterns modules
+    :type shared: list|tuple
+    :return: True if snapshot was saved, False if state can't be pickled
+    :rtype: bool
+    """
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    limit = sys.getrecursionlimit()
+    try:
+        sys.setrecursionlimit(max(limit, _RECURSION_LIMIT))
+        with os.fdopen(fd, "wb") as f:
+            _Pickler(f, shared).dump((key, len(shared), state))
+        os.replace(tmp_path, snapshot_path(directory, key))
+    except (pickle.PicklingError, TypeError, AttributeError):
+        # custom parse actions like lambdas can't be pickled,
+        # snapshot is only a startup optimization
+        os.unlink(tmp_path)
+        return False
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    finally:
+        sys.setrecursionlimit(limit)
+    return True
@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Compact read-only records of generated date patterns
+__author__ = "Ivan Begtin (ivan@begtin.tech)"
+__license__ = "BSD"
+
+import sys
+from collections.abc import Mapping
+
+from .index_tables import PATTERN_PROPERTIES
+
+# Pattern dict keys stored in their own slots, "length" is stored as min_length and max_length
+_FIELDS = ("key", "basekey", "name", "pattern", "format", "time_format", "filter", "right",
+           "noyear", "yearshort", "prefix", "required_chars", "time_pattern", "variants",
+           "right_variants", "case_keys")
+_DEFAULTS = {"right": False, "noyear": False, "yearshort": False, "prefix": False,
+             "variants": (), "right_variants": (), "case_keys": ()}
+_KNOWN_KEYS = frozenset(_FIELDS + ("length",))
+
+# Language of month names by basekey part, checked in order
+_LANGUAGE_MARKS = (
+    ('ru', ("_rus", "rus_")), ('bg', ("_bg", "bg_")), ('fr', ("_fr", "fr_")),
+    ('cz', ("_cz", "cz_")), ('pl', ("_pl", "pl_")), ('es', ("_es", "es_")),
+    ('it', ("_it", "it_")), ('pt', ("_pt", "pt_")), ('de', ("_de", "de_")),
+    ('tr', ("_tr", "tr_")), ('nl', ("_nl", "nl_")), ('en', ("_eng", "eng", "date_usa")),
+)
+_TEXT_MARKS = ("eng", "rus", "fr", "de", "es", "it", "pt", "bg", "cz", "pl", "tr", "nl", "weekday")
+
+
+# Properties of built-in patterns are looked up in qddate.index_tables, generated from
+# the rules below by scripts/generate_index_tables.py
+
+
+def pattern_language(basekey):
+    """Returns language code of month and weekday names of pattern by its basekey or None"""
+    for lang, marks in _LANGUAGE_MARKS:
+        if any(mark in basekey for mark in marks):
+            return lang
+    return None
+
+
+def pattern_separator(basekey):
+    """Returns separator kind of pattern by its basekey: slash, dot, dash, space, none or mixed"""
+    # More specific patterns first to avoid substring matching (e.g., date_1 matching date_10)
+    if any(x in basekey for x in ["date_10", "date_4_point", "date_rus3", "date_usa_1"]):
+        if "date_10" in basekey or "date_4_point" in basekey or "date_rus3" in basekey:
+            return 'dot'
+        return 'slash'
+    if any(x in basekey for x in ["date_2", "date_4", "noyear_1", "rare_2", "rare_3", "rus_rare_2",
+                                  "rus_rare_3", "date_eng1", "date_eng1_lc", "date_eng1_short"]):
+        return 'dot'
+    if any(x in basekey for x in ["date_1", "date_8", "date_usa", "rare_1"]):
+        return 'slash'
+    if "date_3" in basekey:
+        # date_3 (yyyy/m/d) can accept both / and space, index under slash for now
+        # The separator filter will handle space detection
+        return 'slash'
+    if any(x in basekey for x in ["date_iso8601", "date_iso8601_short", "date_9"]):
+        return 'dash'
+    if any(x in basekey for x in ["date_5", "date_6", "date_7"]):
+        return 'none'
+    if any(x in basekey for x in _TEXT_MARKS):
+        return 'space'
+    return 'mixed'
+
+
+def pattern_year_format(basekey, noyear=False, yearshort=False):
+    """Returns year format pattern requires: noyear, 2digit, 4digit or any"""
+    if noyear:
+        return 'noyear'
+    if yearshort:
+        return '2digit'
+    if any(x in basekey for x in ["date_iso8601", "date_9", "date_10"]):
+        # ISO formats typically use 4-digit years
+        return '4digit'
+    # Most patterns can handle both, but default to 4-digit preference
+    return 'any'
+
+
+class PatternSpec(Mapping):
+    """Read-only pattern record with flat length bounds and precomputed filter properties.
+
+    DateParser converts generated pattern dicts into these records. Fields are attributes,
+    like ``spec.min_length`` or ``spec.noyear``, and the record is also a read-only mapping
+    with the keys of the dict it was made of, so ``spec["key"]``, ``spec.get("noyear", False)``
+    and ``spec["length"]["min"]`` work as with pattern dicts.
+    """
+
+    __slots__ = _FIELDS + ("id", "min_length", "max_length", "language", "separator", "year_format",
+                           "_keys", "_extra")
+
+    def __init__(self, pattern, id=None):
+        """
+        :param pattern: pattern dict or mapping with at least "key", "pattern" and "length"
+        :type pattern: dict
+        :param id: position of pattern in parser patterns, shared by its variants
+        :type id: int|None
+        """
+        set_field = object.__setattr__
+        for name in _FIELDS:
+            set_field(self, name, pattern.get(name, _DEFAULTS.get(name)))
+        key = sys.intern(pattern["key"])
+        basekey = sys.intern(pattern.get("basekey", key))
+        set_field(self, "key", key)
+        set_field(self, "basekey", basekey)
+        length = pattern["length"]
+        set_field(self, "min_length", length["min"])
+        set_field(self, "max_length", length["max"])
+        required_chars = self.required_chars
+        if required_chars is not None:
+            set_field(self, "required_chars", frozenset(required_chars))
+        set_field(self, "variants", tuple(PatternSpec(v, id) for v in self.variants))
+        set_field(self, "right_variants", tuple(PatternSpec(v, id) for v in self.right_variants))
+        set_field(self, "case_keys", tuple(self.case_keys))
+        set_field(self, "id", id)
+        properties = PATTERN_PROPERTIES.get(basekey)
+        if properties is None:
+            # custom pattern, infer properties from its basekey
+            properties = (pattern_language(basekey), pattern_separator(basekey),
+                          pattern_year_format(basekey))
+        language, separator, year_format = properties[:3]
+        set_field(self, "language", language)
+        set_field(self, "separator", separator)
+        if self.noyear:
+            year_format = 'noyear'
+        elif self.yearshort:
+            year_format = '2digit'
+        set_field(self, "year_format", year_format)
+        set_field(self, "_keys", tuple(pattern))
+        extra = {name: pattern[name] for name in pattern if name not in _KNOWN_KEYS}
+        set_field(self, "_extra", extra or None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __reduce__(self):
+        return _restore, (tuple(getattr(self, name) for name in self.__slots__),)
+
+    def __getitem__(self, name):
+        if name not in self._keys:
+            raise KeyError(name)
+        if name == "length":
+            return {"min": self.min_length, "max": self.max_length}
+        if name in _KNOWN_KEYS:
+            return getattr(self, name)
+        return self._extra[name]
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, name):
+        return name in self._keys
+
+    def __repr__(self):
+        return f"PatternSpec(id={self.id!r}, key={self.key!r})"
+
+
+def _restore(values):
+    spec = PatternSpec.__new__(PatternSpec)
+    for name, value in zip(PatternSpec.__slots__, values):
+        object.__setattr__(spec, name, value)
+    return spec
+
+
+def to_specs(patterns):
+    """Converts pattern dicts into :class:`PatternSpec` records with ids of their positions.
+
+    :param patterns: list of pattern dicts or records
+    :type patterns: list
+    :rtype: list
+    """
+    return [p if isinstance(p, PatternSpec) and p.id == i else PatternSpec(p, i)
+            for i, p in enumerate(patterns)]
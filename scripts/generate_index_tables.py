@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Script to generate qddate/index_tables.py with pattern index tables.
+
+Language, separator kind, year format and required character sets of every
+built-in pattern are inferred from pattern keys by the rules of qddate.spec and
+DateParser._infer_char_sets, and prefix basekey sets are combined from basekey
+groups of qddate/dirty.py. The results are written as literal Python data, so
+DateParser imports them instead of recomputing them on every start.
+
+Run it after adding or renaming patterns or editing the basekey groups:
+
+    python scripts/generate_index_tables.py
+
+With --check the script only compares tables with the existing module and
+exits with status 1 if it is out of date.
+"""
+
+import sys
+import os
+import argparse
+
+# Add parent directory to path to import qddate
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from qddate import dirty
+from qddate.qdparser import DateParser
+from qddate.patterns import ALL_PATTERNS
+from qddate.spec import pattern_language, pattern_separator, pattern_year_format
+
+OUTPUT_PATH = os.path.join(os.path.dirname(__file__), '..', 'qddate', 'index_tables.py')
+
+HEADER = '''#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Pattern index tables generated by scripts/generate_index_tables.py, do not edit by hand
+__author__ = "Ivan Begtin (ivan@begtin.tech)"
+__license__ = "BSD"
+'''
+
+_ALPHA_ENGLISH_FULL = (dirty._ALPHA_ENGLISH_BASEKEYS + dirty._PT_BASEKEYS + dirty._ES_BASEKEYS +
+                       dirty._IT_BASEKEYS + dirty._NL_ALPHA_BASEKEYS + dirty._FR_BASEKEYS)
+_DEFAULT_DIGIT_FULL = (dirty._DEFAULT_DIGIT_BASEKEYS + dirty._EXTENDED_DIGIT_BASEKEYS + dirty._PT_BASEKEYS +
+                       dirty._DE_BASEKEYS + dirty._BG_BASEKEYS + dirty._ES_BASEKEYS + dirty._IT_BASEKEYS +
+                       dirty._TR_BASEKEYS + dirty._PL_BASEKEYS + dirty._NL_BASEKEYS + dirty._CZ_BASEKEYS +
+                       dirty._FR_BASEKEYS)
+_ALL_ALPHA = _ALPHA_ENGLISH_FULL + dirty._ALPHA_NON_ENGLISH_BASEKEYS
+_ALL_SEPARATOR = (dirty._DOT_SEPARATOR_BASEKEYS + dirty._DE_BASEKEYS + dirty._SLASH_SEPARATOR_BASEKEYS +
+                  dirty._DASH_SEPARATOR_BASEKEYS + list(dirty._RUS_SEPARATOR_BASEKEYS))
+
+# Basekey sets used by qddate.dirty.matchPrefix, name -> (comment, basekeys)
+PREFIX_SETS = (
+    ("PREFIX_ALL", "Whitespace only text", _DEFAULT_DIGIT_FULL + _ALL_ALPHA + _ALL_SEPARATOR),
+    ("PREFIX_ALPHA", "Text starting with a letter", _ALL_ALPHA + _ALL_SEPARATOR),
+    ("PREFIX_DIGIT", "Text starting with a digit, always included",
+     _DEFAULT_DIGIT_FULL),
+    ("PREFIX_DOT", "Dot in the first 10 characters",
+     dirty._DOT_SEPARATOR_BASEKEYS + dirty._DE_BASEKEYS + list(dirty._DOT_LONG_BASEKEYS)),
+    ("PREFIX_SLASH", "Slash in the first 10 characters", dirty._SLASH_SEPARATOR_BASEKEYS),
+    ("PREFIX_DASH", "Dash in the first 10 characters",
+     dirty._DASH_SEPARATOR_BASEKEYS + list(dirty._DASH_LONG_BASEKEYS)),
+    ("PREFIX_COMMA", "Comma in the first 10 characters",
+     list(dirty._RUS_SEPARATOR_BASEKEYS) + _ALPHA_ENGLISH_FULL),
+    ("PREFIX_SPACE", "Space in the first 10 characters",
+     _ALPHA_ENGLISH_FULL + dirty._ALPHA_NON_ENGLISH_BASEKEYS),
+    ("PREFIX_COMPACT", "No separators and 4 leading digits, like yyyymmdd", dirty._DASH_SEPARATOR_BASEKEYS),
+)
+
+
+def pattern_properties():
+    """Returns dict of pattern key -> (language, separator kind, year format, required character sets)"""
+    properties = {}
+    for pattern in ALL_PATTERNS:
+        key = pattern["key"]
+        properties[key] = (pattern_language(key), pattern_separator(key), pattern_year_format(key),
+                           frozenset(DateParser._infer_char_sets({"key": key})))
+    return properties
+
+
+def _frozenset_literal(values, indent):
+    if not values:
+        return "frozenset()"
+    items = "".join(f"{indent}    {value!r},\n" for value in sorted(values))
+    return "frozenset({\n" + items + indent + "})"
+
+
+def render_tables():
+    """Returns source of qddate/index_tables.py"""
+    lines = [HEADER]
+    lines.append("# Pattern key -> (language of month and weekday names or None, separator kind,")
+    lines.append("# year format without noyear and yearshort flags, required character sets)")
+    lines.append("PATTERN_PROPERTIES = {")
+    for key, (language, separator, year_format, char_sets) in sorted(pattern_properties().items()):
+        char_sets = "frozenset({" + ", ".join(repr(c) for c in sorted(char_sets)) + "})"
+        lines.append(f"    {key!r}: ({language!r}, {separator!r}, {year_format!r}, {char_sets}),")
+    lines.append("}")
+    for name, comment, basekeys in PREFIX_SETS:
+        lines.append("")
+        lines.append(f"# {comment}")
+        lines.append(f"{name} = {_frozenset_literal(set(basekeys), '')}")
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    """Main entry point."""
+    parser_arg = argparse.ArgumentParser(description='Generate qddate/index_tables.py')
+    parser_arg.add_argument('--check', action='store_true',
+                            help='Only check that qddate/index_tables.py is up to date')
+    args = parser_arg.parse_args()
+
+    content = render_tables()
+    if args.check:
+        with open(OUTPUT_PATH, encoding='utf-8') as f:
+            if f.read() != content:
+                print(f"{OUTPUT_PATH} is out of date, run scripts/generate_index_tables.py")
+                sys.exit(1)
+        print(f"{OUTPUT_PATH} is up to date")
+        return
+    with open(OUTPUT_PATH, 'w', encoding='utf-8') as f:
+        f.write(content)
+    print(f"Index tables generated successfully: {OUTPUT_PATH}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,12 @@
 import datetime
+import os
+import pickle
+import subprocess
+import sys
 
 import pytest
 
-from qddate import DateParser
+from qddate import DateParser, PatternSpec, prewarm, qdparser
 from qddate.qdparser import (
     scan_char_sets,
     CHAR_SET_DIGITS,
@@ -10,7 +14,22 @@ from qddate.qdparser import (
     CHAR_SET_CYRILLIC,
     CHAR_SET_ACCENTED,
     CHAR_SET_SEPARATORS,
+    shape_signature,
+    priority_separator,
+    TextProfile,
+    ENGINE_ANCHORED,
+    ENGINE_RE,
+    ENGINES,
 )
+from qddate.re_engine import compile_expression, UnsupportedExpression
+from qddate.langdetect import LanguageDetector, get_detector
+from qddate.casefold import merge_case_variants
+from qddate.snapshot import snapshot_key, load_snapshot, save_snapshot
+from qddate.dirty import matchPrefix, prefix_basekeys
+from qddate.memory import deep_sizeof
+from qddate.cache import BloomFilter, MISSING
+from qddate.shmcache import SharedParseCache
+from qddate.patterns import ALL_PATTERNS
 
 
 @pytest.fixture(scope="module")
@@ -462,6 +481,17 @@ def test_scan_char_sets_czech_date():
     # May have accented characters if present
 
 
+
+def test_char_class_table_bounded():
+    """Test that characters outside supported languages don't grow class table without limit"""
+    codes = range(0x4E00, 0x4E00 + 2 * qdparser._CHAR_CLASS_TABLE_SIZE)
+    text = "".join(chr(code) for code in codes)
+    for start in range(0, len(text), 100):
+        assert TextProfile(text[start:start + 100] + " 2009").has_text
+    assert len(qdparser._CHAR_CLASS_TABLE) <= qdparser._CHAR_CLASS_TABLE_SIZE
+    assert scan_char_sets("日本 01.12.2009") == {CHAR_SET_DIGITS, CHAR_SET_SEPARATORS}
+
+
 # Pattern filtering tests
 def test_pattern_filtering_cyrillic_input(parser):
     """Test that Cyrillic input filters out non-Cyrillic patterns"""
@@ -512,3 +542,937 @@ def test_pattern_filtering_short_strings(parser):
     # This might return None if no pattern matches, but shouldn't crash
     assert result is None or isinstance(result, datetime.datetime)
 
+
+
+# Shape cache tests
+def test_shape_signature():
+    """Test that shape signature keeps separators and collapses character classes"""
+    assert shape_signature("01.12.2009") == "99.99.9999"
+    assert shape_signature("6 Jan 2009") == "9 aaa 9999"
+    assert shape_signature("3 Января 2003") == "9 яяяяяя 9999"
+
+
+def test_shape_cache_keeps_results():
+    """Test that shape cache returns the same results as full matching"""
+    texts = ["05/10/1919", "12/25/1990", "05/10/1919", "6 Jan 2009", "6 mai 2009",
+             "7 Feb 2010", "7 Foo 2010", "01.12.2009", "02.11.2008"]
+    plain = DateParser()
+    cached = DateParser(shape_cache_size=16)
+    for text in texts:
+        assert cached.parse(text) == plain.parse(text), text
+
+
+def test_shape_cache_stats():
+    """Test that shape cache reports hits and misses"""
+    parser = DateParser(shape_cache_size=16)
+    assert parser.parse("01.12.2009") == datetime.datetime(2009, 12, 1)
+    assert parser.parse("02.11.2008") == datetime.datetime(2008, 11, 2)
+    stats = parser.cache_stats()["shape"]
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["size"] == 1
+    assert stats["hit_rate"] == 0.5
+    assert DateParser().cache_stats() == {}
+
+
+# Match engine tests
+@pytest.mark.parametrize(
+    "text",
+    ["01.12.2009", "6 Jan 2009", "3 Января 2003 года", "12.03.1999 Hello people",
+     "01.03.2009 14:53:12", "Thursday 4 April 2019", "totally invalid date", "14:53 01.12.2009"],
+)
+def test_anchored_engine_same_results(parser, text):
+    """Test that anchored engine returns the same results as scan engine"""
+    anchored = DateParser(engine=ENGINE_ANCHORED)
+    assert anchored.parse(text) == parser.parse(text)
+
+
+def test_anchored_engine_skips_leading_whitespace():
+    """Test that anchored engine accepts dates after leading whitespace"""
+    anchored = DateParser(engine=ENGINE_ANCHORED, base_only=True)
+    assert anchored.parse("  01.12.2009 14:53") == datetime.datetime(2009, 12, 1, 14, 53)
+    assert DateParser(base_only=True).parse("  01.12.2009 14:53") is None
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["01.12.2009", "6 Jan 2009", "JAN 1, 2001", "3 Января 2003 года", "12.03.1999 Hello people",
+     "01.03.2009 14:53:12", "Thursday 4 April 2019", "26 de julho de 2015", "17 de Junio de 2015",
+     "Le 8 juillet 2015", "9 Июля 2015 [11:23]", "totally invalid date", "14:53 01.12.2009"],
+)
+def test_re_engine_same_results(parser, text):
+    """Test that re engine returns the same results as scan engine"""
+    assert DateParser(engine=ENGINE_RE).parse(text) == parser.parse(text)
+
+
+def test_re_engine_month_names_resolved():
+    """Test that re engine resolves month names to month numbers as parse actions do"""
+    res = DateParser(engine=ENGINE_RE).match("6 Jan 2009")
+    assert res["values"].asDict() == {"day": "6", "month": 1, "year": "2009"}
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_match_values_are_parse_results(engine):
+    """Test that every engine returns pyparsing results as match values"""
+    from pyparsing import ParseResults
+    res = DateParser(engine=engine).match("01.03.2009 14:53:12")
+    assert isinstance(res["values"], ParseResults)
+    assert res["values"].day == "01"
+    assert res["values"].asDict() == DateParser().match("01.03.2009 14:53:12")["values"].asDict()
+
+
+def test_compile_expression_unsupported():
+    """Test that elements without re equivalent are reported"""
+    from pyparsing import Word, alphanums, ZeroOrMore
+    with pytest.raises(UnsupportedExpression):
+        compile_expression(ZeroOrMore(Word(alphanums)))
+
+
+def test_invalid_engine():
+    """Test that unknown engine raises ValueError"""
+    with pytest.raises(ValueError, match="Unsupported engine"):
+        DateParser(engine="invalid")
+
+
+# Split time tests
+@pytest.mark.parametrize(
+    "text",
+    ["01.03.2009 14:53", "01.03.2009 14:53:12", "9 Июля 2015 [11:23]", "2013-01-12T10:15:30",
+     "16 May 2009 14:10", "12.03.1999 Hello people", "01.12.2009", "totally invalid date"],
+)
+@pytest.mark.parametrize("engine", ENGINES)
+def test_split_time_same_results(parser, engine, text):
+    """Test that two-stage date then time matching returns the same results as time patterns"""
+    split = DateParser(engine=engine, split_time=True)
+    res, expected = split.match(text), parser.match(text)
+    assert split.parse(text) == parser.parse(text)
+    expected_key = expected["pattern"]["key"] if expected else None
+    assert (res["pattern"]["key"] if res else None) == expected_key
+
+
+def test_split_time_fewer_patterns(parser):
+    """Test that split_time doesn't generate time variants of patterns"""
+    split = DateParser(split_time=True)
+    assert len(split.patterns) * 4 == len(parser.patterns)
+    assert not any(":time_" in p["key"] for p in split.patterns)
+
+
+def test_split_time_session():
+    """Test that session started with time variant keys works with split_time"""
+    split = DateParser(split_time=True)
+    split.startSession(["dt:date:date_2:time_1"])
+    assert split.parse("01.03.2009 14:53") == datetime.datetime(2009, 3, 1, 14, 53)
+    split.endSession()
+
+
+# Match span tests
+def test_match_reports_span(parser):
+    """Test that match result has span of text consumed by pattern"""
+    assert parser.match("01.12.2009")["span"] == (0, 10)
+    assert parser.match("01.03.2009 14:53")["span"] == (0, 16)
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["12.03.1999 Hello people", "01.03.2009 14:53 and more", " 6 Jan 2009", "6 Jan 2009, Monday",
+     "01.12.2009", "9 Июля 2015 [11:23]", "totally invalid date"],
+)
+@pytest.mark.parametrize("split_time", [False, True])
+def test_prefix_match_same_results(parser, split_time, text):
+    """Test that prefix matching returns the same results and keys as generated :t_right patterns"""
+    prefix = DateParser(prefix_match=True, split_time=split_time)
+    res, expected = prefix.match(text), parser.match(text)
+    assert prefix.parse(text) == parser.parse(text)
+    expected_key = expected["pattern"]["key"] if expected else None
+    assert (res["pattern"]["key"] if res else None) == expected_key
+
+
+def test_prefix_match_span_ends_at_date():
+    """Test that with prefix_match span of :t_right match ends where the date ends"""
+    prefix = DateParser(prefix_match=True)
+    text = "12.03.1999 Hello people"
+    res = prefix.match(text)
+    assert res["pattern"]["key"] == "dt:date:date_2:t_right"
+    assert res["span"] == (0, 10)
+    assert text[res["span"][1]:] == " Hello people"
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize("split_time", [False, True])
+def test_prefix_match_span_of_text_with_tabs(engine, split_time):
+    """Test that span refers to the given text and not to the text with expanded tabs"""
+    prefix = DateParser(prefix_match=True, engine=engine, split_time=split_time)
+    assert prefix.match("\t01.12.2009 rest")["span"] == (1, 11)
+    text = "01.12.2009\t10:20 rest"
+    res = prefix.match(text)
+    assert res["span"] == (0, 16)
+    assert text[res["span"][1]:] == " rest"
+
+
+def test_prefix_match_fewer_patterns(parser):
+    """Test that prefix_match doesn't generate :t_right copies of patterns"""
+    prefix = DateParser(prefix_match=True)
+    assert len(prefix.patterns) * 2 == len(parser.patterns)
+    assert not any(p["key"].endswith(":t_right") for p in prefix.patterns)
+
+
+# Bitset filter tests
+def test_pattern_mask_roundtrip(parser):
+    """Test that patterns converted to bitmask come back in the order of parser.patterns"""
+    patterns = [parser.patterns[i] for i in (500, 3, 42, 991)]
+    expected = [parser.patterns[i] for i in (3, 42, 500, 991)]
+    assert parser._patterns_of(parser._mask_of(patterns)) == expected
+    assert parser._patterns_of(0) == []
+
+
+def test_filter_uses_length_mask(parser):
+    """Test that filtered candidates all accept text length"""
+    text = "01.12.2009 14:53"
+    pats = parser._filter_patterns_hierarchical(text, len(text))
+    assert pats
+    assert all(p["length"]["min"] <= len(text) <= p["length"]["max"] for p in pats)
+    assert parser._filter_patterns_hierarchical("x" * 500, 500) is None
+
+
+def test_length_masks_same_as_length_ranges(parser):
+    """Test that length masks built from interval endpoints hold exactly the patterns accepting
+    each length"""
+    expected = {}
+    for i, p in enumerate(parser.patterns):
+        for n in range(p["length"]["min"], p["length"]["max"] + 1):
+            expected[n] = expected.get(n, 0) | (1 << i)
+    assert parser._length_masks == expected
+
+
+# Text profile tests
+@pytest.mark.parametrize("text", ["01.12.2009", "6 Jan 2009", "15 Января 2003", "20090112",
+                                  "1 juillet 09", ""])
+def test_text_profile_same_as_scanners(text):
+    """Test that profile features are the same as separate scans of the text"""
+    profile = TextProfile(text)
+    assert profile.length == len(text)
+    assert profile.char_sets == frozenset(scan_char_sets(text))
+    assert profile.has_text == any(c.isalpha() for c in text)
+
+
+def test_text_profile_features():
+    """Test separators, year format and language of text profile"""
+    profile = TextProfile("01.12.2009 14:53")
+    assert profile.separators == {"dot", "space"}
+    assert profile.year_format == "4digit"
+    assert TextProfile("20090112").separators == {"none"}
+    assert TextProfile("1/12/09").year_format == "2digit"
+    assert TextProfile("15 Января 2003").languages == ("ru",)
+    assert TextProfile("6 Jan 2009").languages == ("en",)
+    assert TextProfile("01.12.2009").languages is None
+
+
+def test_match_with_profile(parser):
+    """Test that passing text profile gives the same result and mismatched profile is rejected"""
+    text = "Thursday 4 April 2019"
+    profile = TextProfile(text)
+    res = parser.match(text, profile=profile)
+    expected = parser.match(text)
+    assert res["pattern"] is expected["pattern"] and res["span"] == expected["span"]
+    assert parser.parse(text, profile=profile) == datetime.datetime(2019, 4, 4)
+    with pytest.raises(ValueError):
+        parser.match("01.12.2009", profile=profile)
+
+
+# Language detector tests
+@pytest.mark.parametrize("text,languages", [
+    ("15 Января 2003", ("ru",)),
+    ("15 числа 2003", ("ru", "bg")),
+    ("1 juillet 2009", ("fr",)),
+    ("Mittwoch, 12. März 2018", ("de",)),
+    ("6 Jan 2009", ("en",)),
+    ("Janet 2009", None),
+    ("01.12.2009", None),
+])
+def test_language_detector_confident_language(text, languages):
+    """Test that detector keeps month name precedence of languages"""
+    detected, ranking = get_detector().detect(text, scan_char_sets(text))
+    assert detected == languages
+    assert ranking[:len(languages or ())] == (languages or ())
+
+
+def test_language_detector_overlapping_names():
+    """Test that names starting inside or at the same position as other names are found"""
+    detector = LanguageDetector({"aa": ["mai", "maio"], "bb": ["aio"]},
+                                confident_groups=((), (), ()))
+    confident, counts = detector.hits("maio mai")
+    assert confident == set()
+    assert counts == {"aa": 2}
+    assert detector.hits("xmaio")[1] == {}
+
+
+def test_language_detector_ranking():
+    """Test that languages without month names are ranked by weekday and month name hits"""
+    text = "Lundi, Montag"
+    detected, ranking = get_detector().detect(text, scan_char_sets(text))
+    assert detected is None
+    assert set(ranking) == {"fr", "de"}
+    assert TextProfile(text).language_ranking == ranking
+
+
+# Case folding tests
+@pytest.fixture(scope="module")
+def casefold_parser():
+    return DateParser(casefold=True)
+
+
+def test_merge_case_variants():
+    """Test that lowercase variants are merged into patterns with capitalized names"""
+    merged = merge_case_variants(ALL_PATTERNS)
+    keys = {p["key"]: p for p in merged}
+    assert len(merged) < len(ALL_PATTERNS)
+    assert keys["dt:date:de_base"]["case_keys"] == ("dt:date:de_base_lc",)
+    assert "dt:date:de_base_lc" not in keys
+    # similar short month lists of other language are not merged
+    assert "dt:date:pt_short_lc" in keys
+    assert all("case_keys" not in p for p in ALL_PATTERNS)
+
+
+@pytest.mark.parametrize("text,expected", [
+    ("12 März 2018", datetime.datetime(2018, 3, 12)),
+    ("12 märz 2018", datetime.datetime(2018, 3, 12)),
+    ("lundi 12 mars 2018", datetime.datetime(2018, 3, 12)),
+    ("Lundi 12 Mars 2018", datetime.datetime(2018, 3, 12)),
+    ("03 de julio, 2026", datetime.datetime(2026, 7, 3)),
+])
+def test_casefold_same_dates(parser, casefold_parser, text, expected):
+    """Test that merged patterns parse the same dates"""
+    assert parser.parse(text) == expected
+    assert casefold_parser.parse(text) == expected
+
+
+def test_casefold_any_case(casefold_parser):
+    """Test that merged patterns accept month names in any case"""
+    assert casefold_parser.parse("12 MÄRZ 2018") == datetime.datetime(2018, 3, 12)
+    assert casefold_parser.match("12 märz 2018")["pattern"]["basekey"] == "dt:date:de_base"
+
+
+def test_casefold_session_with_merged_key(casefold_parser):
+    """Test that session started with key of merged pattern selects the merged pattern"""
+    casefold_parser.startSession(["dt:date:de_base_lc:time_1"])
+    try:
+        assert [p["key"] for p in casefold_parser.cachedpats] == ["dt:date:de_base:time_1"]
+    finally:
+        casefold_parser.endSession()
+
+
+# Lazy pattern loading tests
+def _loaded_pattern_modules(code):
+    """Runs code in a fresh interpreter and returns names of imported qddate.patterns modules"""
+    code += ("\nimport sys; print(' '.join(sorted(m for m in sys.modules "
+             "if m.startswith('qddate.patterns.'))))")
+    output = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True,
+                            text=True).stdout
+    return output.split()
+
+
+def test_import_loads_only_base_patterns():
+    """Test that importing qddate doesn't import pattern modules of languages"""
+    assert _loaded_pattern_modules("import qddate") == ["qddate.patterns.base"]
+
+
+def test_languages_load_only_requested_modules():
+    """Test that parser for given languages imports only their pattern modules"""
+    code = ("from qddate import DateParser; "
+            "assert DateParser(languages='ru').parse('12 января 2020')")
+    assert _loaded_pattern_modules(code) == ["qddate.patterns.base", "qddate.patterns.ru"]
+
+
+def test_patterns_by_language_is_lazy():
+    """Test that lazy pattern mapping returns the same lists as pattern modules"""
+    from qddate.patterns import PATTERNS_BY_LANGUAGE, get_patterns_for_languages
+    from qddate.patterns.de import PATTERNS_DE
+    assert PATTERNS_BY_LANGUAGE["de"] is PATTERNS_DE
+    assert PATTERNS_BY_LANGUAGE.is_loaded("de")
+    assert get_patterns_for_languages("de") == PATTERNS_DE
+    with pytest.raises(KeyError):
+        PATTERNS_BY_LANGUAGE["xx"]
+
+
+# Snapshot tests
+def test_snapshot_key_depends_on_configuration():
+    """Test that snapshot key differs for configurations generating different patterns"""
+    assert snapshot_key("ru", False) == snapshot_key(["ru"], False)
+    assert snapshot_key(["ru", "en"], False) == snapshot_key(["en", "ru"], False)
+    assert snapshot_key("ru", False) != snapshot_key("ru", True)
+    assert snapshot_key(None, False) != snapshot_key(None, False, split_time=True)
+    assert snapshot_key(None, False, ["a"]) != snapshot_key(None, False, ["a", "b"])
+
+
+@pytest.fixture
+def no_shared_states(monkeypatch):
+    """Makes parsers generate patterns instead of using ones of earlier parsers of the same
+    configuration"""
+    def clear():
+        monkeypatch.setattr(qdparser, "_SHARED_STATES", {})
+    clear()
+    return clear
+
+
+def test_snapshot_saved_and_loaded(tmp_path, no_shared_states):
+    """Test that parser loaded from snapshot parses the same as generated one"""
+    generated = DateParser(languages=["ru", "en"], snapshot_dir=str(tmp_path))
+    assert len(os.listdir(tmp_path)) == 1
+    no_shared_states()
+    loaded = DateParser(languages=["ru", "en"], snapshot_dir=str(tmp_path))
+    assert [p["key"] for p in loaded.patterns] == [p["key"] for p in generated.patterns]
+    assert loaded.patterns[0] is not generated.patterns[0]
+    for text in ["12 января 2020", "2020-01-02", "Jan 8, 1998 12:30", "31.05.2001 текст"]:
+        assert loaded.parse(text) == generated.parse(text)
+
+
+def test_snapshot_keeps_re_engine_results(tmp_path, no_shared_states):
+    """Test that unpickled optional elements keep pyparsing sentinel, so re engine compiles them"""
+    generated = DateParser(languages="en", engine=ENGINE_RE, snapshot_dir=str(tmp_path))
+    no_shared_states()
+    loaded = DateParser(languages="en", engine=ENGINE_RE, snapshot_dir=str(tmp_path))
+    for text in ["3 Mar. 2026", "Jan 8, 1998"]:
+        assert loaded.match(text)["values"].asDict() == generated.match(text)["values"].asDict()
+
+
+def test_snapshot_broken_file_is_regenerated(tmp_path, no_shared_states):
+    """Test that unreadable snapshot is ignored and replaced"""
+    DateParser(languages="de", snapshot_dir=str(tmp_path))
+    path = os.path.join(str(tmp_path), os.listdir(tmp_path)[0])
+    with open(path, "wb") as f:
+        f.write(b"broken")
+    no_shared_states()
+    parser = DateParser(languages="de", snapshot_dir=str(tmp_path))
+    assert parser.parse("3. März 2021") == datetime.datetime(2021, 3, 3)
+    assert os.path.getsize(path) > 100
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX owners and modes only")
+def test_snapshot_not_loaded_if_writable_by_others(tmp_path):
+    """Test that snapshots in directories or files others can write to are not unpickled"""
+    directory = str(tmp_path)
+    os.chmod(directory, 0o700)
+    key = snapshot_key("de", False)
+    assert save_snapshot(directory, key, {"value": 1})
+    assert load_snapshot(directory, key) == {"value": 1}
+    os.chmod(directory, 0o777)
+    assert load_snapshot(directory, key) is None
+    os.chmod(directory, 0o700)
+    os.chmod(os.path.join(directory, os.listdir(directory)[0]), 0o666)
+    assert load_snapshot(directory, key) is None
+
+
+def test_snapshot_with_custom_patterns_raises(tmp_path):
+    """Test that custom patterns can't be snapshotted"""
+    with pytest.raises(ValueError):
+        DateParser(patterns=ALL_PATTERNS[:10], snapshot_dir=str(tmp_path))
+
+
+# Shared pattern state tests
+def test_parsers_share_generated_patterns():
+    """Test that parsers of the same configuration share patterns and indexes"""
+    first = DateParser(languages=["de", "en"])
+    second = DateParser(languages=["de", "en"])
+    assert second.patterns is first.patterns
+    assert second._length_masks is first._length_masks
+    assert DateParser(languages=["en", "de"]).patterns is not first.patterns
+    assert DateParser(languages=["de", "en"], base_only=True).patterns is not first.patterns
+    assert second.parse("3. März 2021") == datetime.datetime(2021, 3, 3)
+
+
+def test_sessions_are_not_shared():
+    """Test that session of one parser doesn't change patterns of another parser"""
+    first = DateParser(languages="en")
+    second = DateParser(languages="en")
+    first.startSession(["dt:date:date_1"])
+    try:
+        assert second.cachedpats is None
+        assert second.parse("Jan 8, 1998") == datetime.datetime(1998, 1, 8)
+    finally:
+        first.endSession()
+
+
+def test_generation_doesnt_change_pattern_modules():
+    """Test that pattern dicts of qddate.patterns are left unchanged by pattern generation"""
+    DateParser(languages="tr", base_only=True)
+    assert all("required_chars" not in p for p in ALL_PATTERNS)
+
+
+# Pattern spec tests
+def test_patterns_are_specs(parser):
+    """Test that generated patterns are read-only records with their position as id"""
+    for i, p in enumerate(parser.patterns):
+        assert isinstance(p, PatternSpec)
+        assert p.id == i
+        assert p["key"] == p.key
+        assert p["length"] == {"min": p.min_length, "max": p.max_length}
+        assert p.get("noyear", False) == p.noyear
+    with pytest.raises(AttributeError):
+        parser.patterns[0].noyear = True
+
+
+def test_spec_from_custom_pattern_dict():
+    """Test that custom pattern dicts are converted keeping their keys"""
+    source = [p for p in ALL_PATTERNS if p["key"] == "dt:date:date_1"]
+    parser = DateParser(patterns=source, generate=False)
+    spec = parser.patterns[0]
+    assert list(spec) == list(source[0])
+    assert spec["name"] == source[0]["name"]
+    assert spec.basekey == "dt:date:date_1"
+    assert "basekey" not in spec
+    assert (spec.separator, spec.language, spec.year_format) == ("slash", None, "any")
+    assert parser.parse("12/01/2009") == datetime.datetime(2009, 1, 12)
+
+
+def test_spec_pickle():
+    """Test that spec keeps its fields after pickling"""
+    spec = PatternSpec({"key": "dt:date:test", "pattern": None, "length": {"min": 1, "max": 5},
+                        "filter": 1, "variants": ({"key": "dt:date:test:t_right", "pattern": None,
+                                                   "length": {"min": 2, "max": 90}},)}, 3)
+    restored = pickle.loads(pickle.dumps(spec))
+    assert restored == spec
+    assert restored.variants[0].id == 3
+    assert restored["filter"] == 1
+
+
+# Index tables tests
+def test_index_tables_up_to_date():
+    """Test that qddate/index_tables.py matches patterns and basekey groups it is generated from"""
+    script = os.path.join(os.path.dirname(__file__), "..", "scripts", "generate_index_tables.py")
+    result = subprocess.run([sys.executable, script, "--check"], capture_output=True, text=True)
+    assert result.returncode == 0, result.stdout + result.stderr
+
+
+@pytest.mark.parametrize("text", ["01.12.2009", "7/12/2009", "2013-01-12", "20090112", "6 Jan 2009",
+                                  "   ", ""])
+def test_prefix_basekeys_same_as_match_prefix(text):
+    """Test that prefix basekeys set is the same as matchPrefix result"""
+    assert prefix_basekeys(text[:6]) == frozenset(matchPrefix(text[:6]))
+
+
+def test_prefix_basekeys_shared_between_texts():
+    """Test that texts with the same separators get the same basekeys set object"""
+    assert prefix_basekeys("01.12.") is prefix_basekeys("31.05.")
+    assert prefix_basekeys("2009") is not prefix_basekeys("01.12.")
+
+
+# Pickling tests
+def test_pickle_keeps_configuration_and_session():
+    """Test that unpickled parser has the same configuration, session and shared patterns"""
+    parser = DateParser(languages=["en", "de"], split_time=True, engine=ENGINE_ANCHORED)
+    parser.startSession(["dt:date:date_1"])
+    try:
+        data = pickle.dumps(parser)
+        assert len(data) < 1000
+        restored = pickle.loads(data)
+    finally:
+        parser.endSession()
+    assert restored.patterns is parser.patterns
+    assert restored.engine == ENGINE_ANCHORED
+    assert [p.key for p in restored.cachedpats] == ["dt:date:date_1"]
+    assert restored.parse("12/01/2009 14:53") == datetime.datetime(2009, 1, 12, 14, 53)
+    assert pickle.loads(pickle.dumps(parser)).cachedpats is None
+
+
+def test_pickle_custom_patterns_from_pattern_modules():
+    """Test that custom patterns of qddate.patterns are pickled as references"""
+    parser = DateParser(patterns=ALL_PATTERNS[:20])
+    restored = pickle.loads(pickle.dumps(parser))
+    assert [p.key for p in restored.patterns] == [p.key for p in parser.patterns]
+    assert restored.parse("12.01.2009") == datetime.datetime(2009, 1, 12)
+
+
+# Memory report tests
+def test_memory_report():
+    """Test that memory report breaks down parser memory by sections and patterns"""
+    parser = DateParser(languages="de", base_only=True)
+    parser.parse("3. März 2021")
+    report = parser.memory_report(top=3)
+    assert report["total"] == sum(report["sections"].values())
+    assert report["sections"]["grammars"] > report["sections"]["_patterns_by_separator"] > 0
+    assert report["sections"]["_length_masks"] > 0
+    assert report["shared"]
+    sizes = [item["bytes"] for item in report["top_patterns"]]
+    assert len(sizes) == 3 and sizes == sorted(sizes, reverse=True)
+    assert set(report["languages"]) == {"de"}
+    assert parser.memory_report(top=0)["top_patterns"] == []
+
+
+def test_deep_sizeof_counts_shared_objects_once():
+    """Test that objects shared between measured structures are counted once with one seen set"""
+    shared = list(range(1000))
+    seen = set()
+    first = deep_sizeof([shared], seen)
+    assert deep_sizeof([shared], seen) < first
+    assert deep_sizeof([shared]) == first
+
+
+# Priority order tests
+@pytest.mark.parametrize("text", ["01.12.2009 14:53", "7/12/2009", "2013-01-12", "6 Jan 2009",
+                                  "20090112"])
+def test_ordered_candidates_same_as_priority_sort(parser, text):
+    """Test that precomputed priority order is the same as sorting candidates by priority"""
+    n = len(text)
+    mask = parser._filter_mask(text, n)
+    pats = parser._patterns_of(mask)
+    expected = sorted(pats, key=lambda p: parser._calculate_pattern_priority(p, text), reverse=True)
+    assert list(parser._ordered_candidates(mask, text, n)) == expected
+
+
+def test_priority_separator():
+    """Test separator kind used by priority"""
+    assert priority_separator("7/12/2009 14.53") == "/"
+    assert priority_separator("01.12.2009") == "."
+    assert priority_separator("2013-01-12") == "-"
+    assert priority_separator("6 Jan 2009") == " "
+    assert priority_separator("20090112") == ""
+
+
+# Prewarm tests
+def test_prewarm_builds_lazy_state():
+    """Test that prewarm builds filter masks, priority buckets and grammars before first parse"""
+    parser, = prewarm([{"languages": "de", "base_only": True, "engine": "re"}])
+    assert len(parser._charset_masks) == 32
+    assert parser._separator_masks and parser._prefix_masks
+    assert all(p.pattern.streamlined for p in parser.patterns)
+    assert parser._regex_patterns
+    assert (".", 10) in parser._priority_bucket_cache
+    # parsers of the same configuration share warmed state
+    other = DateParser(languages="de", base_only=True, engine="re")
+    assert other._priority_bucket_cache is parser._priority_bucket_cache
+    assert other.parse("3. März 2021") == datetime.datetime(2021, 3, 3)
+
+
+def test_prewarm_freeze():
+    """Test that prewarm moves objects to permanent generation with freeze"""
+    import gc
+    try:
+        parsers = prewarm([{"languages": "de", "base_only": True}], texts=["3. März 2021"],
+                          freeze=True)
+        assert gc.get_freeze_count() > 0
+        assert parsers[0].parse("3. März 2021") == datetime.datetime(2021, 3, 3)
+    finally:
+        gc.unfreeze()
+
+
+def test_prewarm_leaves_caches_empty():
+    """Test that prewarm doesn't add warmup texts or counters to parser caches"""
+    shared = SharedParseCache(slots=64)
+    try:
+        parser, = prewarm([{"languages": "de", "base_only": True, "result_cache_size": 16,
+                            "negative_cache_size": 16, "shape_cache_size": 16,
+                            "filter_cache_size": 16, "shared_cache": shared.name}])
+        for name, stats in parser.cache_stats().items():
+            assert stats["hits"] == 0 and stats["misses"] == 0, name
+            assert stats.get("size", 0) == 0, name
+        assert len(shared) == 0
+        assert parser.parse("3. März 2021") == datetime.datetime(2021, 3, 3)
+    finally:
+        shared.close()
+        shared.unlink()
+
+
+def test_prewarm_invalid_config():
+    """Test that prewarm rejects configs that are not dicts of DateParser arguments"""
+    with pytest.raises(ValueError):
+        prewarm(["de"])
+
+
+# Result cache tests
+def test_result_cache_hits_and_flags():
+    """Test that result cache returns the same results and keys them by text and filter flags"""
+    parser = DateParser(languages="de", result_cache_size=16)
+    assert parser.parse("3. März 2021") == datetime.datetime(2021, 3, 3)
+    assert parser.parse("3. März 2021") == datetime.datetime(2021, 3, 3)
+    assert parser.parse("3. März 2021", nolanguagefilter=True) == datetime.datetime(2021, 3, 3)
+    assert parser.parse("not a date") is None
+    assert parser.parse("not a date") is None
+    first = parser.match("3. März 2021")
+    assert parser.match("3. März 2021") is first
+    stats = parser.cache_stats()["result"]
+    assert (stats["hits"], stats["misses"], stats["size"]) == (3, 4, 4)
+
+
+def test_result_cache_lru_eviction():
+    """Test that the least recently used result is evicted when cache is full"""
+    parser = DateParser(languages="de", base_only=True, result_cache_size=2)
+    parser.parse("1. März 2021")
+    parser.parse("2. März 2021")
+    parser.parse("1. März 2021")
+    parser.parse("3. März 2021")
+    assert parser.cache_stats()["result"]["evictions"] == 1
+    parser.parse("1. März 2021")
+    parser.parse("2. März 2021")
+    stats = parser.cache_stats()["result"]
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (2, 4, 2)
+
+
+def test_result_cache_noyear_expires_on_year_change():
+    """Test that results of patterns without year are recomputed when year changes"""
+    from pyparsing import Word, nums, Literal
+    no_filters = dict(noprefix=True, nocharsetfilter=True, noseparatorfilter=True,
+                      noyearformatfilter=True, nolanguagefilter=True)
+    pattern = {
+        "key": "dt:date:noyear_test", "name": "Day and month",
+        "pattern": (Word(nums, exact=2)("day") + Literal(".").suppress() +
+                    Word(nums, exact=2)("month")),
+        "length": {"min": 5, "max": 5}, "format": "%d.%m", "noyear": True,
+    }
+    parser = DateParser(patterns=[pattern], generate=False, result_cache_size=8)
+    parser._current_year = 2023
+    assert parser.parse("05.03", **no_filters) == datetime.datetime(2023, 3, 5)
+    assert parser.parse("29.02", **no_filters) is None
+    assert parser.parse("29.02", **no_filters) is None
+    parser._current_year = 2024
+    assert parser.parse("05.03", **no_filters) == datetime.datetime(2024, 3, 5)
+    assert parser.parse("29.02", **no_filters) == datetime.datetime(2024, 2, 29)
+    assert parser.cache_stats()["result"]["expirations"] == 2
+
+
+def test_result_cache_skipped_in_session():
+    """Test that session results are not cached"""
+    parser = DateParser(languages="de", base_only=True, result_cache_size=8)
+    parser.startSession([])
+    assert parser.parse("3. März 2021") is None
+    parser.endSession()
+    assert parser.parse("3. März 2021") == datetime.datetime(2021, 3, 3)
+    assert parser.cache_stats()["result"]["size"] == 1
+
+
+def test_result_cache_threads():
+    """Test that result cache counters stay consistent when shared by threads"""
+    import concurrent.futures
+    parser = DateParser(languages="de", base_only=True, result_cache_size=4)
+    texts = [f"{day}. März 2021" for day in range(1, 9)] * 50
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(parser.parse, texts))
+    assert results == [datetime.datetime(2021, 3, int(text.split(".")[0])) for text in texts]
+    stats = parser.cache_stats()["result"]
+    assert stats["hits"] + stats["misses"] == len(texts)
+    assert stats["size"] <= 4
+
+
+# Negative cache tests
+def test_negative_cache_rejects_known_non_dates():
+    """Test that texts no pattern matched are rejected by negative cache, dates are still parsed"""
+    parser = DateParser(languages="de", base_only=True, negative_cache_size=100)
+    assert parser.parse("Startseite") is None
+    assert parser.parse("Startseite") is None
+    assert parser.parse("3. März 2021") == datetime.datetime(2021, 3, 3)
+    assert parser.parse("3. März 2021") == datetime.datetime(2021, 3, 3)
+    stats = parser.cache_stats()["negative"]
+    assert (stats["size"], stats["hits"]) == (1, 1)
+    # flags are a part of the key
+    assert parser.match("Startseite", nolanguagefilter=True) is None
+    assert parser.cache_stats()["negative"]["size"] == 2
+
+
+def test_bloom_filter_sizing_and_reset():
+    """Test Bloom filter size, false positive rate and clearing when capacity is reached"""
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    assert bloom.num_bits == 9586 and bloom.num_hashes == 7
+    for i in range(1000):
+        bloom.add(f"text {i}")
+    assert all(f"text {i}" in bloom for i in range(1000))
+    false_positives = sum(f"other {i}" in bloom for i in range(10000))
+    assert false_positives < 200
+    bloom.add("one more")
+    assert "one more" in bloom and "text 1" not in bloom
+    assert bloom.stats()["resets"] == 1 and len(bloom) == 1
+    with pytest.raises(ValueError):
+        BloomFilter(capacity=0)
+    with pytest.raises(ValueError):
+        BloomFilter(error_rate=1.5)
+
+
+
+def test_bloom_filter_threads():
+    """Test that Bloom filter counters and fill stay consistent when shared by threads"""
+    import concurrent.futures
+    bloom = BloomFilter(capacity=100, error_rate=0.01)
+
+    def add_and_check(i):
+        bloom.add(f"text {i}")
+        return f"text {i}" in bloom
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(add_and_check, range(2000)))
+    stats = bloom.stats()
+    assert stats["hits"] + stats["misses"] == 2000
+    assert stats["resets"] == 19 and stats["size"] == 100
+
+
+# Persistent cache tests
+def test_persistent_caches_roundtrip(tmp_path):
+    """Test that result cache and session keys are loaded by the next parser, shape cache is not
+    saved"""
+    cache_file = str(tmp_path / "cache.sqlite")
+    options = dict(languages="de", base_only=True, result_cache_size=16, shape_cache_size=16,
+                   cache_file=cache_file)
+    parser = DateParser(**options)
+    assert parser.parse("3. März 2021") == datetime.datetime(2021, 3, 3)
+    assert parser.parse("Startseite") is None
+    parser.match("4. März 2021")
+    assert len(parser._shape_cache) == 1
+    parser.startSession([parser.patterns[0].key])
+    assert parser.save_caches() == 3
+    loaded = DateParser(**options)
+    assert loaded.loaded_session_keys == {parser.patterns[0].key}
+    assert loaded.cachedpats is None
+    assert [key for key, _, _ in loaded._result_cache.items()] == [
+        ("parse", "3. März 2021", False, False, False, False, False),
+        ("parse", "Startseite", False, False, False, False, False)]
+    assert loaded.parse("3. März 2021") == datetime.datetime(2021, 3, 3)
+    assert loaded.cache_stats()["result"]["hits"] == 1
+    assert len(loaded._shape_cache) == 0
+    loaded.startSession(loaded.loaded_session_keys)
+    assert loaded._session_keys == {parser.patterns[0].key}
+
+
+def test_persistent_caches_ignore_other_versions(tmp_path, monkeypatch):
+    """Test that entries of other qddate versions and pattern sets are ignored"""
+    import qddate
+    cache_file = str(tmp_path / "cache.sqlite")
+    parser = DateParser(languages="de", base_only=True, result_cache_size=16, cache_file=cache_file)
+    parser.parse("3. März 2021")
+    parser.save_caches()
+    other = DateParser(languages="de", result_cache_size=16, cache_file=cache_file)
+    assert len(other._result_cache) == 0
+    monkeypatch.setattr(qddate, "__version__", "0.0.0")
+    stale = DateParser(languages="de", base_only=True, result_cache_size=16, cache_file=cache_file)
+    assert len(stale._result_cache) == 0
+
+
+def test_persistent_caches_stored_as_json(tmp_path):
+    """Test that cache entries are saved as JSON and entries of unexpected types are ignored"""
+    import json
+    import sqlite3
+    cache_file = str(tmp_path / "cache.sqlite")
+    options = dict(languages="de", base_only=True, result_cache_size=16, cache_file=cache_file)
+    parser = DateParser(**options)
+    parser.parse("3. März 2021")
+    parser.save_caches()
+    conn = sqlite3.connect(cache_file)
+    entry, = conn.execute("SELECT entry FROM qddate_cache").fetchone()
+    assert json.loads(entry) == [["parse", "3. März 2021", False, False, False, False, False],
+                                 ["2021-03-03T00:00:00", None]]
+    with conn:
+        entry = json.dumps([["parse", "x"], ["not a date", None]])
+        conn.execute("UPDATE qddate_cache SET entry = ?", (entry,))
+    conn.close()
+    assert len(DateParser(**options)._result_cache) == 0
+
+
+def test_persistent_caches_broken_file(tmp_path):
+    """Test that unreadable cache file is ignored on load"""
+    cache_file = tmp_path / "cache.sqlite"
+    cache_file.write_bytes(b"not a database")
+    parser = DateParser(languages="de", base_only=True, result_cache_size=16,
+                        cache_file=str(cache_file))
+    assert len(parser._result_cache) == 0
+    with pytest.raises(ValueError):
+        DateParser(languages="de", base_only=True).save_caches()
+
+
+# Shared memory cache tests
+@pytest.fixture
+def shared_cache():
+    cache = SharedParseCache(slots=64)
+    yield cache
+    cache.close()
+    cache.unlink()
+
+
+def test_shared_parse_cache_entries(shared_cache):
+    """Test that shared table stores dates, non-dates and year dependent dates"""
+    shared_cache.put("date", datetime.datetime(2021, 3, 3, 10, 20, 30, 5))
+    shared_cache.put("none", None)
+    shared_cache.put("noyear", datetime.datetime(2024, 2, 29), noyear=True)
+    attached = SharedParseCache.attach(shared_cache.name)
+    try:
+        assert attached.get("date") == datetime.datetime(2021, 3, 3, 10, 20, 30, 5)
+        assert attached.get("none") is None
+        assert attached.get("noyear", 2024) == datetime.datetime(2024, 2, 29)
+        assert attached.get("noyear", 2025) is MISSING
+        assert attached.get("other") is MISSING
+        assert (attached.stats()["hits"], attached.stats()["misses"]) == (3, 2)
+    finally:
+        attached.close()
+    # table is a cache, keys colliding on all probed slots overwrite their home slot
+    for i in range(500):
+        shared_cache.put(f"key {i}", None)
+    assert len(shared_cache) == 64
+    assert shared_cache.get("key 499") is None
+
+
+def test_shared_parse_cache_attach_errors(shared_cache):
+    """Test that attaching needs a name of a qddate table"""
+    with pytest.raises(ValueError):
+        SharedParseCache(create=False)
+    with pytest.raises(ValueError):
+        SharedParseCache(slots=0)
+
+
+def _parse_with_pickled_parser(parser, text):
+    return parser.parse(text), parser.cache_stats()["shared"]["hits"]
+
+
+def test_parser_shared_cache_between_processes(shared_cache):
+    """Test that parsers attached to the same table by name reuse each other's results"""
+    import concurrent.futures
+    parser = DateParser(languages="de", base_only=True, shared_cache=shared_cache)
+    assert parser.parse("3. März 2021") == datetime.datetime(2021, 3, 3)
+    assert parser.parse("Startseite") is None
+    with concurrent.futures.ProcessPoolExecutor(max_workers=1) as pool:
+        result, hits = pool.submit(_parse_with_pickled_parser, parser, "3. März 2021").result()
+    assert result == datetime.datetime(2021, 3, 3) and hits == 1
+    other = DateParser(languages="de", base_only=True, shared_cache=shared_cache.name,
+                       result_cache_size=4)
+    assert other.parse("Startseite") is None
+    assert other.cache_stats()["shared"]["hits"] == 1
+    # other configurations don't see these results
+    assert DateParser(languages="de", shared_cache=shared_cache).parse("Startseite") is None
+    assert len(shared_cache) == 3
+
+
+# Filter cache tests
+@pytest.mark.parametrize("flags", [{}, {"noprefix": True},
+                                   {"nolanguagefilter": True, "nocharsetfilter": True},
+                                   {"noseparatorfilter": True, "noyearformatfilter": True}])
+def test_filter_cache_same_candidates(flags):
+    """Test that memoized masks and candidate order are the same as filtering every text"""
+    plain = DateParser(languages=["en", "de"], base_only=True)
+    cached = DateParser(languages=["en", "de"], base_only=True, filter_cache_size=64)
+    texts = ["01.12.2009", "02.11.2010", "6 Jan 2009", "7 Feb 2010", "3. März 2021", "4. März 2022",
+             "2013-01-12", "Startseite", "Impressum"]
+    for text in texts:
+        profile = TextProfile(text)
+        mask = plain._filter_mask(text, len(text), profile=profile, **flags)
+        assert cached._filter_mask(text, len(text), profile=profile, **flags) == mask
+        assert cached.parse(text, **flags) == plain.parse(text, **flags)
+    stats = cached.cache_stats()["filter"]
+    assert stats["hits"] > 0 and stats["size"] < len(texts)
+
+
+def test_filter_cache_bounded():
+    """Test that filter cache keeps at most maxsize signatures"""
+    parser = DateParser(languages="de", base_only=True, filter_cache_size=2)
+    for text in ["1", "12", "123", "1234"]:
+        parser.parse(text)
+    stats = parser.cache_stats()["filter"]
+    assert (stats["size"], stats["misses"]) == (2, 4)
+
+
+def test_filter_and_shape_cache_threads():
+    """Test that filter and shape cache counters stay consistent when shared by threads"""
+    import concurrent.futures
+    parser = DateParser(languages="de", base_only=True, filter_cache_size=4, shape_cache_size=4)
+    texts = [f"{day}. März 2021" for day in range(1, 20)] * 20
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(parser.parse, texts))
+    assert results == [datetime.datetime(2021, 3, int(text.split(".")[0])) for text in texts]
+    shape, filters = parser.cache_stats()["shape"], parser.cache_stats()["filter"]
+    assert shape["hits"] + shape["misses"] == len(texts)
+    # texts matched by remembered pattern skip filtering
+    assert filters["hits"] + filters["misses"] == shape["misses"]
+    assert shape["size"] <= 4 and filters["size"] <= 4
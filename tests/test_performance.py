@@ -5,9 +5,10 @@ These tests establish baseline performance metrics and detect regressions.
 """
 
 import pytest
+import gc
 import time
 import statistics
-from qddate import DateParser
+from qddate import DateParser, qdparser
 
 # Baseline performance thresholds (in seconds)
 # These should be updated after profiling to reflect actual performance
@@ -50,12 +51,14 @@ def time_function(func, *args, **kwargs):
 class TestInitializationPerformance:
     """Test parser initialization performance."""
     
-    def test_initialization_time(self):
+    def test_initialization_time(self, monkeypatch):
         """Test that initialization completes within threshold."""
         timings = []
         iterations = 5
         
         for _ in range(iterations):
+            # measure pattern generation, not reuse of patterns shared by earlier parsers
+            monkeypatch.setattr(qdparser, "_SHARED_STATES", {})
             _, duration = time_function(DateParser)
             timings.append(duration)
         
@@ -63,12 +66,16 @@ class TestInitializationPerformance:
         assert mean_time < BASELINE_THRESHOLDS['initialization_mean'], \
             f"Initialization too slow: {mean_time:.4f}s (threshold: {BASELINE_THRESHOLDS['initialization_mean']}s)"
     
-    def test_initialization_consistency(self):
+    def test_initialization_consistency(self, monkeypatch):
         """Test that initialization time is consistent."""
         timings = []
         iterations = 5
         
         for _ in range(iterations):
+            # measure pattern generation, not reuse of patterns shared by earlier parsers
+            monkeypatch.setattr(qdparser, "_SHARED_STATES", {})
+            # and not collection of garbage left by the previous one
+            gc.collect()
             _, duration = time_function(DateParser)
             timings.append(duration)
         